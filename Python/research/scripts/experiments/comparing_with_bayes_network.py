@@ -22,7 +22,6 @@ from math import isclose
 from typing import Any, Dict, Tuple, List
 
 from scripts.relnet.graph_components import DirectedRelation
-from scripts.relnet.conditional_graph import ConditionalGraph
 from scripts.relnet.relation_graph import RelationGraph, RelationGraphBuilder
 
 from pgmpy.inference import VariableElimination
@@ -214,16 +213,13 @@ def _run_inference_on(
     inf_factor_i: DiscreteFactor = VariableElimination(bayes_net).query(
             variables=(list(net_config.keys() - variables)),
             evidence={v: 0 for v in variables})
-    inf_graph_i = rel_graph
+    inf_graph_i = rel_graph.conditional_graph(
+        rel_graph.sample_builder().build_single_node(variables[0], f"{variables[0]}(0)"), view=True)
 
-    for v in variables:
-        if isinstance(inf_graph_i, ConditionalGraph):
-            inf_graph_i = inf_graph_i.relation_graph()
-        inf_graph_i = inf_graph_i \
-            .conditional_graph(rel_graph.sample_builder().build_single_node(v, f"{v}(0)")) \
-            .relation_graph().make_joined()
+    for v in variables[1:]:
+        inf_graph_i = inf_graph_i.refine(rel_graph.sample_builder().build_single_node(v, f"{v}(0)"))
 
-    return _marginals_from_factor(inf_factor_i), inf_graph_i.marginal_variables_probability()
+    return _marginals_from_factor(inf_factor_i), inf_graph_i.relation_graph().query()
 
 
 def comparing_inference(bayes_net: BayesianNetwork, rel_graph: RelationGraph) -> None:
@@ -18,12 +18,13 @@ website: github.com/alexcab
 created: 2021-10-12
 """
 
-from typing import Any, Dict, Tuple
+from typing import Dict, Tuple
 
 from pgmpy.factors.discrete import DiscreteFactor
 from pgmpy.models import MarkovNetwork
 
 from scripts.relnet.conditional_graph import ConditionalGraph
+from scripts.relnet.joint_view import JointView
 from scripts.relnet.relation_graph import RelationGraph, RelationGraphBuilder
 
 nodes = ['A', 'B', 'C', 'D']
@@ -82,11 +83,6 @@ def make_relation_graph() -> RelationGraph:
     return rel_graph
 
 
-def _normalize(values: Dict[Any, int]) -> Dict[Any, float]:
-    total = float(sum(values.values()))
-    return {k: v / total for k, v in values.items()}
-
-
 def _get_markov_prop(factor: DiscreteFactor) -> Dict[Tuple[int, int, int, int], float]:
     fc = factor.copy()
     fc.normalize()
@@ -96,11 +92,11 @@ def _get_markov_prop(factor: DiscreteFactor) -> Dict[Tuple[int, int, int, int],
         if factor.get_value(A=a, B=b, C=c, D=d) > 0}
 
 
-def _get_relation_graph_prop(relation_graph: RelationGraph) -> Dict[Tuple[int, int, int, int], float]:
-    all_counts = {(a, b, c, d):  relation_graph.find_for_values(
+def _get_relation_graph_prop(joint_view: JointView) -> Dict[Tuple[int, int, int, int], float]:
+    all_props = {(a, b, c, d):  joint_view.probability_of(
         {("A", f"A({a})"), ("B", f"B({b})"), ("C", f"C({c})"), ("D", f"D({d})")})
         for a, b, c, d in joined_values}
-    return _normalize({k: float(c.items().pop()[1]) for k, c in all_counts.items() if c})
+    return {k: p for k, p in all_props.items() if p > 0}
 
 
 def _format_prop(prop: Dict[Tuple[int, int, int, int], float]) -> [str]:
@@ -114,11 +110,10 @@ def comparing_variable_joint_probability(markov_net: MarkovNetwork, rel_graph: R
     da_factor: DiscreteFactor = markov_net.factors[3].copy()
 
     joint_markov: DiscreteFactor = ab_factor * bc_factor * cd_factor * da_factor
-    joint_relation_graph: RelationGraph = rel_graph.make_joined()
+    joint_relation_graph: JointView = rel_graph.joint_view()
 
     print(f"Joint markov:\n{joint_markov}")
-    print(f"Joint relation graph:\n{joint_relation_graph.print_samples()}")
-    # joint_relation_graph.visualize_outcomes()
+    print(f"Joint relation graph:\n{joint_relation_graph}")
 
     joint_markov.normalize()
 
@@ -158,13 +153,12 @@ def comparing_inference(markov_net: MarkovNetwork, rel_graph: RelationGraph) ->
     print(f"Inference graph on A_0:\n{inference_on_a_0.print_samples()}")
     # inference_on_a_0.visualize_outcomes()
 
-    joint_inference_graph: RelationGraph = inference_on_a_0.relation_graph().make_joined()
+    joint_inference_graph: JointView = inference_on_a_0.relation_graph().joint_view()
 
-    print(f"Join inference graph on A_0:\n{joint_inference_graph.print_samples()}")
-    # joint_inference_graph.visualize_outcomes()
+    print(f"Join inference graph on A_0:\n{joint_inference_graph}")
 
     joint_markov_prop = _get_markov_prop(joint_markov)
-    joint_inference_prop = _get_relation_graph_prop(joint_inference_graph.relation_graph())
+    joint_inference_prop = _get_relation_graph_prop(joint_inference_graph)
 
     print(f"Inference E=A_0 markov prop = {_format_prop(joint_markov_prop)}")
     print(f"Inference E=A_0 relation graph prop = {_format_prop(joint_inference_prop)}")
@@ -0,0 +1,70 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import os
+import subprocess
+import sys
+from statistics import median
+from typing import List, Tuple
+
+RESEARCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+HEAVY_MODULES = ["pyvis", "numpy", "pgmpy", "concurrent.futures.process", "asyncio"]
+MEASURE = """
+import sys, time
+t = time.perf_counter()
+import {module}
+print(time.perf_counter() - t, *[m for m in {heavy} if m in sys.modules])
+"""
+
+
+def measure_import(module: str, repeats: int) -> Tuple[float, List[str]]:
+    """
+    Import module in fresh interpreter given number of times
+    :param module: module to import
+    :param repeats: number of fresh interpreters
+    :return: (median import time in seconds, heavy modules loaded by import)
+    """
+    times, loaded = [], []
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", MEASURE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=RESEARCH_DIR, capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(out[0]))
+        loaded = out[1:]
+    return median(times), loaded
+
+
+def relnet_import_time(repeats: int = 7) -> None:
+    modules = sorted(
+        f"scripts.relnet.{f[:-3]}"
+        for f in os.listdir(os.path.join(RESEARCH_DIR, "scripts", "relnet"))
+        if f.endswith(".py") and f != "__init__.py")
+
+    print(f"[relnet_import_time] Median of {repeats} fresh interpreters, python {sys.version.split()[0]}")
+    for module in modules:
+        seconds, loaded = measure_import(module, repeats)
+        print(f"{module:<45} {seconds * 1000:8.1f} ms  {', '.join(loaded)}")
+
+    _, loaded = measure_import("scripts.relnet.relation_graph", 1)
+    assert "pyvis" not in loaded, "Import of relation graph should not load pyvis"
+
+
+if __name__ == '__main__':
+    relnet_import_time()
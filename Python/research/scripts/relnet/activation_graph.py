@@ -19,10 +19,10 @@ created: 2021-11-01
 """
 
 from typing import Any, Dict, Set, Optional
-from pyvis.network import Network
 
 from .variables_graph import VariableNode, VariableEdge, VariablesGraph
 from .graph_components import SampleGraphComponentsProvider
+from .visualization import new_network, show_network
 
 
 class ActiveNode(VariableNode):
@@ -95,15 +95,22 @@ class ActivationGraph(VariablesGraph):
         self.nodes: frozenset[ActiveNode] = frozenset(nodes)
         self.edges: frozenset[ActiveEdge] = frozenset(edges)
 
-    def visualize(self, name: Optional[str] = None, height: str = "1024px", width: str = "1024px") -> None:
+    def visualize(
+            self,
+            name: Optional[str] = None,
+            height: str = "1024px",
+            width: str = "1024px",
+            show: bool = True
+    ) -> None:
         """
         Will render this variable graph as HTML page and show in browser
         :param name: optional name of this visualization, if None then self.name will passed
         :param height: window height
         :param width: window width
+        :param show: if False then HTML file will be only written (headless mode), without opening in browser
         :return: None
         """
-        net = Network(height=height, width=width)
+        net = new_network(height, width)
         file_name = "".join(c for c in (name if name else self.name) if c.isalnum() or c == '_')
         active_nodes = {n.variable: n for n in self.nodes}
 
@@ -123,4 +130,4 @@ class ActivationGraph(VariablesGraph):
             color = "green" if edge.in_query else "red"
             net.add_edge(ep[0], ep[1], label=label, color=color)
 
-        net.show(f"{file_name}.html")
+        show_network(net, file_name, show)
@@ -0,0 +1,189 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import random
+import time
+from math import sqrt
+from statistics import NormalDist
+from typing import Dict, Any, Set, Optional, List, Tuple, Callable
+
+from .sample_graph import SampleGraph
+from .sample_set import Samples
+
+CHECK_BUDGET_EVERY = 256  # Number of draws in between checks of time budget and precision
+
+
+class AliasSampler:
+    """
+    Immutable sampler of indexes in proportion to given weights, by Vose alias method: O(n) to build, O(1) to draw
+    """
+
+    def __init__(self, weights: List[int]):
+        assert weights and all(w >= 0 for w in weights) and sum(weights) > 0, \
+            f"[AliasSampler.__init__] Weights should be not empty, not negative and have positive sum"
+
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        self.probability: List[float] = [1.0] * n
+        self.alias: List[int] = list(range(n))
+
+        while small and large:
+            s, lg = small.pop(), large.pop()
+            self.probability[s] = scaled[s]
+            self.alias[s] = lg
+            scaled[lg] = scaled[lg] + scaled[s] - 1.0
+            (small if scaled[lg] < 1.0 else large).append(lg)
+
+    def draw(self, rnd: random.Random) -> int:
+        """
+        Draw one index
+        :param rnd: random generator
+        :return: index in range of weights
+        """
+        i = rnd.randrange(len(self.probability))
+        return i if rnd.random() < self.probability[i] else self.alias[i]
+
+
+class MarginalEstimate:
+    """
+    Immutable estimate of probability of variable value, with Wilson score confidence interval
+    """
+
+    def __init__(self, hits: int, number_of_samples: int, z: float):
+        p = hits / number_of_samples
+        denominator = 1 + z * z / number_of_samples
+        center = (p + z * z / (2 * number_of_samples)) / denominator
+        half_width = z * sqrt(p * (1 - p) / number_of_samples + z * z / (4 * number_of_samples ** 2)) / denominator
+
+        self.probability: float = p
+        self.lower: float = max(0.0, min(p, center - half_width))  # Clamp float error at p = 0 or 1
+        self.upper: float = min(1.0, max(p, center + half_width))
+        self.number_of_samples: int = number_of_samples
+
+    def __repr__(self):
+        return f"{self.probability:.4f}[{self.lower:.4f}, {self.upper:.4f}]"
+
+    def half_width(self) -> float:
+        """
+        Get half of width of confidence interval
+        :return: (upper - lower) / 2
+        """
+        return (self.upper - self.lower) / 2
+
+
+class ApproximateInference:
+    """
+    Monte Carlo estimation of marginal distributions: outcomes are drawn in proportion to them counts,
+    outcomes not consistent with evidence are rejected.
+    Converge to ConditionalGraph.marginal_variables_probability() for same evidence.
+    """
+
+    def __init__(self, outcomes: Samples):
+        items = list(outcomes.items())
+        self._outcomes: List[SampleGraph] = [o for o, _ in items]
+        self._counts: List[int] = [c for _, c in items]
+        self._sampler: Optional[AliasSampler] = AliasSampler(self._counts) if items else None
+        self._is_ordered: bool = False
+
+    def _order(self) -> None:
+        """
+        Order outcomes by fingerprint (once, on first seeded query), so same seed give same draws
+        in any process, while iteration order of outcomes depends on hash randomization
+        :return: None
+        """
+        if not self._is_ordered and self._outcomes:
+            order = sorted(range(len(self._outcomes)), key=lambda i: self._outcomes[i].fingerprint(8))
+            self._outcomes = [self._outcomes[i] for i in order]
+            self._counts = [self._counts[i] for i in order]
+            self._sampler = AliasSampler(self._counts)
+        self._is_ordered = True
+
+    def __repr__(self):
+        return f"ApproximateInference(number_of_outcomes = {len(self._outcomes)})"
+
+    def __copy__(self):
+        raise AssertionError("[ApproximateInference.__copy__] Approximate inference should not be copied")
+
+    def marginals(
+            self,
+            predicate: Callable[[SampleGraph], bool],
+            variables: Optional[Set[Any]] = None,
+            max_samples: int = 10000,
+            max_time: Optional[float] = None,
+            precision: Optional[float] = None,
+            confidence: float = 0.95,
+            seed: Optional[int] = None
+    ) -> Dict[Any, Dict[Any, MarginalEstimate]]:
+        """
+        Estimate marginal distribution of variables over outcomes selected by predicate.
+        Sampling stops on first of: max_samples draws, max_time elapsed or all estimates reach precision.
+        :param predicate: outcomes filter, e.g. evidence predicate
+        :param variables: variables to estimate, if None then all drawn variables will be estimated
+        :param max_samples: max number of drawn outcomes (including rejected)
+        :param max_time: optional time budget in seconds
+        :param precision: optional max half width of confidence interval of each estimate
+        :param confidence: confidence level of intervals
+        :param seed: optional seed of random generator, same seed give same estimates for same outcomes
+        :return: Dict[variable, Dict[value, estimate]]
+        """
+        assert max_samples > 0, f"[ApproximateInference.marginals] Max samples should be > 0, got {max_samples}"
+        assert 0 < confidence < 1, f"[ApproximateInference.marginals] Confidence should be in (0, 1), got {confidence}"
+
+        if self._sampler is None:
+            return {}
+        if seed is not None:
+            self._order()
+
+        rnd = random.Random(seed)
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        deadline = time.monotonic() + max_time if max_time is not None else None
+        accepted: Dict[int, List[Tuple[Any, Any]]] = {}  # Outcome index -> values to count, or absent if rejected
+        rejected: Set[int] = set({})
+        hits: Dict[Any, Dict[Any, int]] = {}
+        totals: Dict[Any, int] = {}
+
+        for drawn in range(1, max_samples + 1):
+            i = self._sampler.draw(rnd)
+            if i not in accepted and i not in rejected:
+                if predicate(self._outcomes[i]):
+                    accepted[i] = [
+                        (var, val) for var, val in self._outcomes[i].values() if variables is None or var in variables]
+                else:
+                    rejected.add(i)
+            for var, val in accepted.get(i, []):
+                values = hits.setdefault(var, {})
+                values[val] = values.get(val, 0) + 1
+                totals[var] = totals.get(var, 0) + 1
+
+            if drawn % CHECK_BUDGET_EVERY == 0:
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                if precision is not None and totals and \
+                        all(MarginalEstimate(h, totals[var], z).half_width() <= precision
+                            for var, values in hits.items() for h in values.values()):
+                    break
+
+        return {
+            var: {val: MarginalEstimate(h, totals[var], z) for val, h in values.items()}
+            for var, values in hits.items()}
@@ -0,0 +1,186 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+from itertools import chain
+from typing import Dict, Any, Set, Optional, List, Tuple
+
+import numpy as np
+
+from .activation_graph import ActivationGraph, ActiveNode, ActiveEdge
+from .graph_components import SampleGraphComponentsProvider, ValueNode, RelationEdge
+from .sample_graph import SampleGraph
+from .sample_set import Samples
+
+
+class OutcomesIncidence:
+    """
+    Immutable incidence of outcomes to nodes and edges, in CSR like form of (outcome, component) pairs
+    """
+
+    def __init__(self, outcomes: Samples):
+        items = list(outcomes.items())
+        outcomes_nodes = [o.nodes for o, _ in items]
+        outcomes_edges = [o.edges for o, _ in items]
+        all_nodes = list(chain.from_iterable(outcomes_nodes))
+        all_edges = list(chain.from_iterable(outcomes_edges))
+        outcome_indexes = np.arange(len(items), dtype=np.int64)
+
+        self.node_ids: Dict[ValueNode, int] = {n: i for i, n in enumerate(dict.fromkeys(all_nodes))}
+        self.edge_ids: Dict[RelationEdge, int] = {e: i for i, e in enumerate(dict.fromkeys(all_edges))}
+        self.nodes: List[ValueNode] = list(self.node_ids.keys())
+        self.edges: List[RelationEdge] = list(self.edge_ids.keys())
+        self.counts: np.ndarray = np.fromiter((c for _, c in items), dtype=np.int64, count=len(items))
+        self.node_outcome: np.ndarray = np.repeat(outcome_indexes, [len(ns) for ns in outcomes_nodes])
+        self.node_id: np.ndarray = np.fromiter(map(self.node_ids.__getitem__, all_nodes), np.int64, len(all_nodes))
+        self.edge_outcome: np.ndarray = np.repeat(outcome_indexes, [len(es) for es in outcomes_edges])
+        self.edge_id: np.ndarray = np.fromiter(map(self.edge_ids.__getitem__, all_edges), np.int64, len(all_edges))
+        self.sizes: np.ndarray = np.bincount(self.node_outcome, minlength=len(items)) \
+            + np.bincount(self.edge_outcome, minlength=len(items))
+
+        endpoints = [sorted(self.node_ids[ep] for ep in e.endpoints) for e in self.edges]
+        self.edge_endpoint_u: np.ndarray = np.array([ep[0] for ep in endpoints], dtype=np.int64)
+        self.edge_endpoint_v: np.ndarray = np.array([ep[-1] for ep in endpoints], dtype=np.int64)
+
+        self._width: int = max(len(self.nodes), 1)
+        keys = self.node_outcome * self._width + self.node_id
+        self._pairs_order: np.ndarray = np.argsort(keys, kind="stable")
+        self._sorted_keys: np.ndarray = keys[self._pairs_order]
+
+    def node_pair_positions(self, outcome: np.ndarray, node: np.ndarray) -> np.ndarray:
+        """
+        Find positions of (outcome, node) pairs in node pairs arrays
+        :param outcome: outcome indexes
+        :param node: node IDs, each node should be in corresponding outcome
+        :return: positions of pairs
+        """
+        return self._pairs_order[np.searchsorted(self._sorted_keys, outcome * self._width + node)]
+
+
+def _evidence_distances(
+        incidence: OutcomesIncidence,
+        evidence: SampleGraph,
+        edge_selected: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Breadth first search from evidence nodes in all outcomes at once, one level per iteration.
+    Edge is external when it lead from reached node to not reached one, same as in SampleGraph.external_nodes.
+    :param incidence: incidence of outcomes
+    :param evidence: evidence graph
+    :param edge_selected: mask of edges which pass relation filter, by edge ID
+    :return: (distance from evidence for each node pair (-1 if not reached), mask of external edge pairs)
+    """
+    evidence_ids = np.array([incidence.node_ids[n] for n in evidence.nodes if n in incidence.node_ids], dtype=np.int64)
+    distance = np.where(np.isin(incidence.node_id, evidence_ids), 0, -1)
+    external = np.zeros(len(incidence.edge_id), dtype=bool)
+
+    pairs = np.nonzero(edge_selected[incidence.edge_id])[0]
+    pos_u = incidence.node_pair_positions(
+        incidence.edge_outcome[pairs], incidence.edge_endpoint_u[incidence.edge_id[pairs]])
+    pos_v = incidence.node_pair_positions(
+        incidence.edge_outcome[pairs], incidence.edge_endpoint_v[incidence.edge_id[pairs]])
+    level = 0
+
+    while True:
+        from_u = (distance[pos_u] == level) & (distance[pos_v] == -1)
+        from_v = (distance[pos_v] == level) & (distance[pos_u] == -1)
+        if not (from_u.any() or from_v.any()):
+            return distance, external
+        external[pairs[from_u | from_v]] = True
+        distance[pos_v[from_u]] = level + 1
+        distance[pos_u[from_v]] = level + 1
+        level += 1
+
+
+def batched_activation_graph(
+        components_provider: SampleGraphComponentsProvider,
+        evidence: SampleGraph,
+        outcomes: Samples,
+        relation_filter: Optional[Set[Any]],
+        name: str
+) -> ActivationGraph:
+    """
+    Build activation graph same as ConditionalGraph.activation_graph, but similarities, external nodes and
+    weights are computed for all outcomes at once with array operations
+    :param components_provider: components provider of outcomes
+    :param evidence: evidence of conditional graph
+    :param outcomes: outcomes of conditional graph
+    :param relation_filter: relations for which activation will be calculated, if None then for all relations
+    :param name: name for activation graph
+    :return ActivationGraph: activation graph
+    """
+    incidence = OutcomesIncidence(outcomes)
+    length = int(incidence.counts.sum())
+
+    intersection = np.bincount(
+        incidence.node_outcome[np.isin(incidence.node_id, [incidence.node_ids.get(n, -1) for n in evidence.nodes])],
+        minlength=len(incidence.counts)) + np.bincount(
+        incidence.edge_outcome[np.isin(incidence.edge_id, [incidence.edge_ids.get(e, -1) for e in evidence.edges])],
+        minlength=len(incidence.counts))
+    similarity = intersection / (incidence.sizes + len(evidence.hash) - intersection)
+
+    edge_selected = np.array(
+        [not relation_filter or e.relation in relation_filter for e in incidence.edges], dtype=bool)
+    distance, external = _evidence_distances(incidence, evidence, edge_selected)
+
+    pair_weight = np.where(
+        distance == 0,
+        incidence.counts[incidence.node_outcome],
+        similarity[incidence.node_outcome] * incidence.counts[incidence.node_outcome])
+    reached = distance >= 0
+    node_weights = np.bincount(
+        incidence.node_id[reached], weights=pair_weight[reached], minlength=len(incidence.nodes))
+    edge_counts = np.zeros(len(incidence.edges), dtype=np.int64)
+    np.add.at(edge_counts, incidence.edge_id[external], incidence.counts[incidence.edge_outcome[external]])
+
+    grouped_values: Dict[Any, Tuple[Dict[Any, float], bool]] = {
+        var: ({val: 0.0 for val in values}, var in evidence.included_variables)
+        for var, values in components_provider.variables()}
+
+    for node_id in np.unique(incidence.node_id[reached]):
+        node = incidence.nodes[node_id]
+        values, in_query = grouped_values[node.variable]
+        assert in_query == (node in evidence.nodes), \
+            "[batched_activation_graph] All value of same variable should belong to query or not, this is a bug"
+        values[node.value] += float(node_weights[node_id])
+
+    grouped_relations: Dict[frozenset[Any], Tuple[Dict[Any, int], bool]] = {}
+    in_query_edges = [(edge, length) for edge in evidence.edges] if length else []
+    out_query_edges = [(incidence.edges[i], int(edge_counts[i])) for i in np.nonzero(edge_counts)[0]]
+
+    for edge, count in in_query_edges:
+        endpoints = frozenset({e.variable for e in edge.endpoints})
+        relations, _ = grouped_relations.setdefault(endpoints, ({}, True))
+        relations[edge.relation] = relations.get(edge.relation, 0) + count
+
+    for edge, count in out_query_edges:
+        endpoints = frozenset({e.variable for e in edge.endpoints})
+        relations, in_query = grouped_relations.setdefault(endpoints, ({}, False))
+        assert not in_query, \
+            "[batched_activation_graph] All edges with same endpoints should belong to query or not, this is a bug"
+        relations[edge.relation] = relations.get(edge.relation, 0) + count
+
+    return ActivationGraph(
+        components_provider,
+        length,
+        {ActiveNode(var, {v: w / length for v, w in values.items()}, in_query)
+         for var, (values, in_query) in grouped_values.items()},
+        {ActiveEdge(set(endpoints), relations, in_query)
+         for endpoints, (relations, in_query) in grouped_relations.items()},
+        name)
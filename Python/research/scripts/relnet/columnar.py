@@ -0,0 +1,381 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import json
+import zipfile
+from array import array
+from typing import Dict, Any, List, Iterator, Tuple, Optional
+
+import numpy as np
+
+from .activation_graph import ActivationGraph
+from .folded_graph import FoldedGraph
+from .graph_components import SampleGraphComponentsProvider
+from .records import View, CSV_COLUMNS, component_to_json, json_to_component
+from .relation_graph import RelationGraphBuilder
+from .sample_set import Samples
+
+COLUMNAR_FORMAT = "relnet-columnar"
+COLUMNAR_VERSION = 2
+CHUNK_SIZE = 65536
+NULL_CODE = -1  # Code of absent value, e.g. second endpoint of single node outcome
+
+# Columns of tables: name -> array typecode, dictionary encoded columns are int codes
+OUTCOMES_TABLE = dict(zip(CSV_COLUMNS, ("q", "i", "i", "i", "i", "i", "q")))  # One row per edge or single node
+FOLDED_NODES_TABLE = {"variable": "i", "value": "i", "count": "q"}
+FOLDED_EDGES_TABLE = {
+    "variable_a": "i", "value_a": "i", "variable_b": "i", "value_b": "i", "relation": "i", "count": "q"}
+ACTIVE_NODES_TABLE = {"variable": "i", "value": "i", "weight": "d", "in_query": "B"}
+ACTIVE_EDGES_TABLE = {"variable_a": "i", "variable_b": "i", "relation": "i", "count": "q", "in_query": "B"}
+DICTIONARY_OF_COLUMN = {
+    "variable": "variables", "variable_a": "variables", "variable_b": "variables",
+    "value": "values", "value_a": "values", "value_b": "values", "relation": "relations"}
+
+
+class ColumnarWriter:
+    """
+    Mutable writer of tables with dictionary encoded columns. Rows are buffered in typed arrays and flushed
+    by chunks of chunk_size rows as .npy members of zip file: "{table}/{column}/{chunk}.npy", so all rows
+    are never kept in memory. Dictionaries (variables, values, relations, encoded with records.component_to_json)
+    and schema are written on close as JSON, so file can be read by any analytics stack.
+    """
+
+    def __init__(self, path: str, kind: str, chunk_size: int = CHUNK_SIZE):
+        assert chunk_size > 0, f"[ColumnarWriter.__init__] Chunk size should be > 0, got {chunk_size}"
+
+        self.path: str = path
+        self.kind: str = kind
+        self.chunk_size: int = chunk_size
+        self._zip: zipfile.ZipFile = zipfile.ZipFile(path, "w", zipfile.ZIP_STORED, allowZip64=True)
+        self._codes: Dict[str, Dict[Any, int]] = {"variables": {}, "values": {}, "relations": {}}
+        self._tables: Dict[str, Dict[str, Any]] = {}
+        self._buffers: Dict[str, Dict[str, array]] = {}
+
+    def __repr__(self):
+        return f"ColumnarWriter(path = {self.path}, kind = {self.kind}, tables = {list(self._tables)})"
+
+    def __copy__(self):
+        raise AssertionError("[ColumnarWriter.__copy__] Columnar writer should not be copied")
+
+    def code(self, dictionary: str, value: Any) -> int:
+        """
+        Get code of value in dictionary, value is added to dictionary if not in it yet
+        :param dictionary: "variables", "values" or "relations"
+        :param value: value to encode
+        :return: code of value
+        """
+        codes = self._codes[dictionary]
+        code = codes.get(value)
+        if code is None:
+            code = len(codes)
+            codes[value] = code
+        return code
+
+    def add_table(self, table: str, columns: Dict[str, str]) -> None:
+        """
+        Declare table
+        :param table: name of table
+        :param columns: Dict[column, array typecode]
+        :return: None
+        """
+        assert table not in self._tables, f"[ColumnarWriter.add_table] Table {table} already added"
+
+        self._tables[table] = {"columns": columns, "number_of_chunks": 0, "number_of_rows": 0}
+        self._buffers[table] = {column: array(typecode) for column, typecode in columns.items()}
+
+    def append(self, table: str, row: Tuple) -> None:
+        """
+        Append row to table, values of dictionary encoded columns should be already encoded with code()
+        :param table: name of table
+        :param row: values in order of table columns
+        :return: None
+        """
+        buffers = self._buffers[table]
+        for values, value in zip(buffers.values(), row):
+            values.append(value)
+        if len(values) >= self.chunk_size:
+            self._flush(table)
+
+    def _flush(self, table: str) -> None:
+        info = self._tables[table]
+        buffers = self._buffers[table]
+        for column, values in buffers.items():
+            with self._zip.open(f"{table}/{column}/{info['number_of_chunks']:06d}.npy", "w", force_zip64=True) as f:
+                np.lib.format.write_array(f, np.frombuffer(values, dtype=values.typecode), allow_pickle=False)
+        info["number_of_chunks"] += 1
+        info["number_of_rows"] += len(next(iter(buffers.values())))
+        self._buffers[table] = {column: array(values.typecode) for column, values in buffers.items()}
+
+    def close(self, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Flush not full chunks, write dictionaries and schema, and close file
+        :param metadata: optional JSON compatible metadata to store with dictionaries
+        :return: None
+        """
+        for table, buffers in self._buffers.items():
+            if len(next(iter(buffers.values()))):
+                self._flush(table)
+
+        dictionaries = {name: [component_to_json(v) for v in codes] for name, codes in self._codes.items()}
+        self._zip.writestr("dictionaries.json", json.dumps({"dictionaries": dictionaries, "metadata": metadata}))
+        self._zip.writestr("schema.json", json.dumps({
+            "format": COLUMNAR_FORMAT, "version": COLUMNAR_VERSION, "kind": self.kind, "tables": self._tables}))
+        self._zip.close()
+
+
+class ColumnarReader:
+    """
+    Reader of tables written by ColumnarWriter, chunks are read one by one
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+        self._zip: zipfile.ZipFile = zipfile.ZipFile(path, "r")
+        schema = json.loads(self._zip.read("schema.json"))
+        assert schema["format"] == COLUMNAR_FORMAT and schema["version"] == COLUMNAR_VERSION, \
+            f"[ColumnarReader.__init__] Unsupported format {schema['format']} version {schema['version']}"
+        stored = json.loads(self._zip.read("dictionaries.json"))
+
+        self.kind: str = schema["kind"]
+        self.tables: Dict[str, Dict[str, Any]] = schema["tables"]
+        self.dictionaries: Dict[str, List[Any]] = {
+            name: [json_to_component(v) for v in values] for name, values in stored["dictionaries"].items()}
+        self.metadata: Optional[Dict[str, Any]] = stored["metadata"]
+
+    def __repr__(self):
+        return f"ColumnarReader(path = {self.path}, kind = {self.kind}, tables = {list(self.tables)})"
+
+    def __copy__(self):
+        raise AssertionError("[ColumnarReader.__copy__] Columnar reader should not be copied")
+
+    def chunks(self, table: str) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Read table by chunks, dictionary encoded columns are returned as codes
+        :param table: name of table
+        :return: Iterator[Dict[column, array]]
+        """
+        info = self.tables[table]
+        for chunk in range(info["number_of_chunks"]):
+            yield {
+                column: np.lib.format.read_array(self._zip.open(f"{table}/{column}/{chunk:06d}.npy"))
+                for column in info["columns"]}
+
+    def decode(self, column: str, codes: np.ndarray) -> np.ndarray:
+        """
+        Decode dictionary encoded column, absent values (NULL_CODE) are decoded to None
+        :param column: name of column
+        :param codes: codes of column
+        :return: object array of values
+        """
+        dictionary = np.array(self.dictionaries[DICTIONARY_OF_COLUMN[column]] + [None], dtype=object)
+        return dictionary[codes]
+
+    def close(self) -> None:
+        """
+        Close file
+        :return: None
+        """
+        self._zip.close()
+
+
+def write_outcomes(samples: Samples, path: str, chunk_size: int = CHUNK_SIZE) -> None:
+    """
+    Write outcomes as "outcomes" table with one row per edge (or single node) of outcome,
+    same columns as records.CSV_COLUMNS, outcomes are streamed from samples
+    :param samples: outcomes to write
+    :param path: path of file to write
+    :param chunk_size: number of rows in chunk
+    :return: None
+    """
+    components_provider: SampleGraphComponentsProvider = samples._components_provider
+    writer = ColumnarWriter(path, "outcomes", chunk_size)
+    writer.add_table("outcomes", OUTCOMES_TABLE)
+
+    for record, (outcome, count) in enumerate(samples.items()):
+        if outcome.edges:
+            for edge in outcome.edges:
+                a, b = sorted(edge.endpoints, key=lambda n: str(n.variable))
+                writer.append("outcomes", (
+                    record, writer.code("variables", a.variable), writer.code("values", a.value),
+                    writer.code("variables", b.variable), writer.code("values", b.value),
+                    writer.code("relations", edge.relation), count))
+        else:
+            for node in outcome.nodes:
+                writer.append("outcomes", (
+                    record, writer.code("variables", node.variable), writer.code("values", node.value),
+                    NULL_CODE, NULL_CODE, NULL_CODE, count))
+
+    writer.close({
+        "variables": [
+            [component_to_json(var), [component_to_json(val) for val in sorted(values, key=str)]]
+            for var, values in sorted(components_provider.variables(), key=lambda vv: str(vv[0]))],
+        "relations": [component_to_json(rel) for rel in sorted(components_provider.relations(), key=str)]})
+
+
+def write_folded_graph(graph: FoldedGraph, path: str, chunk_size: int = CHUNK_SIZE) -> None:
+    """
+    Write folded graph as "nodes" table (one row per value node with count) and "edges" table
+    (one row per relation edge with count)
+    :param graph: folded graph
+    :param path: path of file to write
+    :param chunk_size: number of rows in chunk
+    :return: None
+    """
+    writer = ColumnarWriter(path, "folded_graph", chunk_size)
+    writer.add_table("nodes", FOLDED_NODES_TABLE)
+    writer.add_table("edges", FOLDED_EDGES_TABLE)
+
+    for node in graph.nodes:
+        for value_node, count in node.value_nodes:
+            writer.append("nodes", (
+                writer.code("variables", value_node.variable), writer.code("values", value_node.value), count))
+    for edge in graph.edges:
+        for relation_edge, count in edge.relation_edges:
+            a, b = sorted(relation_edge.endpoints, key=lambda n: str(n.variable))
+            writer.append("edges", (
+                writer.code("variables", a.variable), writer.code("values", a.value),
+                writer.code("variables", b.variable), writer.code("values", b.value),
+                writer.code("relations", relation_edge.relation), count))
+
+    writer.close({"name": graph.name, "number_of_outcomes": graph.number_of_outcomes})
+
+
+def write_activation_graph(graph: ActivationGraph, path: str, chunk_size: int = CHUNK_SIZE) -> None:
+    """
+    Write activation graph as "nodes" table (one row per variable value with weight) and "edges" table
+    (one row per relation in between variables with count)
+    :param graph: activation graph
+    :param path: path of file to write
+    :param chunk_size: number of rows in chunk
+    :return: None
+    """
+    writer = ColumnarWriter(path, "activation_graph", chunk_size)
+    writer.add_table("nodes", ACTIVE_NODES_TABLE)
+    writer.add_table("edges", ACTIVE_EDGES_TABLE)
+
+    for node in graph.nodes:
+        for value, weight in node.values:
+            writer.append("nodes", (
+                writer.code("variables", node.variable), writer.code("values", value), weight, node.in_query))
+    for edge in graph.edges:
+        a, b = sorted(edge.endpoints, key=str)
+        for relation, count in edge.relations:
+            writer.append("edges", (
+                writer.code("variables", a), writer.code("variables", b), writer.code("relations", relation),
+                count, edge.in_query))
+
+    writer.close({"name": graph.name, "number_of_outcomes": graph.number_of_outcomes})
+
+
+def read_outcomes(path: str) -> Iterator[Tuple[View, int]]:
+    """
+    Stream outcomes written by write_outcomes as records, e.g. for RelationGraphBuilder.add_outcomes_from_records
+    :param path: path of file to read
+    :return: Iterator[(edges_set_view, count)], view is edges set or single node (variable, value)
+    """
+    reader = ColumnarReader(path)
+    assert reader.kind == "outcomes", f"[read_outcomes] Expect outcomes table, got {reader.kind}"
+
+    record: Optional[int] = None
+    count = 0
+    edges: List[Tuple[frozenset, Any]] = []
+    node: Optional[Tuple[Any, Any]] = None
+
+    try:
+        for chunk in reader.chunks("outcomes"):
+            columns = [chunk["record"].tolist()] \
+                + [reader.decode(c, chunk[c]).tolist() for c in CSV_COLUMNS[1:-1]] \
+                + [chunk["count"].tolist()]
+            for r, var_a, val_a, var_b, val_b, relation, c in zip(*columns):
+                if r != record:
+                    if record is not None:
+                        yield (frozenset(edges) if edges else node), count
+                    record, count, edges, node = r, c, [], None
+                if var_b is None:
+                    node = (var_a, val_a)
+                else:
+                    edges.append((frozenset({(var_a, val_a), (var_b, val_b)}), relation))
+        if record is not None:
+            yield (frozenset(edges) if edges else node), count
+    finally:
+        reader.close()
+
+
+def read_relation_graph_builder(path: str, name: Optional[str] = None, **kwargs: Any) -> RelationGraphBuilder:
+    """
+    Read outcomes written by write_outcomes in to new relation graph builder, with same variables and relations
+    :param path: path of file to read
+    :param name: optional name of relation graph
+    :param kwargs: optional arguments of RelationGraphBuilder.add_outcomes_from_records
+    :return: new RelationGraphBuilder
+    """
+    reader = ColumnarReader(path)
+    reader.close()
+    variables = {
+        json_to_component(var): {json_to_component(val) for val in values}
+        for var, values in reader.metadata["variables"]}
+    relations = {json_to_component(rel) for rel in reader.metadata["relations"]}
+    return RelationGraphBuilder(variables, relations, name) \
+        .add_outcomes_from_records(read_outcomes(path), **kwargs)
+
+
+def record_batches(path: str, table: str) -> Iterator[Any]:
+    """
+    Convert chunks of table to pyarrow record batches (one per chunk), dictionary encoded columns became
+    pyarrow dictionary arrays with string dictionaries. Require pyarrow.
+    :param path: path of file written by write_* functions
+    :param table: name of table
+    :return: Iterator[pyarrow.RecordBatch]
+    """
+    import pyarrow as pa
+
+    reader = ColumnarReader(path)
+    try:
+        dictionaries = {name: pa.array([str(v) for v in values]) for name, values in reader.dictionaries.items()}
+        for chunk in reader.chunks(table):
+            arrays = [
+                pa.DictionaryArray.from_arrays(
+                    pa.array(values, mask=values == NULL_CODE), dictionaries[DICTIONARY_OF_COLUMN[column]])
+                if column in DICTIONARY_OF_COLUMN else pa.array(values.astype(bool) if column == "in_query" else values)
+                for column, values in chunk.items()]
+            yield pa.RecordBatch.from_arrays(arrays, names=list(chunk))
+    finally:
+        reader.close()
+
+
+def write_parquet(path: str, table: str, parquet_path: str) -> None:
+    """
+    Write table to Parquet file, one row group per chunk. Require pyarrow.
+    :param path: path of file written by write_* functions
+    :param table: name of table
+    :param parquet_path: path of Parquet file to write
+    :return: None
+    """
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for batch in record_batches(path, table):
+            if writer is None:
+                writer = pq.ParquetWriter(parquet_path, batch.schema)
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
@@ -22,9 +22,10 @@ from typing import Dict, Any, Set, Optional
 
 from .activation_graph import ActivationGraph, ActiveNode, ActiveEdge
 from .graph_components import SampleGraphComponentsProvider
+from .query_cache import QueryCache
 from .sample_graph import SampleGraph
 from .sample_space import SampleSpace
-from .sample_set import SampleSet
+from .sample_set import SampleSet, SampleSetView
 
 
 class ConditionalGraph(SampleSpace):
@@ -37,9 +38,10 @@ class ConditionalGraph(SampleSpace):
             components_provider: SampleGraphComponentsProvider,
             evidence: SampleGraph,
             name: str,
-            outcomes: SampleSet
+            outcomes: SampleSet,
+            query_cache: Optional[QueryCache] = None
     ):
-        super().__init__(components_provider, outcomes, name, evidence)
+        super().__init__(components_provider, outcomes, name, evidence, query_cache)
         self.evidence: SampleGraph = evidence
         self.name: str = name
         self._components_provider: SampleGraphComponentsProvider = components_provider
@@ -56,7 +58,48 @@ class ConditionalGraph(SampleSpace):
             "included_relations": {str(r) for r in self.included_relations()},
         }
 
-    def activation_graph(self, relation_filter: Set[Any] = None, name: Optional[str] = None) -> ActivationGraph:
+    def refine(
+            self, extra_evidence: SampleGraph, name: Optional[str] = None, view: bool = False
+    ) -> 'ConditionalGraph':
+        """
+        Do conditioning of already selected outcomes on extra evidence, same as
+        relation_graph().conditional_graph(extra_evidence), but the result keeps combined evidence.
+        :param extra_evidence: SampleGraph to filter on, should not have other values for variables of evidence
+        :param name: optional name for the refined graph, if None then self.name will passed
+        :param view: if True then selected outcomes will be stored as SampleSetView, without copying of samples.
+                     If outcomes of this graph are already a view, refined outcomes will be view as well.
+        :return: new instance of ConditionalGraph
+        """
+        assert extra_evidence.is_compatible(self._components_provider), \
+            f"[ConditionalGraph.refine] Evidence {extra_evidence} is not compatible with this conditional graph"
+
+        conflicting = {
+            (var, val) for var, val in extra_evidence.values()
+            if var in self.evidence.included_variables and not self.evidence.have_value(var, val)}
+
+        assert not conflicting, \
+            f"[ConditionalGraph.refine] Extra evidence have values {conflicting} which conflict with evidence " \
+            f"{self.evidence}"
+
+        def condition() -> ConditionalGraph:
+            outcomes = SampleSetView.of(self.outcomes) if view and not isinstance(self.outcomes, SampleSetView) \
+                else self.outcomes
+            return ConditionalGraph(
+                self._components_provider,
+                SampleGraph(
+                    self._components_provider,
+                    self.evidence.nodes | extra_evidence.nodes,
+                    self.evidence.edges | extra_evidence.edges,
+                    None),
+                name if name else self.name,
+                outcomes.filter_samples(self._evidence_predicate(extra_evidence)),
+                self.query_cache)
+
+        return self._cached(("refine", extra_evidence, name, view), condition)
+
+    def activation_graph(
+            self, relation_filter: Set[Any] = None, name: Optional[str] = None, batched: bool = False
+    ) -> ActivationGraph:
         """
         On given inference graph builds activation graph.
         As norm constant we using number_of_outcomes, since assume for values that in query graph the similarity = 1,
@@ -64,8 +107,23 @@ class ConditionalGraph(SampleSpace):
         :param relation_filter: list of relation for which activation will be calculated,
                                 if None then for all relations.
         :param name: optional name for activation graph, if None then self.name will passed
+        :param batched: if True then activation will be computed for all outcomes at once with numpy arrays,
+                        weights can differ from not batched in last digits, since summed in other order
         :return ActivationGraph: activation graph:
         """
+        def build() -> ActivationGraph:
+            if batched:
+                from .batched_activation import batched_activation_graph
+                return batched_activation_graph(
+                    self._components_provider, self.evidence, self.outcomes, relation_filter,
+                    name if name else self.name)
+            return self._build_activation_graph(relation_filter, name)
+
+        return self._cached(
+            ("activation_graph", frozenset(relation_filter) if relation_filter is not None else None, name, batched),
+            build)
+
+    def _build_activation_graph(self, relation_filter: Optional[Set[Any]], name: Optional[str]) -> ActivationGraph:
         grouped_values: Dict[Any, (Dict[Any, float], bool)] = {
             var: ({val: 0.0 for val in values}, var in self.evidence.included_variables)
             for var, values in self._components_provider.variables()}
@@ -0,0 +1,257 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import json
+import os
+import struct
+import zlib
+from typing import Dict, Iterator, Iterable, Tuple, BinaryIO
+
+from .flat_sample_set import FlatSampleSet
+from .graph_components import SampleGraphComponentsProvider
+from .records import View, RecordsDecoder, view_to_json, json_to_view
+from .sample_graph import SampleGraph
+from .sample_set import Samples, SampleSet, SampleSetBuilder
+
+DELTA_MAGIC = b"RELNETDL"
+DELTA_VERSION = 2
+DELTA_HEADER = struct.Struct("<8sIQ")  # (magic, format version, generation of snapshot)
+FRAME_HEADER = struct.Struct("<II")  # (length of payload, CRC32 of payload)
+
+
+def _frames(file: BinaryIO) -> Iterator[Tuple[int, bytes]]:
+    """
+    Read frames from current position of file up to end or first torn or corrupted frame
+    :param file: log file
+    :return: Iterator[(offset of end of frame, payload)]
+    """
+    while True:
+        header = file.read(FRAME_HEADER.size)
+        if len(header) < FRAME_HEADER.size:
+            return
+        length, crc = FRAME_HEADER.unpack(header)
+        payload = file.read(length)
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            return
+        yield file.tell(), payload
+
+
+class DeltaLog:
+    """
+    Mutable append-only log of (outcome, count_delta) records of some snapshot (relation graph saved with
+    FlatSampleSet.save). Records are written in frames: one JSON batch per append (outcomes encoded with
+    records.view_to_json, so log can be read without executing of any code), framed with length
+    and CRC32, so torn or corrupted tail (e.g. after crash during append) is detected and truncated on open.
+    Log header keeps generation of snapshot to which deltas should be applied.
+    """
+
+    def __init__(self, path: str, generation: int = 0, sync: bool = True):
+        """
+        Open log file, or create new one for given generation if not exist or its header is incomplete
+        (e.g. after crash during creation)
+        :param path: path of log file
+        :param generation: generation of snapshot, used only for new file
+        :param sync: if True then each append will be flushed to disk with fsync
+        """
+        exists = os.path.exists(path) and os.path.getsize(path) >= DELTA_HEADER.size
+        self.path: str = path
+        self._sync: bool = sync
+        self._file: BinaryIO = open(path, "r+b" if exists else "w+b")
+
+        if not exists:
+            self._write_header(generation)
+
+        magic, version, self.generation = DELTA_HEADER.unpack(self._file.read(DELTA_HEADER.size))
+        assert magic == DELTA_MAGIC, f"[DeltaLog.__init__] File {path} is not delta log"
+        assert version == DELTA_VERSION, \
+            f"[DeltaLog.__init__] Unsupported format version {version}, expect {DELTA_VERSION}"
+
+        self.number_of_frames: int = 0
+        end = DELTA_HEADER.size
+        for end, _ in _frames(self._file):
+            self.number_of_frames += 1
+        self._file.seek(end)
+        self._file.truncate()
+        self.size: int = end
+
+    def __repr__(self):
+        return f"DeltaLog(path = {self.path}, generation = {self.generation}, " \
+               f"number_of_frames = {self.number_of_frames}, size = {self.size})"
+
+    def __copy__(self):
+        raise AssertionError("[DeltaLog.__copy__] Delta log should not be copied")
+
+    def _write_header(self, generation: int) -> None:
+        self._file.seek(0)
+        self._file.write(DELTA_HEADER.pack(DELTA_MAGIC, DELTA_VERSION, generation))
+        self._file.truncate()
+        self._flush()
+        self._file.seek(0)
+
+    def _flush(self) -> None:
+        self._file.flush()
+        if self._sync:
+            os.fsync(self._file.fileno())
+
+    def append(self, deltas: Iterable[Tuple[SampleGraph, int]]) -> int:
+        """
+        Append batch of deltas as one frame, batch is either fully written or (after crash) dropped on open
+        :param deltas: Iterable[(outcome, count_delta)], zero deltas are skipped
+        :return: number of written records
+        """
+        records = [(o.edges_set_view(), d) for o, d in deltas if d != 0]
+        if not records:
+            return 0
+
+        payload = json.dumps([[view_to_json(v), d] for v, d in records]).encode("utf-8")
+        self._file.write(FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+        self._flush()
+        self.number_of_frames += 1
+        self.size = self._file.tell()
+        return len(records)
+
+    def records(self) -> Iterator[Tuple[View, int]]:
+        """
+        Read all records of log, in order of append
+        :return: Iterator[(edges_set_view, count_delta)]
+        """
+        with open(self.path, "rb") as f:
+            f.seek(DELTA_HEADER.size)
+            for end, payload in _frames(f):
+                if end > self.size:
+                    return
+                for view, delta in json.loads(payload.decode("utf-8")):
+                    yield json_to_view(view), delta
+
+    def reset(self, generation: int) -> None:
+        """
+        Drop all records and set new generation, used after records were compacted in to snapshot
+        :param generation: generation of new snapshot
+        :return: None
+        """
+        self._write_header(generation)
+        self.generation = generation
+        self.number_of_frames = 0
+        self.size = self._file.seek(DELTA_HEADER.size)
+
+    def close(self) -> None:
+        """
+        Close log file
+        :return: None
+        """
+        self._file.close()
+
+
+def replay(
+        base: Samples,
+        records: Iterable[Tuple[View, int]],
+        components_provider: SampleGraphComponentsProvider
+) -> SampleSet:
+    """
+    Apply count deltas to base samples, samples with resulting zero count are removed
+    :param base: base samples, e.g. snapshot
+    :param records: Iterable[(edges_set_view, count_delta)]
+    :param components_provider: components provider of base samples
+    :return: new sample set
+    """
+    decoder = RecordsDecoder(components_provider, validate_connectivity=False)
+    counts: Dict[SampleGraph, int] = dict(base.items())
+
+    for view, delta in records:
+        outcome = decoder.decode(view)
+        count = counts.get(outcome, 0) + delta
+        assert count >= 0, f"[replay] Count of outcome {outcome} become negative {count}"
+        counts[outcome] = count
+
+    return SampleSetBuilder(components_provider, {o: c for o, c in counts.items() if c > 0}).build()
+
+
+def recover(snapshot: FlatSampleSet, log_path: str, sync: bool = True) -> DeltaLog:
+    """
+    Open delta log of snapshot. Log of earlier generation (crash in between replace of snapshot and reset
+    of log in compact) is already in snapshot so it is reset, torn tail of log is truncated.
+    :param snapshot: loaded snapshot
+    :param log_path: path of delta log, will be created if not exist
+    :param sync: if True then each append will be flushed to disk with fsync
+    :return: opened delta log
+    """
+    log = DeltaLog(log_path, snapshot.generation, sync)
+
+    if log.generation < snapshot.generation:
+        log.reset(snapshot.generation)
+    assert log.generation == snapshot.generation, \
+        f"[recover] Delta log generation {log.generation} is ahead of snapshot generation {snapshot.generation}, " \
+        f"log {log_path} belongs to another snapshot"
+    return log
+
+
+def open_log(snapshot_path: str, log_path: str, sync: bool = True) -> DeltaLog:
+    """
+    Open delta log to append deltas to snapshot, see recover
+    :param snapshot_path: path of snapshot, it is memory mapped and only its header is read
+    :param log_path: path of delta log, will be created if not exist
+    :param sync: if True then each append will be flushed to disk with fsync
+    :return: opened delta log
+    """
+    snapshot = FlatSampleSet.load(snapshot_path)
+    try:
+        return recover(snapshot, log_path, sync)
+    finally:
+        snapshot.close()
+
+
+def _fsync_directory(path: str) -> None:
+    """
+    Flush directory entries of file to disk, so rename of file survives crash
+    :param path: path of file
+    :return: None
+    """
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def compact(snapshot_path: str, log_path: str) -> int:
+    """
+    Replay delta log on snapshot and write result as snapshot of next generation, then reset log.
+    New snapshot is written in temporary file and then atomically replaces old one, so after crash
+    either old snapshot with its log or new snapshot (with log of old generation, reset by recover) remain.
+    :param snapshot_path: path of snapshot
+    :param log_path: path of delta log
+    :return: generation of new snapshot
+    """
+    snapshot = FlatSampleSet.load(snapshot_path)
+    log = recover(snapshot, log_path)
+    try:
+        outcomes = replay(snapshot, log.records(), snapshot.components_provider())
+        temporary_path = snapshot_path + ".tmp"
+        FlatSampleSet.save(outcomes, temporary_path, snapshot.name, snapshot.generation + 1)
+        with open(temporary_path, "r+b") as f:
+            os.fsync(f.fileno())
+        snapshot.close()
+        os.replace(temporary_path, snapshot_path)
+        _fsync_directory(snapshot_path)
+        log.reset(snapshot.generation + 1)
+        return log.generation
+    finally:
+        snapshot.close()
+        log.close()
@@ -0,0 +1,291 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, Any, List, Iterator, Tuple, Callable, Optional
+
+from .graph_components import SampleGraphComponentsProvider, BuilderComponentsProvider, ValueNode, RelationEdge
+from .records import component_to_json, json_to_component
+from .sample_graph import SampleGraph
+from .sample_set import Samples, SampleSet, SampleSetBuilder
+
+FLAT_MAGIC = b"RELNETFS"
+FORMAT_VERSION = 2
+FLAT_HEADER = struct.Struct("<8sIQ")  # (magic, format version, length of JSON dictionary)
+SECTION_ALIGNMENT = 8
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // SECTION_ALIGNMENT) * SECTION_ALIGNMENT
+
+
+def encode_flat(
+        samples: Samples,
+        name: Optional[str] = None,
+        generation: int = 0
+) -> Tuple[bytes, List[Tuple[int, array]], int]:
+    """
+    Encode samples in flat layout: header, UTF-8 JSON dictionary (variables, values, relations encoded with
+    records.component_to_json, sections offsets) and aligned int arrays: interned nodes and edges tables,
+    CSR lists of nodes and edges of each outcome and int64 outcomes counts. Arrays are in native byte order,
+    which is stored in dictionary. Dictionary is plain JSON, so file can be read without executing of any code.
+    :param samples: samples to encode, samples should be unique
+    :param name: optional name to store with samples, e.g. name of relation graph
+    :param generation: number of snapshot, incremented by each compaction of delta log (see delta_log)
+    :return: (header with dictionary, List[(offset, section_array)], total size in bytes)
+    """
+    components_provider: SampleGraphComponentsProvider = samples._components_provider
+    variables = sorted(((var, sorted(values, key=str)) for var, values in components_provider.variables()),
+                       key=lambda vv: str(vv[0]))
+    variable_ids = {var: i for i, (var, _) in enumerate(variables)}
+    value_ids = {var: {val: j for j, val in enumerate(values)} for var, values in variables}
+    edge_relations: Dict[Any, int] = {}  # Relations of edges, may be directed
+    node_ids: Dict[ValueNode, int] = {}
+    edge_ids: Dict[RelationEdge, int] = {}
+
+    sections: Dict[str, array] = {
+        "node_variable": array("i"), "node_value": array("i"),
+        "edge_a": array("i"), "edge_b": array("i"), "edge_relation": array("i"),
+        "outcome_nodes_ptr": array("q", [0]), "outcome_nodes": array("i"),
+        "outcome_edges_ptr": array("q", [0]), "outcome_edges": array("i"),
+        "counts": array("q")}
+
+    def node_id(node: ValueNode) -> int:
+        if node not in node_ids:
+            node_ids[node] = len(node_ids)
+            sections["node_variable"].append(variable_ids[node.variable])
+            sections["node_value"].append(value_ids[node.variable][node.value])
+        return node_ids[node]
+
+    def edge_id(edge: RelationEdge) -> int:
+        if edge not in edge_ids:
+            edge_ids[edge] = len(edge_ids)
+            sections["edge_a"].append(node_id(edge.a))
+            sections["edge_b"].append(node_id(edge.b))
+            sections["edge_relation"].append(edge_relations.setdefault(edge.relation, len(edge_relations)))
+        return edge_ids[edge]
+
+    length = 0
+    for outcome, count in samples.items():
+        sections["outcome_nodes"].extend(node_id(n) for n in outcome.nodes)
+        sections["outcome_edges"].extend(edge_id(e) for e in outcome.edges)
+        sections["outcome_nodes_ptr"].append(len(sections["outcome_nodes"]))
+        sections["outcome_edges_ptr"].append(len(sections["outcome_edges"]))
+        sections["counts"].append(count)
+        length += count
+
+    dictionary: Dict[str, Any] = {
+        "name": component_to_json(name),
+        "generation": generation,
+        "byteorder": sys.byteorder,
+        "variables": [
+            [component_to_json(var), [component_to_json(val) for val in values]] for var, values in variables],
+        "relations": [component_to_json(rel) for rel in sorted(components_provider.relations(), key=str)],
+        "edge_relations": [component_to_json(rel) for rel in edge_relations],
+        "length": length,
+        "number_of_samples": len(sections["counts"]),
+        "sections": {}}
+    offset = 0  # Offsets of sections are relative to end of dictionary
+    for section, values in sections.items():
+        dictionary["sections"][section] = [offset, values.typecode, len(values)]
+        offset = _aligned(offset + len(values) * values.itemsize)
+
+    encoded = json.dumps(dictionary).encode("utf-8")
+    base = _aligned(FLAT_HEADER.size + len(encoded))
+    head = FLAT_HEADER.pack(FLAT_MAGIC, FORMAT_VERSION, len(encoded)) + encoded
+
+    return head, [(base + dictionary["sections"][s][0], values) for s, values in sections.items()], base + offset
+
+
+class FlatSampleSet(Samples):
+    """
+    Immutable collection of unique samples with count, stored in flat layout (see encode_flat) in some buffer:
+    memory mapped file, shared memory block or bytes. Only header is read on open, samples are decoded
+    from buffer on iteration.
+    """
+
+    def __init__(self, buffer: memoryview, close_buffer: Optional[Callable[[], None]] = None):
+        magic, version, dictionary_length = FLAT_HEADER.unpack_from(buffer, 0)
+        assert magic == FLAT_MAGIC, f"[FlatSampleSet.__init__] Buffer not contains flat sample set"
+        assert version == FORMAT_VERSION, \
+            f"[FlatSampleSet.__init__] Unsupported format version {version}, expect {FORMAT_VERSION}"
+
+        dictionary: Dict[str, Any] = json.loads(
+            bytes(buffer[FLAT_HEADER.size:FLAT_HEADER.size + dictionary_length]).decode("utf-8"))
+        assert dictionary["byteorder"] == sys.byteorder, \
+            f"[FlatSampleSet.__init__] Samples are encoded with {dictionary['byteorder']} byte order, " \
+            f"but this machine is {sys.byteorder}"
+
+        base = _aligned(FLAT_HEADER.size + dictionary_length)
+        variables = [
+            (json_to_component(var), [json_to_component(val) for val in values])
+            for var, values in dictionary["variables"]]
+        components_provider = BuilderComponentsProvider(
+            {var: set(values) for var, values in variables}, {json_to_component(r) for r in dictionary["relations"]})
+
+        super(FlatSampleSet, self).__init__(components_provider, {})
+        self.name: Optional[str] = json_to_component(dictionary["name"])
+        self.generation: int = dictionary.get("generation", 0)
+        self.length: int = dictionary["length"]
+        self.number_of_samples: int = dictionary["number_of_samples"]
+        self._buffer: memoryview = buffer
+        self._close_buffer: Optional[Callable[[], None]] = close_buffer
+        self._is_closed: bool = False
+        self._variables: List[Tuple[Any, List[Any]]] = variables
+        self._edge_relations: List[Any] = [json_to_component(r) for r in dictionary["edge_relations"]]
+        self._sections: Dict[str, memoryview] = {
+            section: buffer[base + offset:base + offset + length * array(typecode).itemsize].cast(typecode)
+            for section, (offset, typecode, length) in dictionary["sections"].items()}
+        self._nodes: Optional[List[ValueNode]] = None
+        self._edges: Optional[List[RelationEdge]] = None
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __bool__(self) -> bool:
+        return self.number_of_samples > 0
+
+    def __repr__(self):
+        return f"FlatSampleSet(length = {self.length}, number_of_samples = {self.number_of_samples})"
+
+    def __copy__(self):
+        raise AssertionError("[FlatSampleSet.__copy__] Flat sample set should not be copied")
+
+    @staticmethod
+    def save(samples: Samples, path: str, name: Optional[str] = None, generation: int = 0) -> None:
+        """
+        Write samples in file in flat layout
+        :param samples: samples to write, samples should be unique
+        :param path: path of file to write
+        :param name: optional name to store with samples, e.g. name of relation graph
+        :param generation: number of snapshot, see encode_flat
+        :return: None
+        """
+        head, sections, size = encode_flat(samples, name, generation)
+
+        with open(path, "wb") as f:
+            f.write(head)
+            for offset, values in sections:
+                f.write(bytes(offset - f.tell()))
+                values.tofile(f)
+            f.write(bytes(size - f.tell()))
+
+    @staticmethod
+    def load(path: str, use_mmap: bool = True) -> 'FlatSampleSet':
+        """
+        Open file written by FlatSampleSet.save, only header is read so it is fast for any size of file
+        :param path: path of file to open
+        :param use_mmap: if True file will be memory mapped (read only), otherwise read in memory
+        :return: new flat sample set
+        """
+        with open(path, "rb") as f:
+            if not use_mmap:
+                return FlatSampleSet(memoryview(f.read()))
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return FlatSampleSet(memoryview(mapped), mapped.close)
+
+    def components_provider(self) -> SampleGraphComponentsProvider:
+        """
+        Get components provider of this sample set, samples to query it should be built with it
+        :return: components provider
+        """
+        return self._components_provider
+
+    def _components(self) -> Tuple[List[ValueNode], List[RelationEdge]]:
+        if self._nodes is None:
+            node_variable, node_value = self._sections["node_variable"], self._sections["node_value"]
+            self._nodes = [
+                self._components_provider.get_node(
+                    self._variables[node_variable[i]][0], self._variables[node_variable[i]][1][node_value[i]])
+                for i in range(len(node_variable))]
+            self._edges = [
+                self._components_provider.get_edge(frozenset({self._nodes[a], self._nodes[b]}), self._edge_relations[r])
+                for a, b, r in zip(self._sections["edge_a"], self._sections["edge_b"], self._sections["edge_relation"])]
+        return self._nodes, self._edges
+
+    def items(self) -> Iterator[Tuple[SampleGraph, int]]:
+        """
+        Stream all sample graphs and them counts, samples are decoded from buffer on the fly
+        :return: Iterator[(SampleGraph, count)]
+        """
+        assert not self._is_closed, f"[FlatSampleSet.items] Flat sample set is closed"
+
+        nodes, edges = self._components()
+        nodes_ptr, outcome_nodes = self._sections["outcome_nodes_ptr"], self._sections["outcome_nodes"]
+        edges_ptr, outcome_edges = self._sections["outcome_edges_ptr"], self._sections["outcome_edges"]
+
+        for i, count in enumerate(self._sections["counts"]):
+            yield SampleGraph(
+                self._components_provider,
+                frozenset({nodes[j] for j in outcome_nodes[nodes_ptr[i]:nodes_ptr[i + 1]]}),
+                frozenset({edges[j] for j in outcome_edges[edges_ptr[i]:edges_ptr[i + 1]]}),
+                None), count
+
+    def samples(self) -> Iterator[SampleGraph]:
+        """
+        Stream only sample graphs without count
+        :return: Iterator[SampleGraph]
+        """
+        return (s for s, _ in self.items())
+
+    def count_of(self, sample: SampleGraph) -> int:
+        """
+        Get count for given sample, require scan over all samples
+        :param sample: given sample
+        :return: count of given sample
+        """
+        for s, c in self.items():
+            if s == sample:
+                return c
+        raise AssertionError(f"[FlatSampleSet.count_of] No sample {sample} in this sample set")
+
+    def filter_samples(self, p: Callable[[SampleGraph], bool]) -> SampleSet:
+        """
+        To filter samples with predicate, selected samples are copied in to process memory
+        :param p: predicate to filter one
+        :return: new sample set of selected samples
+        """
+        return SampleSet(self._components_provider, {s: c for s, c in self.items() if p(s)})
+
+    def builder(self) -> SampleSetBuilder:
+        """
+        Load all samples in process memory, in SampleSetBuilder
+        :return: SampleSetBuilder with all samples
+        """
+        return SampleSetBuilder(self._components_provider, {s: c for s, c in self.items()})
+
+    def close(self) -> None:
+        """
+        Release buffer (e.g. unmap file), this sample set should not be used after
+        :return: None
+        """
+        if not self._is_closed:
+            for view in self._sections.values():
+                view.release()
+            self._sections = {}
+            self._buffer.release()
+            if self._close_buffer is not None:
+                self._close_buffer()
+            self._is_closed = True
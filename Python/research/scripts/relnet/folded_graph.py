@@ -19,10 +19,10 @@ created: 2021-10-29
 """
 
 from typing import Any, Dict, Set, Optional
-from pyvis.network import Network
 
 from .graph_components import ValueNode, RelationEdge, SampleGraphComponentsProvider
 from .variables_graph import VariableNode, VariableEdge, VariablesGraph
+from .visualization import new_network, show_network
 
 
 class FoldedNode(VariableNode):
@@ -131,15 +131,22 @@ class FoldedGraph(VariablesGraph):
         """
         return self._nodes_dict.get(variable)
 
-    def visualize(self, name: Optional[str] = None, height: str = "1024px", width: str = "1024px") -> None:
+    def visualize(
+            self,
+            name: Optional[str] = None,
+            height: str = "1024px",
+            width: str = "1024px",
+            show: bool = True
+    ) -> None:
         """
         Will render this variable graph as HTML page and show in browser
         :param name: optional name of this visualization, if None then self.name will passed
         :param height: window height
         :param width: window width
+        :param show: if False then HTML file will be only written (headless mode), without opening in browser
         :return: None
         """
-        net = Network(height=height, width=width)
+        net = new_network(height, width)
         file_name = "".join(c for c in (name if name else self.name) if c.isalnum() or c == '_')
 
         for node in self.nodes:
@@ -161,4 +168,4 @@ class FoldedGraph(VariablesGraph):
                     label=f"{var}:{{{values}, u({self.number_of_outcomes})}}",
                     color="gray")
 
-        net.show(f"{file_name}.html")
+        show_network(net, file_name, show)
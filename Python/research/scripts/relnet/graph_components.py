@@ -19,7 +19,27 @@ created: 2021-11-09
 """
 
 from abc import abstractmethod, ABC
-from typing import Dict, Set, Any, Tuple
+from hashlib import blake2b
+from typing import Dict, Set, Any, Tuple, Iterable
+
+FINGERPRINT_SIZES = {8, 16}  # Supported digest sizes of fingerprints in bytes, i.e. 64 and 128 bit
+
+
+def content_fingerprint(keys: Iterable[bytes], digest_size: int = 16) -> bytes:
+    """
+    Compute BLAKE2b fingerprint of unordered collection of content keys, keys are sorted
+    so fingerprint not depends on iteration order
+    :param keys: content keys, e.g. of nodes and edges
+    :param digest_size: size of fingerprint in bytes, 8 or 16
+    :return: fingerprint
+    """
+    assert digest_size in FINGERPRINT_SIZES, \
+        f"[content_fingerprint] Digest size should be one of {FINGERPRINT_SIZES}, got {digest_size}"
+    acc = blake2b(digest_size=digest_size)
+    for key in sorted(keys):
+        acc.update(len(key).to_bytes(4, "little"))
+        acc.update(key)
+    return acc.digest()
 
 
 class ValueNode:
@@ -31,9 +51,10 @@ class ValueNode:
         self.variable: Any = variable
         self.value: Any = value
         self.string_id: str = f"{variable}_{value}"
+        self._hash: int = (variable, value).__hash__()
 
     def __hash__(self):
-        return (self.variable, self.value).__hash__()
+        return self._hash
 
     def __repr__(self):
         return f"({self.string_id})"
@@ -48,6 +69,13 @@ class ValueNode:
             return self.variable == other.variable and self.value == other.value
         return False
 
+    def content_key(self) -> bytes:
+        """
+        Canonical content of this node, same in all processes if variable and value have stable repr
+        :return: content key
+        """
+        return repr((self.variable, self.value)).encode()
+
     def var_val(self) -> (Any, Any):
         """
         Get variable and value in form of tuple
@@ -67,9 +95,10 @@ class RelationEdge:
         self.relation: Any = relation
         self.a: ValueNode = endpoints_list[0]
         self.b: ValueNode = endpoints_list[1]
+        self._hash: int = (endpoints, relation).__hash__()
 
     def __hash__(self):
-        return (self.endpoints, self.relation).__hash__()
+        return self._hash
 
     def __repr__(self):
         se = sorted([str(ep) for ep in self.endpoints])
@@ -85,6 +114,13 @@ class RelationEdge:
             return self.endpoints == other.endpoints and self.relation == other.relation
         return False
 
+    def content_key(self) -> bytes:
+        """
+        Canonical content of this edge, same in all processes if variables, values and relation have stable repr
+        :return: content key
+        """
+        return repr((tuple(sorted(repr(ep.var_val()) for ep in self.endpoints)), self.relation)).encode()
+
     def is_endpoint(self, node: ValueNode) -> bool:
         """
         To check if given node is one of edge endpoints
@@ -154,6 +190,26 @@ class SampleGraphComponentsProvider(ABC):
     def get_edge(self, endpoints: frozenset[ValueNode], relation: Any) -> RelationEdge:
         raise NotImplementedError
 
+    def has_same_schema(self, other: 'SampleGraphComponentsProvider') -> bool:
+        """
+        Check if other components provider have same variables, values and relations
+        :param other: other components provider
+        :return: True if same schema
+        """
+        return self is other or (self.variables() == other.variables() and self.relations() == other.relations())
+
+    def schema_fingerprint(self, digest_size: int = 16) -> bytes:
+        """
+        Compute fingerprint of variables, values and relations, to compare schema of providers
+        in different processes without sending them
+        :param digest_size: size of fingerprint in bytes, 8 or 16
+        :return: fingerprint
+        """
+        return content_fingerprint(
+            [b"v" + repr((var, sorted(repr(v) for v in values))).encode() for var, values in self.variables()]
+            + [b"r" + repr(r).encode() for r in self.relations()],
+            digest_size)
+
 
 class BuilderComponentsProvider(SampleGraphComponentsProvider):
     """
@@ -194,7 +250,7 @@ class BuilderComponentsProvider(SampleGraphComponentsProvider):
             return node
 
     def get_edge(self, endpoints: frozenset[ValueNode], relation: Any) -> RelationEdge:
-        assert endpoints.issubset(self.nodes.values()), \
+        assert all(self.nodes.get((ep.variable, ep.value)) == ep for ep in endpoints), \
             f"[BuilderComponentsProvider.get_edge] Endpoints nodes should be created first, " \
             f"got {endpoints} where nodes {self.nodes}"
         assert (relation.relation if isinstance(relation, DirectedRelation) else relation) in self._relations, \
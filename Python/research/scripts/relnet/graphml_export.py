@@ -0,0 +1,257 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+from typing import Dict, Any, Optional, Tuple, TextIO, Iterable
+from xml.sax.saxutils import escape, quoteattr
+
+from .activation_graph import ActivationGraph
+from .folded_graph import FoldedGraph
+from .graph_components import DirectedRelation, ValueNode
+from .sample_set import Samples
+from .variables_graph import VariablesGraph
+
+GRAPHML_HEAD = \
+    '<?xml version="1.0" encoding="UTF-8"?>\n' \
+    '<graphml xmlns="http://graphml.graphdrawing.org/xmlns" ' \
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" ' \
+    'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns ' \
+    'http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">\n'
+
+# Same attributes declared in all exported files, so files can be loaded together, (for, name) -> GraphML type
+GRAPHML_KEYS: Dict[Tuple[str, str], str] = {
+    ("graph", "number_of_outcomes"): "long",
+    ("node", "label"): "string",
+    ("node", "variable"): "string",
+    ("node", "value"): "string",
+    ("node", "count"): "long",
+    ("node", "unobserved"): "long",
+    ("node", "weight"): "double",
+    ("node", "in_query"): "boolean",
+    ("node", "outcome"): "long",
+    ("edge", "label"): "string",
+    ("edge", "relation"): "string",
+    ("edge", "count"): "long",
+    ("edge", "in_query"): "boolean",
+    ("edge", "outcome"): "long"}
+
+
+def _format(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return repr(value)
+    return escape(str(value))
+
+
+class GraphMLWriter:
+    """
+    Streaming GraphML writer, each node and edge is written to file as soon as added,
+    so memory used not depends on number of them. Nodes can be nested in group nodes (as yEd groups).
+    """
+
+    def __init__(self, path: str, name: str, number_of_outcomes: Optional[int] = None):
+        self._file: TextIO = open(path, "w", encoding="utf-8")
+        self._number_of_edges: int = 0
+        self._groups: int = 0
+
+        self._file.write(GRAPHML_HEAD)
+        for (domain, attribute), attribute_type in GRAPHML_KEYS.items():
+            self._file.write(
+                f'  <key id="{domain}_{attribute}" for="{domain}" '
+                f'attr.name="{attribute}" attr.type="{attribute_type}"/>\n')
+        self._file.write(f'  <graph id={quoteattr(name)} edgedefault="undirected">\n')
+        self._file.write(self._data("graph", {"number_of_outcomes": number_of_outcomes}, 2))
+
+    def __repr__(self):
+        return f"GraphMLWriter(path = {self._file.name}, number_of_edges = {self._number_of_edges})"
+
+    def __copy__(self):
+        raise AssertionError("[GraphMLWriter.__copy__] GraphML writer should not be copied")
+
+    @staticmethod
+    def _data(domain: str, data: Dict[str, Any], indent: int) -> str:
+        for attribute in data.keys():
+            assert (domain, attribute) in GRAPHML_KEYS, f"[GraphMLWriter._data] Unknown {domain} attribute {attribute}"
+        return "".join(
+            f'{"  " * indent}<data key="{domain}_{attribute}">{_format(value)}</data>\n'
+            for attribute, value in data.items() if value is not None)
+
+    def add_node(self, node_id: str, data: Dict[str, Any]) -> None:
+        """
+        Write node
+        :param node_id: unique ID of node, IDs of nested nodes should be prefixed with group ID and "::"
+        :param data: Dict[attribute, value], attributes with None values are skipped
+        :return: None
+        """
+        indent = 2 + self._groups * 2
+        self._file.write(
+            f'{"  " * indent}<node id={quoteattr(node_id)}>\n{self._data("node", data, indent + 1)}'
+            f'{"  " * indent}</node>\n')
+
+    def begin_group(self, node_id: str, data: Dict[str, Any]) -> None:
+        """
+        Write opening of group node, nodes added until end_group will be nested in it
+        :param node_id: unique ID of group node
+        :param data: Dict[attribute, value], attributes with None values are skipped
+        :return: None
+        """
+        indent = 2 + self._groups * 2
+        self._file.write(
+            f'{"  " * indent}<node id={quoteattr(node_id)}>\n{self._data("node", data, indent + 1)}'
+            f'{"  " * (indent + 1)}<graph id={quoteattr(node_id + ":")} edgedefault="undirected">\n')
+        self._groups += 1
+
+    def end_group(self) -> None:
+        """
+        Write closing of last opened group node
+        :return: None
+        """
+        assert self._groups > 0, f"[GraphMLWriter.end_group] No opened group"
+        self._groups -= 1
+        indent = 2 + self._groups * 2
+        self._file.write(f'{"  " * (indent + 1)}</graph>\n{"  " * indent}</node>\n')
+
+    def add_edge(self, source: str, target: str, data: Dict[str, Any], directed: bool = False) -> None:
+        """
+        Write edge, in GraphML edge can connect nodes of any nesting level
+        :param source: ID of source node
+        :param target: ID of target node
+        :param data: Dict[attribute, value], attributes with None values are skipped
+        :param directed: if True then edge will be marked as directed
+        :return: None
+        """
+        indent = 2 + self._groups * 2
+        direction = ' directed="true"' if directed else ""
+        self._file.write(
+            f'{"  " * indent}<edge id="e{self._number_of_edges}" source={quoteattr(source)} '
+            f'target={quoteattr(target)}{direction}>\n{self._data("edge", data, indent + 1)}{"  " * indent}</edge>\n')
+        self._number_of_edges += 1
+
+    def close(self) -> None:
+        """
+        Close all opened groups, write end of document and close file
+        :return: None
+        """
+        while self._groups:
+            self.end_group()
+        self._file.write('  </graph>\n</graphml>\n')
+        self._file.close()
+
+
+def _oriented(endpoints: Iterable[ValueNode], relation: Any) -> Tuple[ValueNode, ValueNode, bool]:
+    """
+    Order endpoints of relation edge: from source to target for DirectedRelation, by string ID otherwise
+    :param endpoints: two endpoints of edge
+    :param relation: relation of edge
+    :return: (source, target, is_directed)
+    """
+    a, b = sorted(endpoints, key=lambda n: n.string_id)
+    if isinstance(relation, DirectedRelation):
+        return (a, b, True) if a.variable == relation.source_variable else (b, a, True)
+    return a, b, False
+
+
+def write_graphml(graph: VariablesGraph, path: str) -> None:
+    """
+    Write folded or activation graph as GraphML file. Each variable is written as group node with nested
+    value nodes. For folded graph value nodes have counts (and weights, count / number of outcomes)
+    and relation edges connect value nodes. For activation graph value nodes have weights
+    and relation edges (one per relation) connect variable nodes.
+    Nested nodes are shown by yEd as groups, readers which not support nested graphs will skip value nodes.
+    :param graph: FoldedGraph or ActivationGraph
+    :param path: path of file to write
+    :return: None
+    """
+    assert isinstance(graph, (FoldedGraph, ActivationGraph)), \
+        f"[write_graphml] Expect FoldedGraph or ActivationGraph, got {type(graph).__name__}"
+
+    writer = GraphMLWriter(path, graph.name, graph.number_of_outcomes)
+    variable_ids: Dict[Any, str] = {}
+    outcomes = graph.number_of_outcomes
+
+    for node in graph.nodes:
+        variable_id = variable_ids.setdefault(node.variable, f"n{len(variable_ids)}")
+        if isinstance(graph, FoldedGraph):
+            unobserved = node.unobserved_count()
+            writer.begin_group(variable_id, {
+                "label": str(node.variable), "variable": node.variable,
+                "count": outcomes - unobserved, "unobserved": unobserved})
+            for value_node, count in node.value_nodes:
+                writer.add_node(f"{variable_id}::{value_node.string_id}", {
+                    "label": f"{value_node.value}({count})", "variable": value_node.variable,
+                    "value": value_node.value, "count": count, "weight": count / outcomes if outcomes else None})
+        else:
+            writer.begin_group(variable_id, {
+                "label": str(node.variable), "variable": node.variable, "in_query": node.in_query})
+            for value, weight in node.values:
+                writer.add_node(f"{variable_id}::{node.variable}_{value}", {
+                    "label": f"{value}({weight:.4f})", "variable": node.variable, "value": value,
+                    "weight": weight, "in_query": node.in_query})
+        writer.end_group()
+
+    for edge in graph.edges:
+        if isinstance(graph, FoldedGraph):
+            for relation_edge, count in edge.relation_edges:
+                source, target, directed = _oriented(relation_edge.endpoints, relation_edge.relation)
+                writer.add_edge(
+                    f"{variable_ids[source.variable]}::{source.string_id}",
+                    f"{variable_ids[target.variable]}::{target.string_id}",
+                    {"label": f"{relation_edge.relation}({count})", "relation": relation_edge.relation,
+                     "count": count},
+                    directed)
+        else:
+            a, b = sorted(edge.endpoints, key=str)
+            for relation, count in edge.relations:
+                directed = isinstance(relation, DirectedRelation)
+                source, target = (relation.source_variable, relation.target_variable) if directed else (a, b)
+                writer.add_edge(
+                    variable_ids[source], variable_ids[target],
+                    {"label": f"{relation}({count})", "relation": relation, "count": count,
+                     "in_query": edge.in_query},
+                    directed)
+
+    writer.close()
+
+
+def write_outcomes_graphml(samples: Samples, path: str, name: str) -> None:
+    """
+    Write all outcomes as one GraphML file, outcomes are streamed from samples. Each outcome is
+    written as disconnected subgraph of value nodes and relation edges, which have same "outcome" attribute
+    (index of outcome) and "count" attribute (number of outcome occurrences).
+    :param samples: outcomes to write
+    :param path: path of file to write
+    :param name: name of graph
+    :return: None
+    """
+    writer = GraphMLWriter(path, name, len(samples))
+
+    for outcome_id, (outcome, count) in enumerate(samples.items()):
+        for node in outcome.nodes:
+            writer.add_node(f"o{outcome_id}::{node.string_id}", {
+                "label": node.string_id, "variable": node.variable, "value": node.value,
+                "count": count, "outcome": outcome_id})
+        for edge in outcome.edges:
+            source, target, directed = _oriented(edge.endpoints, edge.relation)
+            writer.add_edge(
+                f"o{outcome_id}::{source.string_id}", f"o{outcome_id}::{target.string_id}",
+                {"label": str(edge.relation), "relation": edge.relation, "count": count, "outcome": outcome_id},
+                directed)
+
+    writer.close()
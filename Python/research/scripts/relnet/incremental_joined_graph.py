@@ -0,0 +1,204 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+from typing import Dict, Any, Optional, Tuple, List, Iterator
+
+from .graph_components import SampleGraphComponentsProvider
+from .joint_view import JointView
+from .sample_graph import SampleGraph
+from .sample_set import SampleSet
+from .sample_space import SampleSpace
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .relation_graph import RelationGraph
+
+
+Index = Dict[frozenset[Tuple[Any, Any]], Dict[SampleGraph, int]]  # Values of shared variables -> outcomes with count
+
+
+class IncrementalJoinedGraph:
+    """
+    Mutable joined distribution of factorized relation graph, which on each added factor outcome
+    updates only joined outcomes that contain this outcome. Outcomes of factors are indexed by values
+    of variables shared with factors joined before them, indexes are updated in place, so added outcome
+    is joined with matching outcomes only.
+    """
+
+    def __init__(
+            self,
+            components_provider: SampleGraphComponentsProvider,
+            factors: frozenset[SampleSet],
+            name: Optional[str] = None
+    ):
+        self._components_provider: SampleGraphComponentsProvider = components_provider
+        self._name: Optional[str] = name
+        self._factors: Dict[frozenset[Any], Dict[SampleGraph, int]] = {
+            SampleSpace.factor_key(next(iter(f.samples()))): {o: c for o, c in f.items()} for f in factors if f}
+        self._variables: Dict[frozenset[Any], frozenset[Any]] = {
+            k: next(iter(f)).included_variables for k, f in self._factors.items()}
+        self._plans: Dict[frozenset[Any], List[Tuple[frozenset[Any], frozenset[Any]]]] = {}
+        self._indexes: Dict[frozenset[Any], Dict[frozenset[Any], Index]] = {}  # Factor -> shared variables -> index
+        self._joined: Dict[SampleGraph, int] = {}
+        self._join_all()
+
+    def __repr__(self):
+        return f"IncrementalJoinedGraph(name = {self._name}, number_of_factors = {len(self._factors)}, " \
+               f"number_of_joined = {len(self._joined)})"
+
+    def __copy__(self):
+        raise AssertionError("[IncrementalJoinedGraph.__copy__] Incremental joined graph should not be copied")
+
+    def _join_all(self) -> None:
+        factors = frozenset({SampleSet(self._components_provider, f) for f in self._factors.values()})
+        self._joined = dict(JointView(self._components_provider, factors).outcomes())
+        self._plans = {}
+        self._indexes = {}
+
+    def _plan(self, key: frozenset[Any]) -> List[Tuple[frozenset[Any], frozenset[Any]]]:
+        """
+        Order in which other factors are joined to outcome of given factor, next factor is one which share
+        most variables with already joined (same as in JointView), calculated once per factor
+        :param key: key of factor
+        :return: List[(factor_key, shared_variables)]
+        """
+        if key not in self._plans:
+            pending = [k for k in self._factors.keys() if k != key]
+            seen_variables = set(self._variables[key])
+            plan: List[Tuple[frozenset[Any], frozenset[Any]]] = []
+            while pending:
+                i = max(range(len(pending)), key=lambda j: len(self._variables[pending[j]] & seen_variables))
+                next_key = pending.pop(i)
+                plan.append((next_key, frozenset(self._variables[next_key] & seen_variables)))
+                seen_variables.update(self._variables[next_key])
+            self._plans[key] = plan
+        return self._plans[key]
+
+    def _index(self, key: frozenset[Any], shared: frozenset[Any]) -> Index:
+        """
+        Get index of factor outcomes by values of shared variables, built on first use
+        :param key: key of factor
+        :param shared: shared variables
+        :return: index of factor outcomes
+        """
+        indexes = self._indexes.setdefault(key, {})
+        if shared not in indexes:
+            index: Index = {}
+            for o, c in self._factors[key].items():
+                index.setdefault(frozenset({(var, val) for var, val in o.values() if var in shared}), {})[o] = c
+            indexes[shared] = index
+        return indexes[shared]
+
+    def _combinations(self, outcome: SampleGraph, key: frozenset[Any]) -> Iterator[Tuple[List[SampleGraph], int]]:
+        """
+        Walk over all combinations of given outcome with outcomes of other factors, which have matching values
+        of shared variables
+        :param outcome: outcome of factor
+        :param key: key of factor of outcome
+        :return: Iterator[(List[factor_outcome], product_of_other_counts)]
+        """
+        plan = [(shared, self._index(k, shared)) for k, shared in self._plan(key)]
+        assignment: Dict[Any, Any] = dict(outcome.values())
+        selected: List[SampleGraph] = [outcome]
+
+        def walk(i: int, count: int) -> Iterator[Tuple[List[SampleGraph], int]]:
+            if i == len(plan):
+                yield list(selected), count
+                return
+            shared, index = plan[i]
+            for o, c in index.get(frozenset({(var, assignment[var]) for var in shared}), {}).items():
+                new_variables = [n for n in o.nodes if n.variable not in assignment]
+                for n in new_variables:
+                    assignment[n.variable] = n.value
+                selected.append(o)
+                yield from walk(i + 1, count * c)
+                selected.pop()
+                for n in new_variables:
+                    del assignment[n.variable]
+
+        yield from walk(0, 1)
+
+    def add_outcome(self, outcome: SampleGraph, count: int = 1) -> 'IncrementalJoinedGraph':
+        """
+        Add count to outcome of one of factors and update joined outcomes which contain it,
+        with count multiplied on counts of matching outcomes of other factors.
+        If outcome start new factor then all joined outcomes will rebuilt.
+        :param outcome: outcome to be added, should be created with same SampleGraphComponentsProvider
+        :param count: outcome count, should be >= 1
+        :return: self
+        """
+        assert outcome.is_compatible(self._components_provider), \
+            f"[IncrementalJoinedGraph.add_outcome] Outcome {outcome} is not compatible with this joined graph"
+        assert count >= 1, \
+            f"[IncrementalJoinedGraph.add_outcome] Expect count be >= 1, but got {count}"
+
+        key = SampleSpace.factor_key(outcome)
+
+        if key not in self._factors:
+            for other_key in self._factors.keys():
+                assert other_key.isdisjoint(key), \
+                    f"[IncrementalJoinedGraph.add_outcome] Outcome {outcome} overlap with factor {other_key}"
+            self._factors[key] = {outcome: count}
+            self._variables[key] = outcome.included_variables
+            self._join_all()
+            return self
+
+        for selected, other_count in self._combinations(outcome, key):
+            joined = SampleGraph(
+                self._components_provider,
+                frozenset({n for o in selected for n in o.nodes}),
+                frozenset({e for o in selected for e in o.edges}),
+                None)
+            self._joined[joined] = self._joined.get(joined, 0) + count * other_count
+
+        new_count = self._factors[key].get(outcome, 0) + count
+        self._factors[key][outcome] = new_count
+        for shared, index in self._indexes.get(key, {}).items():
+            index.setdefault(frozenset({(var, val) for var, val in outcome.values() if var in shared}), {})[outcome] \
+                = new_count
+        return self
+
+    def joined_outcomes(self) -> SampleSet:
+        """
+        Get current joined outcomes
+        :return: sample set of joined outcomes
+        """
+        return SampleSet(self._components_provider, self._joined)
+
+    def relation_graph(self, name: Optional[str] = None) -> 'RelationGraph':
+        """
+        Build relation graph with current joined outcomes
+        :param name: optional name for the relation graph, if None then name of this graph will be used
+        :return: new instance of relation graph
+        """
+        from .relation_graph import RelationGraph
+        return RelationGraph(self._components_provider, name if name else self._name, self.joined_outcomes())
+
+    def factors_graph(self, name: Optional[str] = None) -> 'RelationGraph':
+        """
+        Build factorized relation graph with all outcomes added so far
+        :param name: optional name for the relation graph, if None then name of this graph will be used
+        :return: new instance of relation graph
+        """
+        from .relation_graph import RelationGraph
+        return RelationGraph(
+            self._components_provider,
+            name if name else self._name,
+            SampleSet(self._components_provider, {o: c for f in self._factors.values() for o, c in f.items()}))
@@ -0,0 +1,165 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+from math import prod
+from typing import Dict, Set, Any, Tuple, List, Iterator, Optional
+
+from .graph_components import SampleGraphComponentsProvider
+from .sample_graph import SampleGraph
+from .sample_set import SampleSet
+from .variable_elimination import CountTable, eliminate
+
+
+class JointView:
+    """
+    Immutable lazy view over joined distribution of factorized relation graph,
+    joined outcomes are composed on demand, without materialization of the whole joined sample set.
+    Joined outcome is composed only from combination with one outcome of each factor, so if some factor
+    have no outcomes for value of shared variable, outcomes of other factors with this value are dropped,
+    while RelationGraph.make_joined() keep them joined partially (without variables of such factor).
+    """
+
+    def __init__(self, components_provider: SampleGraphComponentsProvider, factors: frozenset[SampleSet]):
+        self._components_provider: SampleGraphComponentsProvider = components_provider
+        self._factors: List[List[Tuple[SampleGraph, int]]] = []
+        self._variables: List[frozenset[Any]] = []
+        self._shared_variables: List[frozenset[Any]] = []
+        self._factor_index: List[Dict[frozenset[Tuple[Any, Any]], List[Tuple[SampleGraph, int]]]] = []
+        self._values_counts: List[Dict[frozenset[Tuple[Any, Any]], int]] = []
+        self._length: Optional[int] = None
+
+        pending = [(list(f.items()), next(iter(f.samples())).included_variables) for f in factors if f]
+        seen_variables: Set[Any] = set({})
+
+        while pending:  # Next factor is one which share most variables with already added, to prune earlier
+            i = max(range(len(pending)), key=lambda j: len(pending[j][1] & seen_variables))
+            items, variables = pending.pop(i)
+            shared = frozenset(variables & seen_variables)
+            index: Dict[frozenset[Tuple[Any, Any]], List[Tuple[SampleGraph, int]]] = {}
+            values_counts: Dict[frozenset[Tuple[Any, Any]], int] = {}
+
+            for o, c in items:
+                assert o.included_variables == variables, \
+                    f"[JointView.__init__] All outcomes of factor should have same variables, " \
+                    f"got {o.included_variables} and {variables}"
+                values = frozenset(o.values())
+                key = frozenset({(var, val) for var, val in values if var in shared})
+                index.setdefault(key, []).append((o, c))
+                values_counts[values] = values_counts.get(values, 0) + c
+
+            self._factors.append(items)
+            self._variables.append(variables)
+            self._shared_variables.append(shared)
+            self._factor_index.append(index)
+            self._values_counts.append(values_counts)
+            seen_variables.update(variables)
+
+        self.variables: frozenset[Any] = frozenset(seen_variables)
+        self.number_of_factors: int = len(self._factors)
+        self.number_of_combinations: int = prod(len(f) for f in self._factors) if self._factors else 0
+
+    def __repr__(self):
+        return f"JointView(number_of_factors = {self.number_of_factors}, " \
+               f"number_of_combinations = {self.number_of_combinations})"
+
+    def __copy__(self):
+        raise AssertionError("[JointView.__copy__] Joint view should not be copied")
+
+    def _combinations(self) -> Iterator[Tuple[List[SampleGraph], int]]:
+        """
+        Walk over all combinations of factor outcomes which have matching values of shared variables
+        :return: Iterator[(List[factor_outcome], joined_count)]
+        """
+        if not self._factors:
+            return
+
+        assignment: Dict[Any, Any] = {}
+        selected: List[SampleGraph] = []
+
+        def walk(i: int, count: int) -> Iterator[Tuple[List[SampleGraph], int]]:
+            if i == self.number_of_factors:
+                yield list(selected), count
+                return
+            key = frozenset({(var, assignment[var]) for var in self._shared_variables[i]})
+            for o, c in self._factor_index[i].get(key, []):
+                new_variables = [n for n in o.nodes if n.variable not in assignment]
+                for n in new_variables:
+                    assignment[n.variable] = n.value
+                selected.append(o)
+                yield from walk(i + 1, count * c)
+                selected.pop()
+                for n in new_variables:
+                    del assignment[n.variable]
+
+        yield from walk(0, 1)
+
+    def outcomes(self) -> Iterator[Tuple[SampleGraph, int]]:
+        """
+        Stream joined outcomes, each composed from one outcome of each factor, see class description
+        :return: Iterator[(joined_outcome, count)]
+        """
+        for selected, count in self._combinations():
+            yield SampleGraph(
+                self._components_provider,
+                frozenset({n for o in selected for n in o.nodes}),
+                frozenset({e for o in selected for e in o.edges}),
+                None), count
+
+    def length(self) -> int:
+        """
+        Total count of joined outcomes (normalization constant of joined distribution), calculated once
+        by variable elimination over counts of factors values, without walking over combinations
+        :return: sum of counts of all joined outcomes
+        """
+        if self._length is None:
+            tables = [
+                CountTable(tuple(variables), {tuple(dict(values)[var] for var in variables): c
+                                              for values, c in values_counts.items()})
+                for variables, values_counts in zip(self._variables, self._values_counts)]
+            self._length = eliminate(tables, set({})).counts.get((), 0) if tables else 0
+        return self._length
+
+    def count_of(self, values: Set[Tuple[Any, Any]]) -> int:
+        """
+        Get count of all joined outcomes which have given values, values should cover all variables of the view
+        :param values: Set[(variable, value)], one value per variable
+        :return: count of joined outcomes with given values
+        """
+        assignment: Dict[Any, Any] = dict(values)
+        assert len(assignment) == len(values), \
+            f"[JointView.count_of] Expect exactly one value per variable, got {values}"
+        assert self.variables.issubset(assignment.keys()), \
+            f"[JointView.count_of] Values should cover all variables {self.variables}, got {values}"
+
+        count = 1 if self._factors else 0
+        for variables, values_counts in zip(self._variables, self._values_counts):
+            count *= values_counts.get(frozenset({(var, assignment[var]) for var in variables}), 0)
+            if not count:
+                return 0
+        return count
+
+    def probability_of(self, values: Set[Tuple[Any, Any]]) -> float:
+        """
+        Get joined probability of given full assignment
+        :param values: Set[(variable, value)], one value per variable
+        :return: probability of given values
+        """
+        count = self.count_of(values)
+        return count / self.length() if count else 0.0
@@ -0,0 +1,286 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import heapq
+import html
+import json
+import os
+import random
+import webbrowser
+from typing import Dict, Any, List, Optional, Tuple, Iterator, Iterable, TextIO
+
+from .sample_graph import SampleGraph
+from .sample_set import Samples
+
+Entry = Dict[str, Any]  # JSON compatible entry: {"label", "count", "number_of_outcomes", "nodes", "edges"}
+
+VIS_NETWORK_URL = "https://unpkg.com/vis-network@9.1.9/standalone/umd/vis-network.min.js"
+PAGE_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="{script}"></script>
+<style>body {{font-family: sans-serif;}} #graph {{width: {width}; height: {height}; border: 1px solid #ccc;}}</style>
+</head>
+<body>
+<h3>{title}</h3>
+<div id="graph"></div>
+<script>
+const evidence = {evidence};
+const entries = [
+"""
+PAGE_TAIL = """];
+const nodes = [], edges = [];
+const add = (entry, prefix, color) => {
+  entry.nodes.forEach((n, i) => nodes.push({id: prefix + n, color: color,
+    label: i === 0 && entry.label ? n + "@" + entry.label : n}));
+  entry.edges.forEach(([a, b, r]) => edges.push({from: prefix + a, to: prefix + b, label: r, color: color}));
+};
+entries.forEach((entry, i) => add(entry, i + ":", undefined));
+if (evidence) add(evidence, "evidence:", "red");
+new vis.Network(document.getElementById("graph"), {nodes: new vis.DataSet(nodes), edges: new vis.DataSet(edges)},
+  {layout: {improvedLayout: false}, physics: {stabilization: {iterations: 100}}});
+</script>
+"""
+
+
+def script_json(value: Any) -> str:
+    """
+    Serialize value to JSON which is safe to embed in inline HTML <script>: characters '<', '>' and '&'
+    are escaped as unicode sequences, so string values like '</script>' can't close script element
+    :param value: JSON compatible value
+    :return: JSON string
+    """
+    return json.dumps(value).replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026")
+
+
+def outcome_entry(outcome: SampleGraph, count: int) -> Entry:
+    """
+    Convert outcome to JSON compatible entry
+    :param outcome: outcome sample graph
+    :param count: outcome count
+    :return: entry with nodes string IDs and edges [a, b, relation]
+    """
+    return {
+        "label": f"{outcome.name}({count})",
+        "count": count,
+        "number_of_outcomes": 1,
+        "nodes": sorted(n.string_id for n in outcome.nodes),
+        "edges": sorted(sorted(n.string_id for n in e.endpoints) + [str(e.relation)] for e in outcome.edges)}
+
+
+def aggregate_outcomes(outcomes: Iterable[Tuple[SampleGraph, int]]) -> Iterator[Entry]:
+    """
+    Aggregate outcomes by shape: outcomes with same variables and same relations in between them
+    (but different values) became one entry, with variables as nodes and summed count
+    :param outcomes: Iterable[(outcome, count)]
+    :return: Iterator[entry], one per shape
+    """
+    groups: Dict[Tuple[frozenset, frozenset], List[int]] = {}
+
+    for outcome, count in outcomes:
+        key = (frozenset(str(v) for v in outcome.included_variables),
+               frozenset((frozenset({str(e.a.variable), str(e.b.variable)}), str(e.relation)) for e in outcome.edges))
+        acc = groups.setdefault(key, [0, 0])
+        acc[0] += count
+        acc[1] += 1
+
+    for (variables, edges), (count, number_of_outcomes) in groups.items():
+        yield {
+            "label": f"{number_of_outcomes} outcomes({count})",
+            "count": count,
+            "number_of_outcomes": number_of_outcomes,
+            "nodes": sorted(variables),
+            "edges": sorted(sorted(endpoints) + [relation] for endpoints, relation in edges)}
+
+
+class OutcomesRenderer:
+    """
+    Immutable renderer of large collection of outcomes into pages of HTML (vis-network) or JSON files.
+    Outcomes are streamed: entries are written to page files one by one, so only selected top-N or sample
+    (at most N entries) or aggregation groups are kept in memory. Files are written without opening browser
+    (headless mode), so rendering can be used in batch jobs.
+    """
+
+    def __init__(
+            self,
+            page_size: int = 500,
+            top_n: Optional[int] = None,
+            sample_size: Optional[int] = None,
+            aggregate: bool = False,
+            output_format: str = "html",
+            seed: Optional[int] = None,
+            height: str = "1024px",
+            width: str = "100%"
+    ):
+        """
+        :param page_size: max number of entries on one page
+        :param top_n: if set then only N entries with highest counts will be rendered, ordered by count
+        :param sample_size: if set then N entries will be sampled in proportion to them counts (without replacement)
+        :param aggregate: if True then outcomes will be aggregated by shape (see aggregate_outcomes)
+        :param output_format: "html" or "json"
+        :param seed: optional seed of random generator used for sampling
+        :param height: height of graph on HTML page
+        :param width: width of graph on HTML page
+        """
+        assert page_size > 0, f"[OutcomesRenderer.__init__] Page size should be > 0, got {page_size}"
+        assert top_n is None or sample_size is None, \
+            f"[OutcomesRenderer.__init__] Only one of top_n or sample_size can be set"
+        assert (top_n is None or top_n > 0) and (sample_size is None or sample_size > 0), \
+            f"[OutcomesRenderer.__init__] top_n and sample_size should be > 0, got {top_n} and {sample_size}"
+        assert output_format in {"html", "json"}, \
+            f"[OutcomesRenderer.__init__] Output format should be 'html' or 'json', got {output_format}"
+
+        self.page_size: int = page_size
+        self.top_n: Optional[int] = top_n
+        self.sample_size: Optional[int] = sample_size
+        self.aggregate: bool = aggregate
+        self.output_format: str = output_format
+        self.seed: Optional[int] = seed
+        self.height: str = height
+        self.width: str = width
+
+    def __repr__(self):
+        return f"OutcomesRenderer(page_size = {self.page_size}, top_n = {self.top_n}, " \
+               f"sample_size = {self.sample_size}, aggregate = {self.aggregate}, format = {self.output_format})"
+
+    def select(self, outcomes: Samples) -> Iterator[Entry]:
+        """
+        Convert outcomes to entries, aggregated and selected according to settings of this renderer
+        :param outcomes: outcomes to render
+        :return: Iterator[entry]
+        """
+        if self.aggregate:
+            entries = ((e, e["count"]) for e in aggregate_outcomes(outcomes.items()))
+        else:
+            entries = outcomes.items()
+
+        if self.top_n is not None:
+            selected = heapq.nlargest(self.top_n, enumerate(entries), key=lambda ie: ie[1][1])
+            return (self._entry(e, c) for _, (e, c) in selected)
+
+        if self.sample_size is not None:  # Weighted reservoir sampling (A-Res), keys are u^(1/count)
+            rnd = random.Random(self.seed)
+            heap: List[Tuple[float, int, Any, int]] = []
+            for i, (e, c) in enumerate(entries):
+                key = rnd.random() ** (1.0 / c)
+                if len(heap) < self.sample_size:
+                    heapq.heappush(heap, (key, i, e, c))
+                elif key > heap[0][0]:
+                    heapq.heapreplace(heap, (key, i, e, c))
+            return (self._entry(e, c) for _, _, e, c in sorted(heap, key=lambda k: k[1]))
+
+        return (self._entry(e, c) for e, c in entries)
+
+    @staticmethod
+    def _entry(entry: Any, count: int) -> Entry:
+        return outcome_entry(entry, count) if isinstance(entry, SampleGraph) else entry
+
+    def _open_page(self, directory: str, name: str, page: int, evidence: Optional[Entry]) -> Tuple[str, TextIO]:
+        path = os.path.join(directory, f"{name}_{page:04d}.{self.output_format}")
+        file = open(path, "w", encoding="utf-8")
+        if self.output_format == "html":
+            file.write(PAGE_HEAD.format(
+                title=html.escape(f"{name}, page {page}"),
+                script=VIS_NETWORK_URL,
+                width=self.width,
+                height=self.height,
+                evidence=script_json(evidence)))
+        else:
+            file.write(f'{{"name": {json.dumps(name)}, "page": {page}, "evidence": {json.dumps(evidence)}, '
+                       f'"entries": [\n')
+        return path, file
+
+    def _close_page(self, file: TextIO, name: str, page: int, has_next: bool) -> None:
+        if self.output_format == "html":
+            links = ([f'<a href="{name}_{page - 1:04d}.html">previous</a>'] if page > 1 else []) \
+                + [f'<a href="{name}.html">index</a>'] \
+                + ([f'<a href="{name}_{page + 1:04d}.html">next</a>'] if has_next else [])
+            file.write(PAGE_TAIL + f"<p>{' | '.join(links)}</p>\n</body>\n</html>\n")
+        else:
+            file.write("]}\n")
+        file.close()
+
+    def render(
+            self,
+            outcomes: Samples,
+            directory: str,
+            name: str,
+            evidence: Optional[SampleGraph] = None,
+            show: bool = False
+    ) -> str:
+        """
+        Write pages of entries and index file (list of pages and totals) in to directory
+        :param outcomes: outcomes to render
+        :param directory: output directory, will be created if not exist
+        :param name: name of rendering, used as prefix of files names
+        :param evidence: optional evidence to show on each page (in red)
+        :param show: if True then index will be opened in browser, otherwise only files are written (headless)
+        :return: path of index file
+        """
+        file_name = "".join(c for c in name if c.isalnum() or c == '_')
+        evidence_entry = outcome_entry(evidence, 0) if evidence else None
+        pages: List[Dict[str, Any]] = []
+        number_of_entries, total_count = 0, 0
+        file: Optional[TextIO] = None
+
+        dumps = script_json if self.output_format == "html" else json.dumps
+        os.makedirs(directory, exist_ok=True)
+        try:
+            for entry in self.select(outcomes):
+                if file is None or pages[-1]["number_of_entries"] == self.page_size:
+                    if file is not None:
+                        self._close_page(file, file_name, len(pages), has_next=True)
+                    path, file = self._open_page(directory, file_name, len(pages) + 1, evidence_entry)
+                    pages.append({"file": os.path.basename(path), "number_of_entries": 0, "count": 0})
+                    separator = ""
+                file.write(separator + dumps(entry))
+                separator = ",\n"
+                pages[-1]["number_of_entries"] += 1
+                pages[-1]["count"] += entry["count"]
+                number_of_entries += 1
+                total_count += entry["count"]
+        finally:
+            if file is not None:
+                self._close_page(file, file_name, len(pages), has_next=False)
+
+        index_path = os.path.join(directory, f"{file_name}.{self.output_format}")
+        index = {
+            "name": name,
+            "renderer": str(self),
+            "number_of_entries": number_of_entries,
+            "count": total_count,
+            "pages": pages}
+
+        with open(index_path, "w", encoding="utf-8") as f:
+            if self.output_format == "html":
+                rows = "".join(
+                    f'<li><a href="{p["file"]}">{p["file"]}</a>: {p["number_of_entries"]} entries, '
+                    f'count {p["count"]}</li>\n' for p in pages)
+                f.write(f"<!DOCTYPE html>\n<html>\n<head><meta charset=\"utf-8\"><title>{html.escape(name)}</title>"
+                        f"</head>\n<body>\n<h3>{html.escape(name)}</h3>\n<p>{html.escape(str(self))}: "
+                        f"{number_of_entries} entries, count {total_count}</p>\n<ul>\n{rows}</ul>\n</body>\n</html>\n")
+            else:
+                json.dump(index, f, indent=2)
+
+        if show:
+            webbrowser.open("file://" + os.path.abspath(index_path))
+        return index_path
@@ -0,0 +1,204 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+from typing import Dict, Any, List, Optional, Tuple, Callable, Iterator
+
+import numpy as np
+
+from .graph_components import DirectedRelation
+from .records import View
+from .relation_graph import RelationGraph, RelationGraphBuilder
+from .variable_elimination import CountTable
+
+
+def default_value_name(variable: Any, state: Any) -> str:
+    """
+    Name of value node for state of pgmpy variable, same as in comparing experiments
+    :param variable: pgmpy variable
+    :param state: pgmpy state name (index of state if model has no state names)
+    :return: value name in form "variable(state)"
+    """
+    return f"{variable}({state})"
+
+
+def _factor_records(
+        variables: List[Any],
+        values: Any,
+        names: Dict[Any, List[Any]],
+        scale: float,
+        tolerance: float,
+        make_view: Callable[[List[Tuple[Any, Any]]], View]
+) -> Iterator[Tuple[View, int]]:
+    """
+    Convert factor tensor to records, one record per not zero entry of scaled tensor
+    :param variables: variables of factor, in order of tensor axes
+    :param values: tensor of factor values (probabilities or potentials)
+    :param names: Dict[variable, value names in order of states]
+    :param scale: multiplier which convert values to counts
+    :param tolerance: max absolute difference of scaled value and its rounded count
+    :param make_view: build record view from list of (variable, value) of entry
+    :return: Iterator[(view, count)]
+    """
+    scaled = np.asarray(values, dtype=np.float64) * scale
+    counts = np.rint(scaled).astype(np.int64)
+    error = np.abs(scaled - counts)
+
+    assert counts.shape == tuple(len(names[var]) for var in variables), \
+        f"[_factor_records] Factor values of shape {counts.shape} not match variables {variables}"
+    assert not (error > tolerance).any(), \
+        f"[_factor_records] Scaled values of factor over {variables} should be integer, max rounding error " \
+        f"{error.max()} > {tolerance}, select correct scale"
+    assert not (counts < 0).any(), f"[_factor_records] Factor values over {variables} should not be negative"
+
+    index = np.nonzero(counts)
+    columns = [np.array(names[var], dtype=object)[ix] for var, ix in zip(variables, index)]
+
+    for entry, count in zip(zip(*columns), counts[index].tolist()):
+        yield make_view(list(zip(variables, entry))), count
+
+
+def _model_variables(
+        factors: List[Any],
+        value_name: Callable[[Any, Any], Any]
+) -> Dict[Any, List[Any]]:
+    names: Dict[Any, List[Any]] = {}
+    for factor in factors:
+        for var, card in zip(factor.variables, factor.cardinality):
+            states = factor.state_names.get(var) if factor.state_names else None
+            names.setdefault(var, [value_name(var, s) for s in (states if states else range(int(card)))])
+    return names
+
+
+def from_bayesian_network(
+        model: Any,
+        scale: float = 100,
+        relation: Any = "r",
+        name: Optional[str] = None,
+        value_name: Callable[[Any, Any], Any] = default_value_name,
+        tolerance: float = 1e-6
+) -> RelationGraph:
+    """
+    Build factorized relation graph from pgmpy Bayesian network, each CPD become factor: root variable CPD
+    give single node outcomes, CPD with evidence give star outcomes with directed edges from parents to variable.
+    Outcome count is probability multiplied by scale, zero probabilities are skipped
+    (so in joined graph such combination will be not observed rather than impossible).
+    :param model: pgmpy (Discrete)BayesianNetwork, or any object with get_cpds() returning TabularCPD's
+    :param scale: multiplier which convert probabilities to counts, all scaled probabilities should be integer
+    :param relation: relation of edges, will be wrapped in DirectedRelation(parent, variable, relation)
+    :param name: optional name of relation graph
+    :param value_name: function (variable, state) -> value of variable node
+    :param tolerance: max absolute rounding error of scaled probability
+    :return: new RelationGraph
+    """
+    cpds = list(model.get_cpds())
+    assert cpds, f"[from_bayesian_network] Model should have at least one CPD"
+
+    names = _model_variables(cpds, value_name)
+
+    def make_view(entry: List[Tuple[Any, Any]]) -> View:
+        (var, val), parents = entry[0], entry[1:]
+        if not parents:
+            return var, val
+        return frozenset({
+            (frozenset({(p_var, p_val), (var, val)}), DirectedRelation(p_var, var, relation))
+            for p_var, p_val in parents})
+
+    def records() -> Iterator[Tuple[View, int]]:
+        for cpd in cpds:
+            yield from _factor_records(list(cpd.variables), cpd.values, names, scale, tolerance, make_view)
+
+    return RelationGraphBuilder({var: set(vs) for var, vs in names.items()}, {relation}, name) \
+        .add_outcomes_from_records(records(), validate_connectivity=False) \
+        .build()
+
+
+def from_markov_network(
+        model: Any,
+        scale: float = 1,
+        relation: Any = "r",
+        name: Optional[str] = None,
+        value_name: Callable[[Any, Any], Any] = default_value_name,
+        tolerance: float = 1e-6
+) -> RelationGraph:
+    """
+    Build factorized relation graph from pgmpy Markov network, each factor become factor of relation graph:
+    single variable factor give single node outcomes, factor over several variables give chain outcomes
+    with edges in between neighbour variables (in order of factor variables).
+    Outcome count is potential multiplied by scale, zero potentials are skipped
+    (so in joined graph such combination will be not observed rather than impossible).
+    :param model: pgmpy (Discrete)MarkovNetwork, or any object with get_factors() returning DiscreteFactor's
+    :param scale: multiplier which convert potentials to counts, all scaled potentials should be integer
+    :param relation: relation of edges
+    :param name: optional name of relation graph
+    :param value_name: function (variable, state) -> value of variable node
+    :param tolerance: max absolute rounding error of scaled potential
+    :return: new RelationGraph
+    """
+    factors = list(model.get_factors())
+    assert factors, f"[from_markov_network] Model should have at least one factor"
+
+    names = _model_variables(factors, value_name)
+
+    def make_view(entry: List[Tuple[Any, Any]]) -> View:
+        if len(entry) == 1:
+            return entry[0]
+        return frozenset({(frozenset({a, b}), relation) for a, b in zip(entry, entry[1:])})
+
+    def records() -> Iterator[Tuple[View, int]]:
+        for factor in factors:
+            yield from _factor_records(list(factor.variables), factor.values, names, scale, tolerance, make_view)
+
+    return RelationGraphBuilder({var: set(vs) for var, vs in names.items()}, {relation}, name) \
+        .add_outcomes_from_records(records(), validate_connectivity=False) \
+        .build()
+
+
+def to_discrete_factors(
+        graph: RelationGraph,
+        state_names: Optional[Dict[Any, List[Any]]] = None
+) -> List[Any]:
+    """
+    Convert factors of factorized relation graph to pgmpy DiscreteFactor's, value of each entry is total count
+    of factor outcomes with given variables values (summed over relations), so product of factors is
+    proportional to joined distribution of relation graph. Require pgmpy installed.
+    :param graph: factorized relation graph
+    :param state_names: optional Dict[variable, values in order of states], by default values sorted by str
+    :return: List[DiscreteFactor] ordered by variables
+    """
+    from pgmpy.factors.discrete import DiscreteFactor
+
+    order = {var: list(state_names[var]) if state_names and var in state_names else sorted(values, key=str)
+             for var, values in graph.variables}
+    position = {var: {val: i for i, val in enumerate(values)} for var, values in order.items()}
+    result = []
+
+    for factor in graph.factorized():
+        table = CountTable.from_factor(factor)
+        variables = sorted(table.variables, key=str)
+        axes = [table.variables.index(var) for var in variables]
+        values = np.zeros([len(order[var]) for var in variables], dtype=np.int64)
+        keys = list(table.counts.keys())
+        index = tuple(
+            np.fromiter((position[var][k[a]] for k in keys), dtype=np.int64, count=len(keys))
+            for var, a in zip(variables, axes))
+        values[index] = np.fromiter(table.counts.values(), dtype=np.int64, count=len(keys))
+        result.append(DiscreteFactor(variables, values.shape, values, {var: order[var] for var in variables}))
+
+    return sorted(result, key=lambda f: str(f.variables))
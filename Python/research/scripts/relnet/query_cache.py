@@ -0,0 +1,140 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import sys
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Set
+
+from .graph_components import SampleGraphComponentsProvider, ValueNode, RelationEdge
+from .sample_graph import SampleGraph
+from .sample_set import SampleSetView
+
+
+def estimate_size(value: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    Approximate size in bytes of cached value. Sample graphs are counted with its own containers (nodes, edges,
+    memos, etc.), but without value nodes and relation edges since they are shared with components provider,
+    which is not counted at all. Graphs shared with other entries or with outcomes of graph are counted
+    in each entry, so estimate is upper bound. Sample set views are counted without base list of samples
+    (it is shared by all views of graph outcomes), and query caches referenced by cached value are not counted.
+    :param value: value to estimate size of
+    :param seen: IDs of already counted objects
+    :return: size in bytes
+    """
+    seen = seen if seen is not None else set({})
+    if id(value) in seen or isinstance(value, (SampleGraphComponentsProvider, QueryCache)):
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+
+    if isinstance(value, SampleGraph):
+        attributes = vars(value)
+        return size + sys.getsizeof(attributes) + sum(
+            sys.getsizeof(a) for a in attributes.values() if not isinstance(a, SampleGraphComponentsProvider))
+    if isinstance(value, (ValueNode, RelationEdge, str, int, float, bool)) or value is None:
+        return size
+    if isinstance(value, SampleSetView):
+        return size + estimate_size(value._indices, seen)
+    if isinstance(value, dict):
+        return size + sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(e, seen) for e in value)
+    if hasattr(value, "__dict__"):
+        return size + estimate_size(vars(value), seen)
+    return size
+
+
+class QueryCache:
+    """
+    Mutable bounded cache of query results with LRU eviction, evict least recently used entries
+    when number of entries or estimated size of entries exceeds limits. Size of result is estimated
+    (with traversal of result) only if max_bytes is set, otherwise bytes counter stays 0.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None):
+        assert max_entries > 0, \
+            f"[QueryCache.__init__] Max entries should be > 0, got {max_entries}"
+        assert max_bytes is None or max_bytes > 0, \
+            f"[QueryCache.__init__] Max bytes should be > 0 or None, got {max_bytes}"
+
+        self.max_entries: int = max_entries
+        self.max_bytes: Optional[int] = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.bytes: int = 0
+        self._entries: OrderedDict[Any, (Any, int)] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"QueryCache(entries = {len(self._entries)}, hits = {self.hits}, misses = {self.misses}, " \
+               f"evictions = {self.evictions}, bytes = {self.bytes})"
+
+    def __copy__(self):
+        raise AssertionError("[QueryCache.__copy__] Query cache should not be copied")
+
+    def get_or_compute(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """
+        Get cached value for key, or compute, cache and return it
+        :param key: hashable key of query, should include everything the result depends on
+        :param compute: function to compute value if it not in cache
+        :return: cached or computed value
+        """
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+        self.misses += 1
+        value = compute()
+        size = estimate_size(value) if self.max_bytes is not None else 0
+        self._entries[key] = (value, size)
+        self.bytes += size
+
+        while self._entries and \
+                (len(self._entries) > self.max_entries or (self.max_bytes and self.bytes > self.max_bytes)):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+        return value
+
+    def clear(self) -> None:
+        """
+        Remove all entries, counters of hits, misses and evictions are kept
+        :return: None
+        """
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters
+        :return: Dict[counter_name, value]
+        """
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bytes": self.bytes,
+        }
@@ -0,0 +1,453 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Any, Set, Optional, List, Tuple, Union
+
+from .activation_graph import ActivationGraph
+from .folded_graph import FoldedGraph
+from .records import view_to_json, json_to_view
+from .relation_graph import RelationGraph
+from .sample_graph import SampleGraph
+from .sample_space import SampleSpace
+
+QUERY_TYPES = frozenset({"conditional", "marginals", "folded", "activation"})
+LATENCY_WINDOW = 1024  # Number of last requests to compute latency percentiles on
+MAX_BODY_SIZE = 1024 * 1024  # Default max size of request body in bytes
+
+_worker_graph: Optional[RelationGraph] = None  # Relation graph of process pool worker, set by init_worker
+
+
+def _folded_to_json(graph: FoldedGraph) -> Dict[str, Any]:
+    return {
+        "name": graph.name,
+        "number_of_outcomes": graph.number_of_outcomes,
+        "nodes": [
+            {"variable": n.variable,
+             "values": {str(vn.value): c for vn, c in n.value_nodes},
+             "unobserved": n.unobserved_count()}
+            for n in sorted(graph.nodes, key=lambda n: str(n.variable))],
+        "edges": [
+            {"endpoints": sorted(e.endpoints, key=str),
+             "relations": [
+                 {"endpoints": sorted([[n.variable, n.value] for n in re.endpoints], key=str),
+                  "relation": re.relation,
+                  "count": c}
+                 for re, c in sorted(e.relation_edges, key=str)]}
+            for e in sorted(graph.edges, key=str)]}
+
+
+def _activation_to_json(graph: ActivationGraph) -> Dict[str, Any]:
+    return {
+        "name": graph.name,
+        "number_of_outcomes": graph.number_of_outcomes,
+        "nodes": [
+            {"variable": n.variable, "values": {str(v): w for v, w in n.values}, "in_query": n.in_query}
+            for n in sorted(graph.nodes, key=lambda n: str(n.variable))],
+        "edges": [
+            {"endpoints": sorted(e.endpoints, key=str), "relations": {str(r): c for r, c in e.relations},
+             "in_query": e.in_query}
+            for e in sorted(graph.edges, key=str)]}
+
+
+def _answer(space: SampleSpace, evidence: Optional[SampleGraph], request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Answer single query over relation graph or over its conditional graph
+    :param space: relation graph, or its conditional graph if request have evidence
+    :param evidence: decoded evidence of request
+    :param request: query request
+    :return: JSON compatible result
+    """
+    query = request["query"]
+    variables: Optional[Set[Any]] = set(request["variables"]) if request.get("variables") is not None else None
+
+    if query == "conditional":
+        limit = request.get("limit")
+        outcomes = sorted(space.outcomes.items(), key=lambda oc: -oc[1])
+        return {
+            "name": space.name,
+            "number_of_outcomes": space.outcomes.length,
+            "number_of_samples": len(outcomes),
+            "outcomes": [[view_to_json(o.edges_set_view()), c] for o, c in outcomes[:limit]]}
+    elif query == "marginals":
+        return {str(var): {str(val): p for val, p in values.items()}
+                for var, values in space.marginal_variables_probability(variables).items()}
+    elif query == "folded":
+        return _folded_to_json(space.folded_graph())
+    else:
+        assert evidence is not None, f"[_answer] Activation query require evidence"
+        relation_filter = set(request["relation_filter"]) if request.get("relation_filter") is not None else None
+        return _activation_to_json(space.activation_graph(relation_filter))
+
+
+def _execute_batch(graph: Optional[RelationGraph], requests: List[Dict[str, Any]]) -> List[Tuple[bool, Any]]:
+    """
+    Execute batch of requests in single pass: identical requests are answered once and requests are
+    grouped by evidence, so each evidence is decoded and conditioned on once per batch,
+    and all requests of group are answered over same conditional graph
+    :param graph: relation graph to query, if None then graph of process pool worker is used
+    :param requests: list of query requests
+    :return: List[(is_success, result_or_error_message)] in same order as requests
+    """
+    graph = graph if graph is not None else _worker_graph
+    assert graph is not None, f"[_execute_batch] Relation graph is not set, seems a bug"
+
+    results: Dict[str, Tuple[bool, Any]] = {}
+    by_evidence: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+
+    for request in requests:
+        key = json.dumps(request, sort_keys=True, default=str)
+        by_evidence.setdefault(json.dumps(request.get("evidence"), default=str), []).append((key, request))
+
+    for group in by_evidence.values():
+        try:
+            view = json_to_view(group[0][1].get("evidence"))
+            evidence = graph.sample_builder().build_from_view(view) if view is not None else None
+            space = graph.conditional_graph(evidence, view=True) if evidence is not None else graph
+        except (AssertionError, KeyError, TypeError, ValueError) as e:
+            results.update({key: (False, f"Invalid evidence: {e}") for key, _ in group})
+            continue
+        for key, request in group:
+            if key not in results:
+                try:
+                    results[key] = (True, _answer(space, evidence, request))
+                except (AssertionError, KeyError, TypeError, ValueError) as e:
+                    results[key] = (False, str(e))
+
+    return [results[json.dumps(request, sort_keys=True, default=str)] for request in requests]
+
+
+class ServerMetrics:
+    """
+    Mutable latency and throughput metrics of query server
+    """
+
+    def __init__(self):
+        self.started_at: float = time.monotonic()
+        self.requests: int = 0
+        self.errors: int = 0
+        self.batches: int = 0
+        self.batched_requests: int = 0
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+
+    def __repr__(self):
+        return f"ServerMetrics(requests = {self.requests}, errors = {self.errors}, batches = {self.batches})"
+
+    def record_request(self, latency: float, is_error: bool) -> None:
+        """
+        Record one answered request
+        :param latency: time in seconds from request received to answered
+        :param is_error: True if request failed
+        :return: None
+        """
+        self.requests += 1
+        self.errors += int(is_error)
+        self._latencies.append(latency)
+
+    def record_batch(self, size: int) -> None:
+        """
+        Record one executed batch
+        :param size: number of requests in batch
+        :return: None
+        """
+        self.batches += 1
+        self.batched_requests += size
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Build current metrics
+        :return: Dict[metric_name, value], latencies are in seconds over last LATENCY_WINDOW requests
+        """
+        uptime = time.monotonic() - self.started_at
+        latencies = sorted(self._latencies)
+
+        def percentile(q: float) -> Optional[float]:
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else None
+
+        return {
+            "uptime": uptime,
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": self.batches,
+            "mean_batch_size": self.batched_requests / self.batches if self.batches else None,
+            "throughput": self.requests / uptime if uptime > 0 else None,
+            "latency_mean": sum(latencies) / len(latencies) if latencies else None,
+            "latency_p50": percentile(0.5),
+            "latency_p95": percentile(0.95),
+            "latency_p99": percentile(0.99),
+        }
+
+
+class QueryServer:
+    """
+    Long living asyncio server which answer queries over loaded relation graph by HTTP/1.1 with JSON bodies,
+    on localhost TCP port or Unix socket. Concurrent requests received within batch window are micro-batched
+    and executed in executor in single pass. Endpoints:
+      POST /query   - body {"query": "conditional" | "marginals" | "folded" | "activation",
+                            "evidence": edges set view (see view_to_json) or null, ...}
+      GET /describe - properties of relation graph
+      GET /metrics  - latency and throughput metrics
+    """
+
+    def __init__(
+            self,
+            graph: RelationGraph,
+            host: str = "127.0.0.1",
+            port: int = 0,
+            unix_path: Optional[str] = None,
+            executor: Optional[Executor] = None,
+            batch_window: float = 0.002,
+            max_batch_size: int = 64,
+            max_body_size: int = MAX_BODY_SIZE
+    ):
+        """
+        :param graph: relation graph to query
+        :param host: host to listen on, if unix_path not set
+        :param port: port to listen on, 0 to pick free one
+        :param unix_path: if set, then server will listen on Unix socket with this path
+        :param executor: thread or process pool to run batches in, process pool should be created with
+                         initializer=init_worker, initargs=(graph,). If None then single thread pool is used.
+        :param batch_window: time in seconds to wait for more requests after first one of batch
+        :param max_batch_size: max number of requests in batch
+        :param max_body_size: max size of request body in bytes, larger requests are rejected with 413
+        """
+        assert max_batch_size > 0, f"[QueryServer.__init__] Max batch size should be > 0, got {max_batch_size}"
+        assert max_body_size >= 0, f"[QueryServer.__init__] Max body size should be >= 0, got {max_body_size}"
+
+        self.graph: RelationGraph = graph
+        self.metrics: ServerMetrics = ServerMetrics()
+        self._host: str = host
+        self._port: int = port
+        self._unix_path: Optional[str] = unix_path
+        self._own_executor: bool = executor is None
+        self._executor: Executor = executor if executor is not None else ThreadPoolExecutor(max_workers=1)
+        self._batch_window: float = batch_window
+        self._max_batch_size: int = max_batch_size
+        self._max_body_size: int = max_body_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._in_flight: Set[asyncio.Task] = set({})
+
+    def __repr__(self):
+        return f"QueryServer(graph = {self.graph.name}, address = {self.address})"
+
+    def __copy__(self):
+        raise AssertionError("[QueryServer.__copy__] Query server should not be copied")
+
+    @property
+    def address(self) -> Union[str, Tuple[str, int], None]:
+        """
+        Address server listen on
+        :return: Unix socket path or (host, port) or None if not started
+        """
+        if self._server is None:
+            return None
+        return self._unix_path if self._unix_path else self._server.sockets[0].getsockname()[:2]
+
+    async def start(self) -> 'QueryServer':
+        """
+        Start listening and batching
+        :return: self
+        """
+        assert self._server is None, f"[QueryServer.start] Server is already started"
+
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_loop())
+        self._server = await asyncio.start_unix_server(self._handle_connection, self._unix_path) \
+            if self._unix_path else await asyncio.start_server(self._handle_connection, self._host, self._port)
+        return self
+
+    async def stop(self) -> None:
+        """
+        Stop listening, wait for in flight batches and shutdown own executor
+        :return: None
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            await asyncio.gather(self._batcher, return_exceptions=True)
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        if self._own_executor:
+            self._executor.shutdown()
+        self._server, self._batcher = None, None
+
+    async def serve_forever(self) -> None:
+        """
+        Start (if not started) and serve until cancelled
+        :return: None
+        """
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def query(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Submit query to batching, same as POST /query but without HTTP
+        :param request: query request
+        :return: JSON compatible result
+        :raise AssertionError: if request is invalid or query failed
+        """
+        assert self._queue is not None, f"[QueryServer.query] Server is not started"
+        assert isinstance(request, dict) and request.get("query") in QUERY_TYPES, \
+            f"[QueryServer.query] Expect request with query one of {sorted(QUERY_TYPES)}, got {request}"
+
+        received_at = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, future))
+        try:
+            is_success, result = await future
+        except Exception:
+            self.metrics.record_request(time.monotonic() - received_at, True)
+            raise
+
+        self.metrics.record_request(time.monotonic() - received_at, not is_success)
+        assert is_success, f"[QueryServer.query] {result}"
+        return result
+
+    async def _batch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._batch_window
+            while len(batch) < self._max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            task = asyncio.create_task(self._run_batch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        graph = None if isinstance(self._executor, ProcessPoolExecutor) else self.graph
+        self.metrics.record_batch(len(batch))
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._executor, partial(_execute_batch, graph, [r for r, _ in batch]))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: str, response: Any, keep_alive: bool) -> None:
+        payload = json.dumps(response, default=str).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + payload)
+        await writer.drain()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers: Dict[str, str] = {}
+                while True:
+                    line = (await reader.readline()).decode("latin-1").strip()
+                    if not line:
+                        break
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                    content_length = int(headers.get("content-length", "0"))
+                    assert content_length >= 0, f"Content-Length should be >= 0, got {content_length}"
+                except (AssertionError, ValueError) as e:  # Connection state is unknown after malformed request
+                    await self._respond(writer, "400 Bad Request", {"error": f"Malformed request: {e}"}, False)
+                    break
+                if content_length > self._max_body_size:  # Body is not read, so connection is closed
+                    await self._respond(writer, "413 Payload Too Large", {
+                        "error": f"Request body of {content_length} bytes exceeds limit of {self._max_body_size}"},
+                        False)
+                    break
+                body = await reader.readexactly(content_length)
+                status, response = await self._route(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[str, Any]:
+        if method == "GET" and path == "/metrics":
+            return "200 OK", self.metrics.snapshot()
+        elif method == "GET" and path == "/describe":
+            return "200 OK", {k: sorted(v) if isinstance(v, set) else v for k, v in self.graph.describe().items()}
+        elif method == "POST" and path == "/query":
+            try:
+                return "200 OK", await self.query(json.loads(body))
+            except (AssertionError, ValueError) as e:
+                return "400 Bad Request", {"error": str(e)}
+        else:
+            return "404 Not Found", {"error": f"Unknown endpoint {method} {path}"}
+
+
+def init_worker(graph: RelationGraph) -> None:
+    """
+    Initializer of process pool workers, to pass relation graph to them once
+    :param graph: relation graph to query
+    :return: None
+    """
+    global _worker_graph
+    _worker_graph = graph
+
+
+def serve(graph: RelationGraph, processes: Optional[int] = None, **kwargs) -> None:
+    """
+    Run query server until interrupted
+    :param graph: relation graph to query
+    :param processes: if > 1 then batches are executed in process pool of given size, otherwise in thread
+    :param kwargs: other parameters of QueryServer
+    :return: None
+    """
+    executor = ProcessPoolExecutor(max_workers=processes, initializer=init_worker, initargs=(graph,)) \
+        if processes and processes > 1 else None
+
+    try:
+        asyncio.run(QueryServer(graph, executor=executor, **kwargs).serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if executor:
+            executor.shutdown()
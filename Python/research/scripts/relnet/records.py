@@ -0,0 +1,249 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import csv
+import json
+import time
+from typing import Dict, Any, Iterator, Iterable, Tuple, Union, Optional
+
+from .graph_components import SampleGraphComponentsProvider, ValueNode, RelationEdge, DirectedRelation
+from .sample_graph import SampleGraph, SampleGraphBuilder
+
+View = Union[frozenset, Tuple[Any, Any]]  # Edges set view or single node, as in SampleGraph.edges_set_view
+CSV_COLUMNS = ("record", "variable_a", "value_a", "variable_b", "value_b", "relation", "count")
+
+
+def component_to_json(component: Any) -> Any:
+    """
+    Encode variable, value or relation to JSON compatible value, explicitly so it can be decoded
+    without executing of any code and in any language
+    :param component: str, int, float, bool, None, tuple of them or DirectedRelation
+    :return: same value for str, int, float, bool and None, {"tuple": [...]} for tuple and
+             {"directed": [source_variable, target_variable, relation]} for DirectedRelation
+    """
+    if component is None or isinstance(component, (str, bool, int, float)):
+        return component
+    elif isinstance(component, DirectedRelation):
+        return {"directed": [component_to_json(c) for c in (
+            component.source_variable, component.target_variable, component.relation)]}
+    elif isinstance(component, tuple):
+        return {"tuple": [component_to_json(c) for c in component]}
+    raise AssertionError(
+        f"[component_to_json] Expect str, int, float, bool, None, tuple or DirectedRelation, got {component!r}")
+
+
+def json_to_component(value: Any) -> Any:
+    """
+    Decode variable, value or relation from JSON compatible value, reverse of component_to_json
+    :param value: JSON compatible value
+    :return: variable, value or relation
+    """
+    if isinstance(value, dict):
+        assert len(value) == 1 and ("tuple" in value or "directed" in value), \
+            f"[json_to_component] Expect {{\"tuple\": [...]}} or {{\"directed\": [...]}}, got {value}"
+        if "directed" in value:
+            assert len(value["directed"]) == 3, \
+                f"[json_to_component] Expect directed relation in form [source, target, relation], got {value}"
+            return DirectedRelation(*(json_to_component(c) for c in value["directed"]))
+        return tuple(json_to_component(c) for c in value["tuple"])
+
+    assert not isinstance(value, list), f"[json_to_component] Expect scalar or object, got {value}"
+    return value
+
+
+def view_to_json(view: Union[frozenset, Tuple[Any, Any], None]) -> Any:
+    """
+    Encode edges set view (as returned by SampleGraph.edges_set_view) to JSON compatible value,
+    variables, values and relations are encoded with component_to_json
+    :param view: frozenset[(frozenset[(variable, value)], relation)] or (variable, value) or None
+    :return: list of [[[variable, value], [variable, value]], relation] or [variable, value] or None
+    """
+    if view is None:
+        return None
+    elif isinstance(view, frozenset):
+        return sorted(
+            ([sorted(([component_to_json(var), component_to_json(val)] for var, val in endpoints), key=str),
+              component_to_json(relation)] for endpoints, relation in view), key=str)
+    else:
+        variable, value = view
+        return [component_to_json(variable), component_to_json(value)]
+
+
+def json_to_view(value: Any) -> Union[frozenset, Tuple[Any, Any], None]:
+    """
+    Decode edges set view from JSON compatible value, reverse of view_to_json
+    :param value: list of [[[variable, value], [variable, value]], relation] or [variable, value] or None
+    :return: frozenset[(frozenset[(variable, value)], relation)] or (variable, value) or None
+    """
+    if value is None:
+        return None
+
+    assert isinstance(value, list) and value, \
+        f"[json_to_view] Expect evidence be null, [variable, value] or not empty list of edges, got {value}"
+
+    if not isinstance(value[0], list):
+        assert len(value) == 2, f"[json_to_view] Expect single node in form [variable, value], got {value}"
+        return json_to_component(value[0]), json_to_component(value[1])
+
+    for edge in value:
+        assert isinstance(edge, list) and len(edge) == 2 and isinstance(edge[0], list) and len(edge[0]) == 2, \
+            f"[json_to_view] Expect edge in form [[[variable, value], [variable, value]], relation], got {edge}"
+    return frozenset({
+        (frozenset({(json_to_component(var), json_to_component(val)) for var, val in endpoints}),
+         json_to_component(relation))
+        for endpoints, relation in value})
+
+
+def read_jsonl(path: str) -> Iterator[Tuple[View, int]]:
+    """
+    Stream records from JSON lines file, one record per line: {"outcome": view, "count": count},
+    where view is in form of view_to_json and count is optional (1 by default). Empty lines are skipped.
+    :param path: path of file to read
+    :return: Iterator[(edges_set_view, count)]
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if line.strip():
+                record = json.loads(line)
+                assert isinstance(record, dict) and "outcome" in record, \
+                    f"[read_jsonl] Expect record in form {{\"outcome\": view, \"count\": count}} " \
+                    f"at line {line_number}, got {line}"
+                yield json_to_view(record["outcome"]), int(record.get("count", 1))
+
+
+def read_csv(path: str) -> Iterator[Tuple[View, int]]:
+    """
+    Stream records from CSV file with header CSV_COLUMNS, one row per edge of record, rows of same record
+    should go one after another. Row of single node record have empty variable_b, value_b and relation.
+    Count is taken from first row of record (1 if empty). All variables, values and relations are strings.
+    :param path: path of file to read
+    :return: Iterator[(edges_set_view, count)]
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        assert reader.fieldnames and set(CSV_COLUMNS).issubset(reader.fieldnames), \
+            f"[read_csv] Expect CSV header with columns {CSV_COLUMNS}, got {reader.fieldnames}"
+
+        record_id: Optional[str] = None
+        edges: set = set({})
+        count = 1
+
+        for row in reader:
+            if row["record"] != record_id:
+                if edges:
+                    yield frozenset(edges), count
+                record_id, edges, count = row["record"], set({}), int(row["count"] or 1)
+            if row["relation"]:
+                edges.add((frozenset({(row["variable_a"], row["value_a"]), (row["variable_b"], row["value_b"])}),
+                           row["relation"]))
+            else:
+                assert not edges, f"[read_csv] Single node row can't be part of record with edges, got {row}"
+                yield (row["variable_a"], row["value_a"]), count
+                record_id = None
+
+        if edges:
+            yield frozenset(edges), count
+
+
+class IngestionStats:
+    """
+    Mutable statistics of records ingestion
+    """
+
+    def __init__(self):
+        self.records: int = 0
+        self.unique_records: int = 0
+        self.batches: int = 0
+        self.started_at: float = time.monotonic()
+        self.elapsed: float = 0.0
+
+    def __repr__(self):
+        return f"IngestionStats(records = {self.records}, unique_records = {self.unique_records}, " \
+               f"batches = {self.batches}, records_per_second = {self.records_per_second():.1f})"
+
+    def records_per_second(self) -> float:
+        """
+        Get ingestion throughput
+        :return: number of records ingested per second
+        """
+        return self.records / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class RecordsDecoder:
+    """
+    Mutable decoder of records in to sample graphs (same as SampleGraphBuilder.build_from_view), nodes and edges
+    are looked up in components provider once and then reused from own tables
+    """
+
+    def __init__(self, components_provider: SampleGraphComponentsProvider, validate_connectivity: bool = True):
+        self._components_provider: SampleGraphComponentsProvider = components_provider
+        self._validate_connectivity: bool = validate_connectivity
+        self._nodes: Dict[Tuple[Any, Any], ValueNode] = {}
+        self._edges: Dict[Tuple[frozenset[Tuple[Any, Any]], Any], RelationEdge] = {}
+
+    def __repr__(self):
+        return f"RecordsDecoder(number_of_nodes = {len(self._nodes)}, number_of_edges = {len(self._edges)})"
+
+    def _node(self, variable: Any, value: Any) -> ValueNode:
+        node = self._nodes.get((variable, value))
+        if node is None:
+            node = self._components_provider.get_node(variable, value)
+            self._nodes[(variable, value)] = node
+        return node
+
+    def _edge(self, endpoints: frozenset[Tuple[Any, Any]], relation: Any) -> RelationEdge:
+        edge = self._edges.get((endpoints, relation))
+        if edge is None:
+            SampleGraphBuilder.validate_endpoints(endpoints)
+            edge = self._components_provider.get_edge(
+                frozenset({self._node(var, val) for var, val in endpoints}), relation)
+            self._edges[(endpoints, relation)] = edge
+        return edge
+
+    def decode(self, view: View) -> SampleGraph:
+        """
+        Build sample graph from record
+        :param view: edges set view or single node (variable, value)
+        :return: sample graph
+        """
+        if not isinstance(view, frozenset):
+            variable, value = view
+            return SampleGraph(self._components_provider, frozenset({self._node(variable, value)}), frozenset({}), None)
+
+        assert view, f"[RecordsDecoder.decode] Record should have at least one edge or be single node"
+        if self._validate_connectivity:
+            assert SampleGraphBuilder.is_edges_connected(view), \
+                f"[RecordsDecoder.decode] Edges of record are not form connected graph, edges: {view}"
+
+        edges = frozenset({self._edge(endpoints, relation) for endpoints, relation in view})
+        return SampleGraph(
+            self._components_provider, frozenset({n for e in edges for n in e.endpoints}), edges, None)
+
+
+def deduplicate(records: Iterable[Tuple[View, int]]) -> Dict[View, int]:
+    """
+    Sum counts of same records
+    :param records: Iterable[(edges_set_view, count)]
+    :return: Dict[edges_set_view, count]
+    """
+    acc: Dict[View, int] = {}
+    for view, count in records:
+        acc[view] = acc.get(view, 0) + count
+    return acc
@@ -18,14 +18,74 @@ website: github.com/alexcab
 created: 2021-08-09
 """
 
-from typing import List, Dict, Set, Any, Tuple, Optional, Callable
+import heapq
+import time
+from itertools import islice
+from typing import List, Dict, Set, Any, Tuple, Optional, Callable, Iterable
 from math import prod
 
+from .approximate_inference import ApproximateInference, MarginalEstimate
 from .graph_components import SampleGraphComponentsProvider, BuilderComponentsProvider
 from .conditional_graph import ConditionalGraph
+from .delta_log import recover, replay
+from .flat_sample_set import FlatSampleSet
+from .incremental_joined_graph import IncrementalJoinedGraph
+from .joint_view import JointView
+from .query_cache import QueryCache
+from .records import View, IngestionStats, RecordsDecoder, deduplicate
 from .sample_graph import SampleGraph, SampleGraphBuilder
 from .sample_space import SampleSpace
-from .sample_set import SampleSet, SampleSetBuilder
+from .sample_set import SampleSet, SampleSetBuilder, SampleSetView
+from .spilled_sample_set import SpilledSampleSetBuilder
+from .variable_elimination import CountTable, MaxTable, marginal_counts, max_product
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from .shared_sample_set import SharedSampleSet
+    from .similarity_index import SimilarityIndex
+
+
+def _join_factors(
+        components_provider: SampleGraphComponentsProvider,
+        outcomes: List[Dict[SampleGraph, int]],
+        acc: SampleSetBuilder
+) -> SampleSet:
+    """
+    Join each combination of outcomes of given factors where values of all outcomes match
+    :param components_provider: components provider of outcomes
+    :param outcomes: List[factor_outcomes]
+    :param acc: outcomes of current combination
+    :return: sample set of joined outcomes
+    """
+    if outcomes:
+        return SampleSetBuilder.join_sample_set(
+            [_join_factors(components_provider, outcomes[1:], acc.copy().add(o, c)) for o, c in outcomes[0].items()])
+    else:
+        ss = acc.build()
+        if ss.can_join_samples():
+            bo, cs = ss.make_joined_sample()
+            return SampleSetBuilder(components_provider, {bo: prod(cs)}).build()
+        else:
+            return SampleSetBuilder(components_provider).empty()
+
+
+def _join_factors_views(
+        variables: Dict[Any, Set[Any]],
+        relations: Set[Any],
+        outcomes: List[List[Tuple[Any, int]]]
+) -> List[Tuple[Any, int]]:
+    """
+    Same as _join_factors but takes and returns outcomes in form of edges set views,
+    to be run in worker process
+    :param variables: Dict[variable, Set[value]]
+    :param relations: Set[relation]
+    :param outcomes: List[List[(outcome_edges_set_view, count)]]
+    :return: List[(joined_outcome_edges_set_view, count)]
+    """
+    bcp = BuilderComponentsProvider(variables, relations)
+    factors = [{SampleGraphBuilder(bcp).build_from_view(v, False): c for v, c in f} for f in outcomes]
+    return [(o.edges_set_view(), c) for o, c in _join_factors(bcp, factors, SampleSetBuilder(bcp)).items()]
 
 
 class RelationGraphBuilder:
@@ -49,6 +109,7 @@ class RelationGraphBuilder:
         self._name: Optional[str] = name
         self._outcomes: SampleSetBuilder = outcomes if outcomes else SampleSetBuilder(self._components_provider)
         self._id_counter = 0
+        self.ingestion_stats: Optional[IngestionStats] = None  # Statistics of last add_outcomes_from_records
         self.variables: frozenset[Tuple[Any, frozenset[Any]]] = self._components_provider.variables()
         self.relations: frozenset[Any] = self._components_provider.relations()
 
@@ -99,6 +160,49 @@ class RelationGraphBuilder:
             self.add_outcome(outcome, count)
         return self
 
+    def add_outcomes_from_records(
+            self,
+            records: Iterable[Tuple[View, int]],
+            batch_size: int = 100000,
+            progress: Optional[Callable[[IngestionStats], None]] = None,
+            validate_connectivity: bool = True
+    ) -> 'RelationGraphBuilder':
+        """
+        Bulk add outcomes from records, e.g. streamed by records.read_jsonl or records.read_csv.
+        Records are read by batches, same records within batch are merged (counts summed) before
+        building of sample graphs, nodes and edges are looked up in components provider once per ingestion.
+        :param records: Iterable[(edges_set_view, count)], view is edges set or single node (variable, value)
+        :param batch_size: number of records in batch, should be > 0
+        :param progress: optional callback, called after each batch with ingestion statistics
+        :param validate_connectivity: if False then connectivity of records edges will not be checked
+        :return: self
+        """
+        assert batch_size > 0, \
+            f"[RelationGraphBuilder.add_outcomes_from_records] Expect batch size be > 0, got {batch_size}"
+
+        decoder = RecordsDecoder(self._components_provider, validate_connectivity)
+        stats = IngestionStats()
+        iterator = iter(records)
+
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                break
+            for view, count in deduplicate(batch).items():
+                assert count >= 1, \
+                    f"[RelationGraphBuilder.add_outcomes_from_records] Expect count be >= 1, " \
+                    f"but got {count} for record {view}"
+                self._outcomes.add(decoder.decode(view), count)
+                stats.unique_records += 1
+            stats.records += len(batch)
+            stats.batches += 1
+            stats.elapsed = time.monotonic() - stats.started_at
+            if progress:
+                progress(stats)
+
+        self.ingestion_stats = stats
+        return self
+
     def sample_builder(self) -> SampleGraphBuilder:
         """
         Create new SampleGraphBuilder
@@ -195,12 +299,19 @@ class RelationGraph(SampleSpace):
             self,
             components_provider: SampleGraphComponentsProvider,
             name: Optional[str],
-            outcomes: SampleSet
+            outcomes: SampleSet,
+            query_cache: Optional[QueryCache] = None
     ):
         self.name: str = name if name else f"relation_graph_with_{outcomes.length}_outcomes"
-        super().__init__(components_provider, outcomes, self.name, evidence=None)
+        super().__init__(components_provider, outcomes, self.name, evidence=None, query_cache=query_cache)
         self.variables: frozenset[Tuple[Any, frozenset[Any]]] = components_provider.variables()
         self.relations: frozenset[Any] = components_provider.relations()
+        self._factors: Optional[frozenset[SampleSet]] = None
+        self._is_factorized: Optional[bool] = None
+        self._similarity_indices: Dict[Tuple[int, int, int], 'SimilarityIndex'] = {}
+        self._approximate_inference: Optional[ApproximateInference] = None
+        self._outcomes_heap: Optional[List[Tuple[int, int, SampleGraph]]] = None
+        self._outcomes_view: Optional[SampleSetView] = None
 
     def describe(self) -> Dict[str, Any]:
         """
@@ -216,27 +327,35 @@ class RelationGraph(SampleSpace):
             "relations": {str(r) for r in self.relations},
         }
 
-    def conditional_graph(self, evidence: SampleGraph, name: Optional[str] = None) -> ConditionalGraph:
+    def conditional_graph(
+            self, evidence: SampleGraph, name: Optional[str] = None, view: bool = False
+    ) -> ConditionalGraph:
         """
         Do conditioning for given query. Will filter out outcomes that is sub-graphs of query graph
         and pack in InferenceGraph instance.
         :param evidence: and SampleGraph to filter on
         :param name: optional name for the inference graph
+        :param view: if True then selected outcomes will be stored as SampleSetView, without copying of samples
         :return: new instance of ConditionalGraph
         """
         assert evidence.is_compatible(self._components_provider), \
             f"[RelationGraphBuilder.add_outcome] Evidence {evidence} is not compatible with this relation graph, " \
             f"since it vas created with using another SampleGraphComponentsProvider"
 
-        selected_outcomes: Dict[SampleGraph, int] = {
-            outcome: count for outcome, count in self.outcomes.items()
-            if evidence.is_subgraph(outcome) or evidence.included_variables.isdisjoint(outcome.included_variables)}
-
-        return ConditionalGraph(
-            self._components_provider,
-            evidence,
-            name if name else f"conditional_of_{self.name}",
-            SampleSet(self._components_provider, selected_outcomes))
+        def condition() -> ConditionalGraph:
+            outcomes = self.outcomes
+            if view and not isinstance(outcomes, SampleSetView):
+                if self._outcomes_view is None:  # Base list of outcomes is built once per graph
+                    self._outcomes_view = SampleSetView.of(outcomes)
+                outcomes = self._outcomes_view
+            return ConditionalGraph(
+                self._components_provider,
+                evidence,
+                name if name else f"conditional_of_{self.name}",
+                outcomes.filter_samples(self._evidence_predicate(evidence)),
+                self.query_cache)
+
+        return self._cached(("conditional_graph", evidence, name, view), condition)
 
     def joined_on_variables(self, variables: Optional[Set[Any]] = None, name: Optional[str] = None) -> 'RelationGraph':
         """
@@ -284,53 +403,62 @@ class RelationGraph(SampleSpace):
                 return False
         return True
 
+    def factorized(self) -> frozenset[SampleSet]:
+        """
+        Will split outcomes of this relation graph by factors, or raise error if it is not factorized.
+        Since relation graph is immutable factors are calculated once.
+        :return: set of SampleSet
+        """
+        if self._factors is None:
+            self._factors = super().factorized()
+            self._is_factorized = True
+        return self._factors
+
     def is_factorized(self) -> bool:
         """
         Do check if this relation graph is factorized, i.e. contains joined sub-graphs
         :return: True if this relation graph is factorized, False otherwise
         """
-        endpoint_acc: Set[frozenset[frozenset[Any]]] = set({})
-        for o in self.outcomes.samples():
-            if o.is_k_0:
-                return False
-            ep = o.edges_endpoint_variables()
-            if ep not in endpoint_acc:
-                for aep in endpoint_acc:
-                    if not aep.isdisjoint(ep):
-                        return False
-                endpoint_acc.add(ep)
-        return True
-
-    def make_joined(self, name: Optional[str] = None) -> 'RelationGraph':
+        if self._is_factorized is None:
+            factors = self._factors_index()
+            self._is_factorized = factors is not None
+            if factors is not None:
+                self._factors = frozenset({b.build() for b in factors.values()})
+        return self._is_factorized
+
+    def make_joined(self, name: Optional[str] = None, processes: Optional[int] = None) -> 'RelationGraph':
         """
         Make relation graph which contains joined distribution from this factorized relation graph
+        :param name: optional name for the joined graph
+        :param processes: if > 1 then partitions of factors product will be joined in pool of given number
+                          of processes, otherwise all will be joined in current process
         :return: New instance of relation graph which contains joined distribution
         """
-
-        def join_factors(outcomes: List[Dict[SampleGraph, int]], acc: SampleSetBuilder) -> SampleSet:
-            if outcomes:
-                return SampleSetBuilder.join_sample_set(
-                    [join_factors(outcomes[1:], acc.copy().add(o, c)) for o, c in outcomes[0].items()])
-            else:
-                ss = acc.build()
-                if ss.can_join_samples():
-                    bo, cs = acc.build().make_joined_sample()
-                    return SampleSetBuilder(self._components_provider, {bo: prod(cs)}).build()
-                else:
-                    return SampleSetBuilder(self._components_provider).empty()
+        from concurrent.futures import ProcessPoolExecutor
 
         factors: frozenset[SampleSet] = self.factorized()
-
-        for var, values in self.included_variables():
-            factors_for_var = [f for f in factors if f.have_variable(var)]
-            joined_factor = SampleSetBuilder(self._components_provider)
-            for val in values:
-                outcomes_for_val = [{o: c for o, c in f.items() if o.have_value(var, val)} for f in factors_for_var]
-                joined_factor.add_all(join_factors(
-                    [os for os in outcomes_for_val if os],
-                    SampleSetBuilder(self._components_provider)))
-            factors = factors.difference(factors_for_var)
-            factors = factors.union(frozenset({joined_factor.build()}))
+        pool = ProcessPoolExecutor(max_workers=processes) if processes and processes > 1 else None
+
+        try:
+            for var, values in self.included_variables():
+                factors_for_var = [f for f in factors if f.have_variable(var)]
+                joined_factor = SampleSetBuilder(self._components_provider)
+                partitions: List[List[Dict[SampleGraph, int]]] = []
+                for val in values:
+                    outcomes_for_val = [
+                        {o: c for o, c in f.items() if o.have_value(var, val)} for f in factors_for_var]
+                    partitions.extend(self._partition_factors([os for os in outcomes_for_val if os], processes))
+                if pool:
+                    joined_factor.add_all(self._join_in_pool(pool, partitions))
+                else:
+                    for partition in partitions:
+                        joined_factor.add_all(_join_factors(
+                            self._components_provider, partition, SampleSetBuilder(self._components_provider)))
+                factors = factors.difference(factors_for_var)
+                factors = factors.union(frozenset({joined_factor.build()}))
+        finally:
+            if pool:
+                pool.shutdown()
 
         assert len(factors) <= 1, \
             f"[RelationGraph.make_joined] Expect number of factors after joining to be 1 or 0, got {len(factors)}"
@@ -339,3 +467,321 @@ class RelationGraph(SampleSpace):
             self._components_provider,
             name if name else self.name,
             list(factors)[0] if factors else SampleSetBuilder(self._components_provider).empty())
+
+    @staticmethod
+    def _partition_factors(
+            outcomes: List[Dict[SampleGraph, int]],
+            processes: Optional[int]
+    ) -> List[List[Dict[SampleGraph, int]]]:
+        """
+        Split product of factors outcomes on independent partitions by splitting outcomes of first factor
+        :param outcomes: outcomes of factors to be joined
+        :param processes: number of processes which will join partitions, if None then no split will done
+        :return: List[factors_outcomes_of_partition]
+        """
+        if not processes or processes <= 1 or not outcomes or len(outcomes[0]) <= 1:
+            return [outcomes]
+
+        head = list(outcomes[0].items())
+        size = -(-len(head) // min(len(head), processes * 4))  # Few partitions per process to balance load
+        return [[dict(head[i:i + size])] + outcomes[1:] for i in range(0, len(head), size)]
+
+    def _join_in_pool(
+            self,
+            pool: 'ProcessPoolExecutor',
+            partitions: List[List[Dict[SampleGraph, int]]]
+    ) -> SampleSet:
+        """
+        Join partitions in process pool, samples passed in form of edges set views since worker
+        processes have own components provider
+        :param pool: process pool to run join in
+        :param partitions: List[factors_outcomes_of_partition]
+        :return: joined sample set of all partitions
+        """
+        variables = {var: set(values) for var, values in self._components_provider.variables()}
+        relations = set(self._components_provider.relations())
+        futures = [
+            pool.submit(
+                _join_factors_views,
+                variables,
+                relations,
+                [[(o.edges_set_view(), c) for o, c in f.items()] for f in partition])
+            for partition in partitions]
+
+        ssb = SampleSetBuilder(self._components_provider)
+        for future in futures:
+            for view, count in future.result():
+                ssb.add(SampleGraphBuilder(self._components_provider).build_from_view(view, False), count)
+        return ssb.build()
+
+    def make_joined_spilled(
+            self,
+            directory: str,
+            memory_budget: int = 64 * 1024 * 1024,
+            name: Optional[str] = None
+    ) -> 'RelationGraph':
+        """
+        Make relation graph which contains joined distribution from this factorized relation graph,
+        where joined outcomes are streamed from joint view and spilled to disk in chunks
+        :param directory: directory to write chunks in
+        :param memory_budget: max size (in bytes) of in memory buffer of encoded outcomes, same size have chunk
+        :param name: optional name for the joined graph
+        :return: New instance of relation graph backed by SpilledSampleSet
+        """
+        outcomes = SpilledSampleSetBuilder(self._components_provider, directory, memory_budget)\
+            .add_all(self.joint_view().outcomes())\
+            .build()
+
+        return RelationGraph(
+            self._components_provider,
+            name if name else self.name,
+            outcomes)
+
+    def save(self, path: str) -> None:
+        """
+        Save outcomes and name of this relation graph in binary file (see flat_sample_set.encode_flat)
+        :param path: path of file to write
+        :return: None
+        """
+        FlatSampleSet.save(self.outcomes, path, self.name)
+
+    @staticmethod
+    def load(path: str, mmap: bool = True, query_cache: Optional[QueryCache] = None) -> 'RelationGraph':
+        """
+        Load relation graph saved by save(). Only file header is read, outcomes are decoded from file
+        on iteration. Evidence to query loaded graph should be built with its sample_builder().
+        :param path: path of file to read
+        :param mmap: if True file will be memory mapped, otherwise read in memory
+        :param query_cache: optional cache of query results
+        :return: New instance of relation graph backed by FlatSampleSet, close outcomes when not needed
+        """
+        outcomes = FlatSampleSet.load(path, mmap)
+        return RelationGraph(outcomes.components_provider(), outcomes.name, outcomes, query_cache)
+
+    @staticmethod
+    def load_with_log(
+            snapshot_path: str,
+            log_path: str,
+            mmap: bool = True,
+            query_cache: Optional[QueryCache] = None
+    ) -> 'RelationGraph':
+        """
+        Load relation graph saved by save() (snapshot) together with its delta log (see delta_log), recovered
+        as in delta_log.recover. If log is empty then outcomes are decoded from snapshot file on iteration,
+        otherwise deltas are replayed on snapshot in memory.
+        :param snapshot_path: path of snapshot file
+        :param log_path: path of delta log, will be created if not exist
+        :param mmap: if True snapshot will be memory mapped, otherwise read in memory
+        :param query_cache: optional cache of query results
+        :return: New instance of relation graph
+        """
+        snapshot = FlatSampleSet.load(snapshot_path, mmap)
+        log = recover(snapshot, log_path)
+        try:
+            if not log.number_of_frames:
+                return RelationGraph(snapshot.components_provider(), snapshot.name, snapshot, query_cache)
+            outcomes = replay(snapshot, log.records(), snapshot.components_provider())
+            snapshot.close()
+            return RelationGraph(snapshot.components_provider(), snapshot.name, outcomes, query_cache)
+        finally:
+            log.close()
+
+    def to_shared_memory(self, shm_name: Optional[str] = None) -> 'SharedSampleSet':
+        """
+        Export outcomes of this relation graph in flat shared memory block, so worker processes can
+        attach to it with RelationGraph.attach_shared without copying. Returned set own the block,
+        call unlink() on it when workers are done.
+        :param shm_name: optional name of shared memory block, if None then unique name will be generated
+        :return: shared sample set which own the block, its shm_name should be passed to workers
+        """
+        from .shared_sample_set import SharedSampleSet
+        return SharedSampleSet.create(self.outcomes, self.name, shm_name)
+
+    @staticmethod
+    def attach_shared(shm_name: str, query_cache: Optional[QueryCache] = None) -> 'RelationGraph':
+        """
+        Attach to relation graph exported by to_shared_memory, outcomes are not copied but decoded from
+        shared memory on iteration. Evidence to query attached graph should be built with its sample_builder().
+        :param shm_name: name of shared memory block
+        :param query_cache: optional cache of query results
+        :return: New instance of relation graph backed by SharedSampleSet
+        """
+        from .shared_sample_set import SharedSampleSet
+        outcomes = SharedSampleSet.attach(shm_name)
+        return RelationGraph(outcomes.components_provider(), outcomes.name, outcomes, query_cache)
+
+    def joint_view(self) -> JointView:
+        """
+        Make lazy view over joined distribution of this factorized relation graph,
+        which allow to query joined outcomes without calling of make_joined()
+        :return: New instance of joint view
+        """
+        return JointView(self._components_provider, self.factorized())
+
+    def query(
+            self, variables: Optional[Set[Any]] = None, evidence: Optional[SampleGraph] = None
+    ) -> Dict[Any, Dict[Any, float]]:
+        """
+        Count marginal distribution of variables conditioned on evidence, by variable elimination over
+        count tables of factors, without joining of outcomes. Give same result as
+        conditional_graph(evidence).relation_graph().make_joined().marginal_variables_probability(variables)
+        when factors agree on values of shared variables.
+        :param variables: variables to marginalize, if None then all included variables will be marginalized
+        :param evidence: optional SampleGraph to condition on
+        :return: Dict[variable, Dict[value, probability]]
+        """
+        marginals = self._cached(
+            ("query", frozenset(variables) if variables is not None else None, evidence),
+            lambda: self._eliminate_variables(variables, evidence))
+        return {var: dict(values) for var, values in marginals.items()}
+
+    def _eliminate_variables(
+            self, variables: Optional[Set[Any]], evidence: Optional[SampleGraph]
+    ) -> Dict[Any, Dict[Any, float]]:
+        factors = self.factorized()
+
+        if evidence is not None:
+            assert evidence.is_compatible(self._components_provider), \
+                f"[RelationGraph.query] Evidence {evidence} is not compatible with this relation graph"
+            predicate = self._evidence_predicate(evidence)
+            factors = frozenset({f.filter_samples(predicate) for f in factors})
+
+        tables = [CountTable.from_factor(f) for f in factors if f]
+        included = {var for t in tables for var in t.variables}
+        norm_acc: Dict[Any, Dict[Any, float]] = {}
+
+        for var in (included if variables is None else included.intersection(variables)):
+            counts = marginal_counts(tables, var)
+            c_sum = sum(counts.values())
+            if c_sum > 0:
+                norm_acc[var] = {val: c / c_sum for val, c in counts.items()}
+
+        return norm_acc
+
+    def most_probable_outcome(self, evidence: Optional[SampleGraph] = None) -> Optional[Tuple[SampleGraph, int]]:
+        """
+        Find joined outcome with the highest count among consistent with evidence, without calling of
+        make_joined(). Give same outcome count as max over make_joined().conditional_graph(evidence).outcomes.
+        Factorized graph is searched by max-product over factor tables, other graph (where outcomes are
+        already joint) by best-first search over heap of outcomes. Partially joined graph is not supported.
+        :param evidence: optional SampleGraph to condition on
+        :return: (outcome, count) or None if there is no outcome consistent with evidence
+        """
+        if evidence is not None:
+            assert evidence.is_compatible(self._components_provider), \
+                f"[RelationGraph.most_probable_outcome] Evidence {evidence} is not compatible with this relation graph"
+
+        return self._cached(
+            ("most_probable_outcome", evidence),
+            lambda: self._max_product_outcome(evidence) if self.is_factorized()
+            else self._best_first_outcome(evidence))
+
+    def _max_product_outcome(self, evidence: Optional[SampleGraph]) -> Optional[Tuple[SampleGraph, int]]:
+        factors = self.factorized()
+
+        if evidence is not None:
+            evidence_edges = [(e, frozenset({ep.variable for ep in e.endpoints})) for e in evidence.edges]
+
+            def consistent(o: SampleGraph) -> bool:  # Factor outcome which can be part of joined evidence supergraph
+                key = self.factor_key(o)  # All edges with endpoints variables from key are in outcomes of factor
+                return all(o.value_for_variable(n.variable) == n.value
+                           for n in evidence.nodes if n.variable in o.included_variables) \
+                    and all(e in o.edges for e, endpoints in evidence_edges if endpoints in key)
+
+            factors = frozenset({f.filter_samples(consistent) for f in factors})
+
+        if not factors or not all(factors):
+            return None
+
+        result = max_product([MaxTable.from_factor(f) for f in factors])
+        if result is None:
+            return None
+
+        count, outcomes = result  # Union of selected factor outcomes, as in JointView.outcomes
+        joined = SampleGraph(
+            self._components_provider,
+            frozenset({n for o in outcomes for n in o.nodes}),
+            frozenset({e for o in outcomes for e in o.edges}),
+            None)
+        return (joined, count) if evidence is None or self._evidence_predicate(evidence)(joined) else None
+
+    def _best_first_outcome(self, evidence: Optional[SampleGraph]) -> Optional[Tuple[SampleGraph, int]]:
+        if self._outcomes_heap is None:  # Outcomes are immutable, so check and heap are done once
+            assert self.is_joined(), \
+                f"[RelationGraph.most_probable_outcome] Relation graph should be factorized or joined, " \
+                f"partially joined graph should be joined first with make_joined()"
+            self._outcomes_heap = [(-c, i, o) for i, (o, c) in enumerate(self.outcomes.items())]
+            heapq.heapify(self._outcomes_heap)
+
+        heap = self._outcomes_heap
+        predicate = self._evidence_predicate(evidence) if evidence is not None else lambda _: True
+        frontier: List[Tuple[int, int, int]] = [(heap[0][0], heap[0][1], 0)] if heap else []
+
+        while frontier:  # Visit heap nodes in order of count, children of node can't have greater count
+            _, _, i = heapq.heappop(frontier)
+            neg_count, _, outcome = heap[i]
+            if predicate(outcome):
+                return outcome, -neg_count
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child][0], heap[child][1], child))
+
+        return None
+
+    def approximate_query(
+            self,
+            variables: Optional[Set[Any]] = None,
+            evidence: Optional[SampleGraph] = None,
+            max_samples: int = 10000,
+            max_time: Optional[float] = None,
+            precision: Optional[float] = None,
+            confidence: float = 0.95,
+            seed: Optional[int] = None
+    ) -> Dict[Any, Dict[Any, MarginalEstimate]]:
+        """
+        Estimate marginal distribution of variables conditioned on evidence by Monte Carlo sampling of outcomes,
+        converge to conditional_graph(evidence).marginal_variables_probability(variables).
+        Sampling stops on first of: max_samples draws, max_time elapsed or all estimates reach precision.
+        :param variables: variables to estimate, if None then all drawn variables will be estimated
+        :param evidence: optional SampleGraph to condition on
+        :param max_samples: max number of drawn outcomes (including rejected by evidence)
+        :param max_time: optional time budget in seconds
+        :param precision: optional max half width of confidence interval of each estimate
+        :param confidence: confidence level of intervals
+        :param seed: optional seed of random generator
+        :return: Dict[variable, Dict[value, estimate]]
+        """
+        if evidence is not None:
+            assert evidence.is_compatible(self._components_provider), \
+                f"[RelationGraph.approximate_query] Evidence {evidence} is not compatible with this relation graph"
+        if self._approximate_inference is None:
+            self._approximate_inference = ApproximateInference(self.outcomes)
+
+        return self._approximate_inference.marginals(
+            self._evidence_predicate(evidence) if evidence is not None else lambda _: True,
+            variables, max_samples, max_time, precision, confidence, seed)
+
+    def similarity_index(self, num_bands: int = 16, rows_per_band: int = 4, seed: int = 1) -> 'SimilarityIndex':
+        """
+        Build (once per parameters) MinHash/LSH index of outcomes of this relation graph,
+        to search outcomes most similar to given sample without full scan. Require numpy.
+        :param num_bands: number of LSH bands, more bands give higher recall but more candidates to re-rank
+        :param rows_per_band: number of MinHash rows per band, more rows give fewer and more similar candidates
+        :param seed: seed of MinHash functions
+        :return: similarity index
+        """
+        key = (num_bands, rows_per_band, seed)
+        if key not in self._similarity_indices:
+            from .similarity_index import SimilarityIndex
+            self._similarity_indices[key] = \
+                SimilarityIndex(self._components_provider, self.outcomes, num_bands, rows_per_band, seed)
+        return self._similarity_indices[key]
+
+    def incremental_joined(self, name: Optional[str] = None) -> IncrementalJoinedGraph:
+        """
+        Make joined distribution of this factorized relation graph which can be updated with new outcomes
+        without re-joining from scratch
+        :param name: optional name for the joined graph
+        :return: New instance of incremental joined graph
+        """
+        return IncrementalJoinedGraph(self._components_provider, self.factorized(), name if name else self.name)
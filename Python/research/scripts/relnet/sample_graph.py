@@ -19,11 +19,13 @@ created: 2021-10-18
 """
 
 from collections import defaultdict
-from typing import Dict, Set, Any, Optional, Tuple, Union
+from typing import Dict, Set, Any, Optional, Tuple, Union, List
 
-from pyvis.network import Network
+from .graph_components import SampleGraphComponentsProvider, ValueNode, RelationEdge, DirectedRelation, \
+    content_fingerprint
+from .visualization import new_network, show_network
 
-from .graph_components import SampleGraphComponentsProvider, ValueNode, RelationEdge, DirectedRelation
+EXTERNAL_NODES_MEMO_SIZE = 32  # Max number of memoized external_nodes results per sample graph
 
 
 class SampleGraphBuilder:
@@ -147,6 +149,25 @@ class SampleGraphBuilder:
 
         return self.build()
 
+    def build_from_view(
+            self,
+            view: Union[frozenset[Tuple[frozenset[Tuple[Any, Any]], Any]], Tuple[Any, Any], None],
+            validate_connectivity: bool = True
+    ) -> 'SampleGraph':
+        """
+        Creates sample graph from its edges set view (same format as returned by SampleGraph.edges_set_view)
+        :param view: frozenset[(endpoints, relation)] or for single node (variable, value) or None for empty graph
+        :param validate_connectivity: if False then connectivity of edges will not be checked
+        :return: built sample graph
+        """
+        if view is None:
+            return self.build_empty()
+        elif isinstance(view, frozenset):
+            return self.build_from_edges(view, validate_connectivity)
+        else:
+            variable, value = view
+            return self.build_single_node(variable, value)
+
     def add_relation(self, endpoints: Set[Tuple[Any, Any]], relation: Any) -> 'SampleGraphBuilder':
         """
         To add relation edge in to sample graph, with validation of graph connectivity
@@ -273,13 +294,16 @@ class SampleGraph:
         self.nodes: frozenset[ValueNode] = nodes
         self.edges: frozenset[RelationEdge] = edges
         self.hash: frozenset[Any] = nodes.union({e for e in edges})
-        self.name: str = name if name else (
-                "{" + '; '.join(sorted([str(e) for e in self.edges] if self.edges else
-                                       [str(n) for n in self.nodes])) + "}")
+        self._name: Optional[str] = name  # Default name is built on first access, since costly for big graphs
         self.included_variables: frozenset[Any] = frozenset({n.variable for n in nodes})
         self.is_single_node: bool = not bool(edges)
         self.is_k_0: bool = not bool(nodes) and not bool(edges)
         self._components_provider: SampleGraphComponentsProvider = components_provider
+        self._edges_endpoint_variables: Optional[frozenset[frozenset[Any]]] = None
+        self._adjacency: Optional[Dict[ValueNode, List[RelationEdge]]] = None
+        self._external_nodes_memo: Optional[Dict[Tuple[frozenset[ValueNode], Optional[frozenset[Any]]],
+                                                 Dict[ValueNode, Set[RelationEdge]]]] = None  # Created on first use
+        self._fingerprints: Optional[Dict[int, bytes]] = None  # Digest size -> fingerprint, created on first access
 
     def __hash__(self):
         return self.hash.__hash__()
@@ -287,6 +311,17 @@ class SampleGraph:
     def __repr__(self):
         return self.name
 
+    @property
+    def name(self) -> str:
+        """
+        Name of this sample graph, if not given on creation then made of sorted edges (or nodes)
+        :return: name
+        """
+        if not self._name:
+            self._name = "{" + '; '.join(sorted([str(e) for e in self.edges] if self.edges else
+                                                [str(n) for n in self.nodes])) + "}"
+        return self._name
+
     def __copy__(self):
         raise AssertionError(
             "[SampleGraph.__copy__] Sample graph should not be copied, "
@@ -305,6 +340,53 @@ class SampleGraph:
         """
         return id(self._components_provider) == id(other_components_provider)
 
+    def fingerprint(self, digest_size: int = 16) -> bytes:
+        """
+        Compute content fingerprint of this sample graph, which not depends on components provider,
+        so equal graphs built in different processes or sessions have same fingerprint
+        (variables, values and relations should have stable repr)
+        :param digest_size: size of fingerprint in bytes, 8 or 16
+        :return: fingerprint
+        """
+        if self._fingerprints is None:
+            self._fingerprints = {}
+        if digest_size not in self._fingerprints:
+            self._fingerprints[digest_size] = content_fingerprint([c.content_key() for c in self.hash], digest_size)
+        return self._fingerprints[digest_size]
+
+    def remap(
+            self,
+            components_provider: SampleGraphComponentsProvider,
+            memo: Optional[Dict[Any, Any]] = None
+    ) -> 'SampleGraph':
+        """
+        Rebuild this sample graph with nodes and edges of other components provider with same schema
+        :param components_provider: components provider to remap to
+        :param memo: optional memo of remapped nodes and edges to share in between graphs,
+                     if given then schema expected to be checked by caller
+        :return: sample graph compatible to given components provider, or this if already compatible
+        """
+        if self.is_compatible(components_provider):
+            return self
+        if memo is None:
+            assert self._components_provider.has_same_schema(components_provider), \
+                f"[SampleGraph.remap] Components provider should have same schema as of this sample graph"
+            memo = {}
+
+        for node in self.nodes:
+            if node not in memo:
+                memo[node] = components_provider.get_node(node.variable, node.value)
+        for edge in self.edges:
+            if edge not in memo:
+                memo[edge] = components_provider.get_edge(
+                    frozenset({memo[ep] for ep in edge.endpoints}), edge.relation)
+
+        return SampleGraph(
+            components_provider,
+            frozenset({memo[n] for n in self.nodes}),
+            frozenset({memo[e] for e in self.edges}),
+            self._name)
+
     def text_view(self) -> str:
         """
         Create textual representation of this sample graph to print in terminal
@@ -332,22 +414,23 @@ class SampleGraph:
         else:
             return None
 
-    def visualize(self, height="1024px", width="1024px") -> None:
+    def visualize(self, height="1024px", width="1024px", show: bool = True) -> None:
         """
         Use pyvis.network to visualize this sample graph
         :param height: screen height
         :param width: screen width
+        :param show: if False then HTML file will be only written (headless mode), without opening in browser
         :return: None
         """
         name = "".join(c for c in self.name if c.isalnum() or c in {'_', '-', '(', ')'})
-        net = Network(height=height, width=width)
+        net = new_network(height, width)
 
         for node in self.nodes:
             net.add_node(node.string_id, label=node.string_id)
         for edge in self.edges:
             net.add_edge(edge.a.string_id, edge.b.string_id, label=str(edge.relation))
 
-        net.show(f"{name}.html")
+        show_network(net, name, show)
 
     def builder(self) -> SampleGraphBuilder:
         """
@@ -461,31 +544,62 @@ class SampleGraph:
                         acc[node] = {edge}
         return acc
 
+    def _incident_edges(self) -> Dict[ValueNode, List[RelationEdge]]:
+        """
+        Build (once) adjacency map from node to edges incident to it
+        :return: Dict[node, List[incident_edge]]
+        """
+        if self._adjacency is None:
+            adjacency: Dict[ValueNode, List[RelationEdge]] = {n: [] for n in self.nodes}
+            for edge in self.edges:
+                for node in edge.endpoints:
+                    adjacency[node].append(edge)
+            self._adjacency = adjacency
+        return self._adjacency
+
     def external_nodes(
             self,
             internal_nodes: Set[ValueNode],
             relation_filter: Set[Any] = None
     ) -> Dict[ValueNode, Set[RelationEdge]]:
         """
-        Return all external nodes (nodes which not in internal nodes set) of this sample graph
+        Return all external nodes (nodes which not in internal nodes set) of this sample graph.
+        Nodes are searched level by level (breadth first) from internal nodes, only edges which lead from
+        reached node to not reached one are included. Result is memoized per internal nodes and relation filter.
         :param internal_nodes: nodes to search neighbors around, should not be empty
         :param relation_filter: Set of relations to select neighbors with particular relation,
                                 if None then select all neighbors.
         :return: Dict[external_node, Set[relation_edge_which_lead_to_internal_node]]
         """
-        acc_nodes = self.belt_nodes(internal_nodes, relation_filter)
-        if acc_nodes:
-            for node, edges in self.external_nodes(internal_nodes.union(acc_nodes.keys()), relation_filter).items():
-                if node in acc_nodes:
-                    assert acc_nodes[node].isdisjoint(edges), \
-                        "[SampleGraph.external_nodes] sample graph can't have identical edges " \
-                        "and they can't be checked twice, look like bug."
-                    acc_nodes[node].update(edges)
-                else:
-                    acc_nodes[node] = edges
-            return acc_nodes
-        else:
-            return {}  # All value nodes checked
+        assert internal_nodes, "[SampleGraph.external_nodes] internal_nodes set should not be empty"
+
+        key = (frozenset(internal_nodes), frozenset(relation_filter) if relation_filter else None)
+
+        if self._external_nodes_memo is None:
+            self._external_nodes_memo = {}
+        if key not in self._external_nodes_memo:
+            adjacency = self._incident_edges()
+            reached: Set[ValueNode] = set(internal_nodes)
+            frontier: List[ValueNode] = [n for n in internal_nodes if n in adjacency]
+            acc: Dict[ValueNode, Set[RelationEdge]] = {}
+
+            while frontier:
+                level: Dict[ValueNode, Set[RelationEdge]] = {}
+                for node in frontier:
+                    for edge in adjacency[node]:
+                        if not relation_filter or edge.relation in relation_filter:
+                            other = edge.b if edge.a == node else edge.a
+                            if other not in reached:
+                                level.setdefault(other, set()).add(edge)
+                reached.update(level.keys())
+                acc.update(level)
+                frontier = list(level.keys())
+
+            if len(self._external_nodes_memo) >= EXTERNAL_NODES_MEMO_SIZE:
+                del self._external_nodes_memo[next(iter(self._external_nodes_memo))]
+            self._external_nodes_memo[key] = acc
+
+        return {node: set(edges) for node, edges in self._external_nodes_memo[key].items()}
 
     def variables_subgraph_hash(self, variables: Set[Any]) -> frozenset[Any]:
         """
@@ -504,7 +618,10 @@ class SampleGraph:
         will return {{a, b}, {b, c}}
         :return: set of endpoints variables
         """
-        return frozenset({frozenset({ep.variable for ep in e.endpoints}) for e in self.edges})
+        if self._edges_endpoint_variables is None:
+            self._edges_endpoint_variables = frozenset(
+                {frozenset({ep.variable for ep in e.endpoints}) for e in self.edges})
+        return self._edges_endpoint_variables
 
     def single_node_variable(self) -> Any:
         """
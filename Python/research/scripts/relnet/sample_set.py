@@ -21,7 +21,7 @@ created: 2021-11-19
 from math import isclose
 from typing import Dict, Set, Any, Optional, Tuple, Callable, List
 
-from .graph_components import SampleGraphComponentsProvider
+from .graph_components import SampleGraphComponentsProvider, content_fingerprint
 from .sample_graph import SampleGraph, SampleGraphBuilder
 
 
@@ -175,10 +175,7 @@ class SampleSet(Samples):
         In case result sample graph will not connected AssertionError will be raise.
         :return: (new_sample, list_of_counts)
         """
-        for var in frozenset.intersection(*[s.included_variables for s in self.samples()]):
-            if len({s.value_for_variable(var) for s in self.samples()}) > 1:
-                return False
-        return True
+        return self.is_all_values_match()
 
     def make_joined_sample(self) -> Tuple[SampleGraph, List[int]]:
         """
@@ -253,6 +250,112 @@ class SampleSet(Samples):
         assert sample in self._samples, f"[SampleSet.probability_of] No sample {sample} in this sample set"
         return self._samples[sample] / self.length
 
+    def fingerprint(self, digest_size: int = 16) -> bytes:
+        """
+        Compute content fingerprint of samples and them counts, which not depends on components provider
+        (see SampleGraph.fingerprint), e.g. to deduplicate sample sets built in different processes
+        :param digest_size: size of fingerprint in bytes, 8 or 16
+        :return: fingerprint
+        """
+        return content_fingerprint(
+            [o.fingerprint(digest_size) + c.to_bytes(8, "little") for o, c in self._samples.items()], digest_size)
+
+    def remap(self, components_provider: SampleGraphComponentsProvider) -> 'SampleSet':
+        """
+        Rebuild all samples with nodes and edges of other components provider with same schema,
+        e.g. to merge sample sets built in different processes
+        :param components_provider: components provider to remap to
+        :return: sample set compatible to given components provider, or this if already compatible
+        """
+        if id(self._components_provider) == id(components_provider):
+            return self
+        assert self._components_provider.has_same_schema(components_provider), \
+            f"[SampleSet.remap] Components provider should have same schema as of this sample set"
+
+        memo: Dict[Any, Any] = {}
+        return SampleSet(components_provider, {o.remap(components_provider, memo): c for o, c in self._samples.items()})
+
+
+class SampleSetView(Samples):
+    """
+    Immutable view over selected samples of base list of samples, stores only indices of selected samples,
+    so filtering of view does not copy samples
+    """
+
+    def __init__(
+            self,
+            components_provider: SampleGraphComponentsProvider,
+            base: List[Tuple[SampleGraph, int]],
+            indices: List[int]
+    ):
+        super(SampleSetView, self).__init__(components_provider, {})
+        self.length: int = sum(base[i][1] for i in indices)
+        self._base: List[Tuple[SampleGraph, int]] = base
+        self._indices: List[int] = indices
+
+    @staticmethod
+    def of(samples: Samples) -> 'SampleSetView':
+        """
+        Create view which select all samples of given sample set
+        :param samples: sample set to make view of
+        :return: new view
+        """
+        base = list(samples.items())
+        return SampleSetView(samples._components_provider, base, list(range(len(base))))
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __bool__(self) -> bool:
+        return bool(self._indices)
+
+    def __repr__(self):
+        return f"SampleSetView(length = {self.length}, number_of_samples = {len(self._indices)}, " \
+               f"number_of_base_samples = {len(self._base)})"
+
+    def __copy__(self):
+        raise AssertionError("[SampleSetView.__copy__] Sample set view should not be copied")
+
+    def items(self) -> List[Tuple[SampleGraph, int]]:
+        """
+        Get selected sample graphs and them counts
+        :return: List[(SampleGraph, count)]
+        """
+        return [self._base[i] for i in self._indices]
+
+    def samples(self) -> Set[SampleGraph]:
+        """
+        Get only selected sample graphs without count
+        :return: set of samples
+        """
+        return {self._base[i][0] for i in self._indices}
+
+    def count_of(self, sample: SampleGraph) -> int:
+        """
+        Get count for given sample, require scan over selected samples
+        :param sample: given sample
+        :return: count of given sample
+        """
+        for i in self._indices:
+            if self._base[i][0] == sample:
+                return self._base[i][1]
+        raise AssertionError(f"[SampleSetView.count_of] No sample {sample} in this sample set")
+
+    def filter_samples(self, p: Callable[[SampleGraph], bool]) -> 'SampleSetView':
+        """
+        To filter selected samples with predicate
+        :param p: predicate to filter one
+        :return: new view over same base samples, without filtered out samples
+        """
+        return SampleSetView(self._components_provider, self._base, [i for i in self._indices if p(self._base[i][0])])
+
+    def builder(self) -> 'SampleSetBuilder':
+        """
+        Create SampleSetBuilder with selected samples
+        :return: SampleSetBuilder with selected samples
+        """
+        return SampleSetBuilder(self._components_provider, dict(self.items()))
+
 
 class SampleSetBuilder(Samples):
     """
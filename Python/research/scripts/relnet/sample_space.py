@@ -20,13 +20,16 @@ created: 2021-11-09
 
 import os
 from math import isclose
-from typing import Dict, Set, Any, Optional, Tuple, Union
-from pyvis.network import Network
+from typing import Dict, Set, Any, Optional, Tuple, Union, Callable
 
 from .folded_graph import FoldedGraph, FoldedNode, FoldedEdge
 from .graph_components import SampleGraphComponentsProvider, ValueNode, RelationEdge
+from .graphml_export import write_outcomes_graphml
+from .outcomes_renderer import OutcomesRenderer
+from .query_cache import QueryCache
 from .sample_graph import SampleGraph, SampleGraphBuilder
 from .sample_set import SampleSet, SampleSetBuilder
+from .visualization import new_network, show_network
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -44,12 +47,14 @@ class SampleSpace:
             components_provider: SampleGraphComponentsProvider,
             outcomes: SampleSet,
             name: Optional[str],
-            evidence: Optional[SampleGraph]
+            evidence: Optional[SampleGraph],
+            query_cache: Optional[QueryCache] = None
     ):
         self._components_provider: SampleGraphComponentsProvider = components_provider
         self._name: Optional[str] = name
         self._evidence: Optional[SampleGraph] = evidence
         self.outcomes: SampleSet = outcomes
+        self.query_cache: Optional[QueryCache] = query_cache
 
     def __repr__(self):
         return self._name
@@ -59,6 +64,29 @@ class SampleSpace:
             "[SampleSpace.__copy__] Sample graph should not be copied, "
             "use one of transformation method or builder to get new instance")
 
+    def _cached(self, key: Tuple[Any, ...], compute: Callable[[], Any]) -> Any:
+        """
+        Get result of query from query cache or compute it if there is no cache.
+        Outcomes, evidence and name are added to key, so same cache can be shared by several sample spaces.
+        :param key: name and arguments of query
+        :param compute: function to compute result of query
+        :return: result of query
+        """
+        if self.query_cache is None:
+            return compute()
+        return self.query_cache.get_or_compute((self.outcomes, self._evidence, self._name) + key, compute)
+
+    @staticmethod
+    def _evidence_predicate(evidence: SampleGraph) -> Callable[[SampleGraph], bool]:
+        """
+        Build predicate which select outcomes consistent with evidence: outcomes which contain evidence
+        or not include any evidence variable
+        :param evidence: SampleGraph to condition on
+        :return: outcome predicate
+        """
+        return lambda outcome: \
+            evidence.is_subgraph(outcome) or evidence.included_variables.isdisjoint(outcome.included_variables)
+
     def builder(self) -> 'RelationGraphBuilder':
         """
         Construct new relation graph builder which contains all outcomes from this inference graph
@@ -81,7 +109,8 @@ class SampleSpace:
         return RelationGraph(
             self._components_provider,
             name if name else self._name,
-            self.outcomes)
+            self.outcomes,
+            self.query_cache)
 
     def sample_builder(self) -> SampleGraphBuilder:
         """
@@ -108,6 +137,14 @@ class SampleSpace:
         :param unobserved: if True unobserved values will added
         :return: Dict[variable, Dict[value, probability]]
         """
+        marginals = self._cached(
+            ("marginal_variables_probability", frozenset(variables) if variables else None, unobserved),
+            lambda: self._count_marginal_variables_probability(variables, unobserved))
+        return {var: dict(values) for var, values in marginals.items()}
+
+    def _count_marginal_variables_probability(
+            self, variables: Optional[Set[Any]], unobserved: bool
+    ) -> Dict[str, Dict[str, float]]:
         variables_to_check = variables if variables else {v for v, _ in self._components_provider.variables()}
         group_acc:  Dict[str, Dict[str, int]] = {}
         norm_acc: Dict[str, Dict[str, float]] = {}
@@ -192,16 +229,23 @@ class SampleSpace:
             {FoldedEdge(set(endpoints), edges) for endpoints, edges in edge_acc.items()},
             name if name else f"VariablesGraph(len(nodes) = {len(node_acc)}, len(edges) = {len(edge_acc)})")
 
-    def visualize_outcomes(self, name: Optional[str] = None, height: str = "1024px", width: str = "1024px"):
+    def visualize_outcomes(
+            self,
+            name: Optional[str] = None,
+            height: str = "1024px",
+            width: str = "1024px",
+            show: bool = True
+    ):
         """
-        Will render all outcomes as HTML page and show in browser
+        Will render all outcomes as HTML page and show in browser, for large number of outcomes use render_outcomes
         :param height: window height
         :param width: window width
         :param name: optional name of this visualization, if None then self.name will passed
+        :param show: if False then HTML file will be only written (headless mode), without opening in browser
         :return: None
         """
         file_name = "".join(c for c in (name if name else self._name) if c.isalnum() or c == '_')
-        net = Network(height=height, width=width)
+        net = new_network(height, width)
 
         for i, (outcome, count) in enumerate(self.outcomes.items()):
             node_list = list(outcome.nodes)
@@ -224,7 +268,44 @@ class SampleSpace:
                 net.add_edge(
                     ep[0].string_id + "_query", ep[1].string_id + "_query", label=str(edge.relation), color="red")
 
-        net.show(f"{file_name}.html")
+        show_network(net, file_name, show)
+
+    def render_outcomes(
+            self,
+            directory: str = ".",
+            name: Optional[str] = None,
+            page_size: int = 500,
+            top_n: Optional[int] = None,
+            sample_size: Optional[int] = None,
+            aggregate: bool = False,
+            output_format: str = "html",
+            seed: Optional[int] = None,
+            show: bool = False
+    ) -> str:
+        """
+        Will render outcomes in pages of HTML or JSON files, outcomes are streamed (see OutcomesRenderer)
+        :param directory: output directory
+        :param name: optional name of this rendering, if None then self.name will passed
+        :param page_size: max number of outcomes (or aggregated entries) on one page
+        :param top_n: if set then only N outcomes with highest counts will be rendered
+        :param sample_size: if set then N outcomes will be sampled in proportion to them counts
+        :param aggregate: if True then outcomes with same variables and relations will be aggregated in one entry
+        :param output_format: "html" or "json"
+        :param seed: optional seed of random generator used for sampling
+        :param show: if True then index page will be opened in browser, otherwise only files are written
+        :return: path of index file
+        """
+        return OutcomesRenderer(page_size, top_n, sample_size, aggregate, output_format, seed) \
+            .render(self.outcomes, directory, name if name else self._name, self._evidence, show)
+
+    def write_outcomes_graphml(self, path: str, name: Optional[str] = None) -> None:
+        """
+        Will write all outcomes as one GraphML file, outcomes are streamed (see write_outcomes_graphml)
+        :param path: path of file to write
+        :param name: optional name of graph, if None then self.name will passed
+        :return: None
+        """
+        write_outcomes_graphml(self.outcomes, path, name if name else self._name)
 
     def print_samples(self) -> str:
         """
@@ -247,23 +328,51 @@ class SampleSpace:
 
         return ssb.build()
 
+    @staticmethod
+    def factor_key(outcome: SampleGraph) -> frozenset[Any]:
+        """
+        Build key of factor to which given outcome belong
+        :param outcome: not empty outcome
+        :return: for single node outcome set of its variable, for others set of edges endpoints variables
+        """
+        assert not outcome.is_k_0, \
+            f"[SampleSpace.factor_key] Empty outcome can't belong to factor"
+        return frozenset({outcome.single_node_variable()}) if outcome.is_single_node \
+            else outcome.edges_endpoint_variables()
+
+    def _factors_index(self) -> Optional[Dict[frozenset[Any], SampleSetBuilder]]:
+        """
+        Split outcomes of this sample space by factors. Each element of factor key (variable of single node outcome
+        or endpoints variables of an edge) is indexed to the factor key, so each outcome is classified
+        in time proportional to its number of edges.
+        :return: Dict[factor_key, factor_outcomes] or None if this sample space is not factorized
+        """
+        acc: Dict[frozenset[Any], SampleSetBuilder] = {}
+        index: Dict[Any, frozenset[Any]] = {}
+
+        for o, c in self.outcomes.items():
+            if o.is_k_0:
+                return None
+            key = self.factor_key(o)
+            if key in acc:
+                acc[key].add(o, c)
+            else:
+                for element in key:
+                    if element in index:  # Element is already in another factor, so outcomes overlap
+                        return None
+                index.update({element: key for element in key})
+                acc[key] = SampleSetBuilder(self._components_provider, {o: c})
+
+        return acc
+
     def factorized(self) -> frozenset[SampleSet]:
         """
         Will split outcomes of this sample set by factors, or raise error if this sample set is not factorized
         :return: set of SampleSet
         """
-        acc: Dict[frozenset[frozenset[Any]], SampleSetBuilder] = {}
+        factors = self._factors_index()
 
-        for o, c in self.outcomes.items():
-            assert not o.is_k_0, \
-                f"[SampleSpace.factorized] Sample spase which contains empty outcome can't be factorized"
-            evs = frozenset({o.single_node_variable()}) if o.is_single_node else o.edges_endpoint_variables()
-            if evs not in acc:
-                for aep in acc.keys():
-                    assert aep.isdisjoint(evs), \
-                        f"[SampleSpace.factorized] Sample spase which contains overlapping outcome can't be factorized"
-                acc[evs] = SampleSetBuilder(self._components_provider, {o: c})
-            else:
-                acc[evs].add(o, c)
+        assert factors is not None, \
+            f"[SampleSpace.factorized] Sample spase which contains empty or overlapping outcome can't be factorized"
 
-        return frozenset({b.build() for b in acc.values()})
+        return frozenset({b.build() for b in factors.values()})
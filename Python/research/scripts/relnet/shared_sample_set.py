@@ -0,0 +1,98 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Set
+
+from .flat_sample_set import FlatSampleSet, encode_flat
+from .sample_set import Samples
+
+_created_shm_names: Set[str] = set()  # Blocks created in this process (or in parent, if forked)
+
+
+class SharedSampleSet(FlatSampleSet):
+    """
+    Immutable collection of unique samples with count, stored in flat layout in one shared memory block, so
+    any number of processes can attach to it without copying. Samples are decoded on iteration.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        super(SharedSampleSet, self).__init__(shm.buf[:], shm.close)
+        self.shm_name: str = shm.name
+        self._shm: shared_memory.SharedMemory = shm
+        self._owner: bool = owner
+
+    def __repr__(self):
+        return f"SharedSampleSet(shm_name = {self.shm_name}, length = {self.length}, " \
+               f"number_of_samples = {self.number_of_samples})"
+
+    def __copy__(self):
+        raise AssertionError("[SharedSampleSet.__copy__] Shared sample set should not be copied")
+
+    @staticmethod
+    def create(samples: Samples, name: Optional[str] = None, shm_name: Optional[str] = None) -> 'SharedSampleSet':
+        """
+        Export samples in new shared memory block. Created set is owner of block and should be unlinked
+        when all processes are done with it.
+        :param samples: samples to export, samples should be unique
+        :param name: optional name to store with samples, e.g. name of relation graph
+        :param shm_name: optional name of shared memory block, if None then unique name will be generated
+        :return: new shared sample set attached to created block
+        """
+        head, sections, size = encode_flat(samples, name)
+
+        shm = shared_memory.SharedMemory(name=shm_name, create=True, size=size)
+        shm.buf[:len(head)] = head
+        for offset, values in sections:
+            shm.buf[offset:offset + len(values) * values.itemsize] = values.tobytes()
+
+        _created_shm_names.add(shm.name)
+        return SharedSampleSet(shm, owner=True)
+
+    @staticmethod
+    def attach(shm_name: str) -> 'SharedSampleSet':
+        """
+        Attach to shared memory block created by SharedSampleSet.create, without copying of data.
+        Attached set have own components provider (build from stored variables and relations).
+        Block is not kept in resource tracker of attached process, otherwise tracker would unlink block
+        on exit of this process, while owner and other processes still use it. Blocks created in same process
+        (or in parent of forked worker, which share its tracker) stay registered, to be unlinked by owner.
+        :param shm_name: name of shared memory block
+        :return: new shared sample set attached to block
+        """
+        if sys.version_info >= (3, 13):
+            return SharedSampleSet(shared_memory.SharedMemory(name=shm_name, track=False), owner=False)
+
+        shm = shared_memory.SharedMemory(name=shm_name)
+        if shm.name not in _created_shm_names:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return SharedSampleSet(shm, owner=False)
+
+    def unlink(self) -> None:
+        """
+        Close and destroy shared memory block, should be called once by owner when all processes are done
+        :return: None
+        """
+        assert self._owner, f"[SharedSampleSet.unlink] Only owner (created) set can unlink shared memory"
+
+        self.close()
+        self._shm.unlink()
+        _created_shm_names.discard(self.shm_name)
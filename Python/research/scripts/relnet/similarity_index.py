@@ -0,0 +1,132 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import heapq
+from typing import Dict, List, Tuple, Set, Union
+
+import numpy as np
+
+from .graph_components import SampleGraphComponentsProvider, ValueNode, RelationEdge
+from .sample_graph import SampleGraph
+from .sample_set import Samples
+
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+class SimilarityIndex:
+    """
+    Immutable MinHash index of outcomes, with LSH banding to find candidates similar to given sample.
+    Signatures estimate Jaccard similarity of nodes and edges sets, same measure as SampleGraph.similarity.
+    Outcomes which have same signature rows in at least one band become candidates.
+    More bands give higher recall, more rows per band give fewer (more similar) candidates.
+    """
+
+    def __init__(
+            self,
+            components_provider: SampleGraphComponentsProvider,
+            outcomes: Samples,
+            num_bands: int = 16,
+            rows_per_band: int = 4,
+            seed: int = 1
+    ):
+        assert num_bands > 0 and rows_per_band > 0, \
+            f"[SimilarityIndex.__init__] Number of bands and rows per band should be > 0, " \
+            f"got {num_bands} and {rows_per_band}"
+
+        rnd = np.random.default_rng(seed)
+        num_perm = num_bands * rows_per_band
+
+        self.num_bands: int = num_bands
+        self.rows_per_band: int = rows_per_band
+        self._components_provider: SampleGraphComponentsProvider = components_provider
+        self._a: np.ndarray = rnd.integers(1, MERSENNE_PRIME, num_perm, dtype=np.int64)
+        self._b: np.ndarray = rnd.integers(0, MERSENNE_PRIME, num_perm, dtype=np.int64)
+        self._outcomes: List[SampleGraph] = [o for o, _ in outcomes.items()]
+        self._component_ids: Dict[Union[ValueNode, RelationEdge], int] = {
+            c: i for i, c in enumerate(dict.fromkeys(c for o in self._outcomes for c in o.hash))}
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(num_bands)]
+
+        for i, outcome in enumerate(self._outcomes):
+            for band, key in enumerate(self._band_keys(self.signature(outcome))):
+                self._buckets[band].setdefault(key, []).append(i)
+
+        self.number_of_outcomes: int = len(self._outcomes)
+
+    def __repr__(self):
+        return f"SimilarityIndex(number_of_outcomes = {self.number_of_outcomes}, num_bands = {self.num_bands}, " \
+               f"rows_per_band = {self.rows_per_band})"
+
+    def __copy__(self):
+        raise AssertionError("[SimilarityIndex.__copy__] Similarity index should not be copied")
+
+    def signature(self, sample: SampleGraph) -> np.ndarray:
+        """
+        Compute MinHash signature of nodes and edges of sample
+        :param sample: sample graph
+        :return: array of num_bands * rows_per_band min hashes
+        """
+        ids = np.fromiter(
+            (self._component_id(c) for c in sample.hash), dtype=np.int64, count=len(sample.hash))
+        if not len(ids):
+            return np.full(len(self._a), MERSENNE_PRIME, dtype=np.int64)
+        return ((np.outer(ids, self._a) + self._b) % MERSENNE_PRIME).min(axis=0)
+
+    def _component_id(self, component: Union[ValueNode, RelationEdge]) -> int:
+        """
+        Get ID of node or edge, components not seen in outcomes are hashed (beyond range of indexed IDs)
+        without storing, so queries not grow index and can run concurrently
+        :param component: node or edge
+        :return: ID in range [0, MERSENNE_PRIME)
+        """
+        i = self._component_ids.get(component)
+        if i is None:
+            indexed = len(self._component_ids)
+            i = indexed + hash(component) % (MERSENNE_PRIME - indexed)
+        return i
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [band.tobytes() for band in signature.reshape(self.num_bands, self.rows_per_band)]
+
+    def candidates(self, sample: SampleGraph) -> Set[int]:
+        """
+        Find indexes of outcomes which share at least one band with given sample
+        :param sample: sample graph to search similar to
+        :return: set of indexes of candidate outcomes
+        """
+        assert sample.is_compatible(self._components_provider), \
+            f"[SimilarityIndex.candidates] Sample {sample} is not compatible with this index"
+
+        acc: Set[int] = set({})
+        for band, key in enumerate(self._band_keys(self.signature(sample))):
+            acc.update(self._buckets[band].get(key, []))
+        return acc
+
+    def top_k(self, sample: SampleGraph, k: int) -> List[Tuple[SampleGraph, float]]:
+        """
+        Find up to k outcomes most similar to given sample. Candidates found by LSH are re-ranked
+        by exact similarity, so result can miss similar outcomes which not became candidates.
+        :param sample: sample graph to search similar to
+        :param k: max number of outcomes to return, should be > 0
+        :return: List[(outcome, similarity)] ordered by similarity descending
+        """
+        assert k > 0, f"[SimilarityIndex.top_k] Expect k be > 0, got {k}"
+
+        scored = ((self._outcomes[i], self._outcomes[i].similarity(sample)) for i in self.candidates(sample))
+        return heapq.nlargest(k, scored, key=lambda os: os[1])
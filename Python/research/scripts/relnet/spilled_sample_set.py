@@ -0,0 +1,275 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+import weakref
+from array import array
+from typing import Dict, List, Union, Iterator, Tuple, Callable, Optional
+
+from .graph_components import SampleGraphComponentsProvider, ValueNode, RelationEdge
+from .sample_graph import SampleGraph
+from .sample_set import Samples, SampleSetBuilder
+
+RECORD_HEADER = struct.Struct("<qI")  # (count, number_of_components)
+
+
+class ComponentsTable:
+    """
+    Mutable table which assign int ID to each node and edge, used to encode samples in compact form
+    """
+
+    def __init__(self):
+        self._ids: Dict[Union[ValueNode, RelationEdge], int] = {}
+        self._components: List[Union[ValueNode, RelationEdge]] = []
+
+    def __len__(self) -> int:
+        return len(self._components)
+
+    def encode(self, sample: SampleGraph) -> array:
+        """
+        Encode sample as array of IDs of its nodes and edges, unknown components will be added to table
+        :param sample: sample to encode
+        :return: array of components IDs
+        """
+        acc = array("I")
+        for component in sample.hash:
+            if component not in self._ids:
+                self._ids[component] = len(self._components)
+                self._components.append(component)
+            acc.append(self._ids[component])
+        return acc
+
+    def decode(self, components_provider: SampleGraphComponentsProvider, ids: array) -> SampleGraph:
+        """
+        Decode sample from array of IDs of its nodes and edges
+        :param components_provider: provider which was used to create encoded samples
+        :param ids: array of components IDs
+        :return: decoded sample
+        """
+        components = [self._components[i] for i in ids]
+        return SampleGraph(
+            components_provider,
+            frozenset({c for c in components if isinstance(c, ValueNode)}),
+            frozenset({c for c in components if isinstance(c, RelationEdge)}),
+            None)
+
+
+class SpilledSampleSet(Samples):
+    """
+    Immutable collection of unique samples with count, stored on disk in chunks of encoded samples
+    and read back one chunk at time. Directory of chunks is owned by this sample set, it is removed by remove(),
+    on exit of with block or when sample set is garbage collected.
+    """
+
+    def __init__(
+            self,
+            components_provider: SampleGraphComponentsProvider,
+            table: ComponentsTable,
+            directory: str,
+            chunks: List[str],
+            length: int,
+            number_of_samples: int,
+            memory_budget: int
+    ):
+        self._components_provider: SampleGraphComponentsProvider = components_provider  # Samples are on disk
+        self.directory: str = directory
+        self.length: int = length
+        self.number_of_samples: int = number_of_samples
+        self.memory_budget: int = memory_budget
+        self._table: ComponentsTable = table
+        self._chunks: List[str] = chunks
+        self._finalizer: weakref.finalize = weakref.finalize(self, shutil.rmtree, directory, True)
+
+    @property
+    def _samples(self) -> Dict[SampleGraph, int]:
+        raise AssertionError("[SpilledSampleSet._samples] Samples are stored on disk, use items() to stream them")
+
+    def __enter__(self) -> 'SpilledSampleSet':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.remove()
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __bool__(self) -> bool:
+        return self.number_of_samples > 0
+
+    def __repr__(self):
+        return f"SpilledSampleSet(length = {self.length}, number_of_samples = {self.number_of_samples}, " \
+               f"number_of_chunks = {len(self._chunks)})"
+
+    def __copy__(self):
+        raise AssertionError("[SpilledSampleSet.__copy__] Spilled sample set should not be copied")
+
+    def items(self) -> Iterator[Tuple[SampleGraph, int]]:
+        """
+        Stream all sample graphs and them counts, only one chunk is loaded in memory at time
+        :return: Iterator[(SampleGraph, count)]
+        """
+        for chunk in self._chunks:
+            with open(chunk, "rb") as f:
+                data = f.read()
+            offset = 0
+            while offset < len(data):
+                count, n = RECORD_HEADER.unpack_from(data, offset)
+                offset += RECORD_HEADER.size
+                ids = array("I")
+                ids.frombytes(data[offset:offset + n * ids.itemsize])
+                offset += n * ids.itemsize
+                yield self._table.decode(self._components_provider, ids), count
+
+    def samples(self) -> Iterator[SampleGraph]:
+        """
+        Stream only sample graphs without count
+        :return: Iterator[SampleGraph]
+        """
+        return (s for s, _ in self.items())
+
+    def count_of(self, sample: SampleGraph) -> int:
+        """
+        Get count for given sample, require scan over all chunks
+        :param sample: given sample
+        :return: count of given sample
+        """
+        for s, c in self.items():
+            if s == sample:
+                return c
+        raise AssertionError(f"[SpilledSampleSet.count_of] No sample {sample} in this sample set")
+
+    def filter_samples(self, p: Callable[[SampleGraph], bool]) -> 'SpilledSampleSet':
+        """
+        To filter samples with predicate, selected samples are spilled to new chunks next to this one,
+        which are removed together with returned sample set
+        :param p: predicate to filter one
+        :return: new spilled sample set without filtered out samples
+        """
+        builder = SpilledSampleSetBuilder(
+            self._components_provider, os.path.dirname(self.directory), self.memory_budget, self._table)
+        for s, c in self.items():
+            if p(s):
+                builder.add(s, c)
+        return builder.build()
+
+    def builder(self) -> SampleSetBuilder:
+        """
+        Load all samples in memory, in SampleSetBuilder
+        :return: SampleSetBuilder with all samples
+        """
+        ssb = SampleSetBuilder(self._components_provider)
+        for s, c in self.items():
+            ssb.add(s, c)
+        return ssb
+
+    def remove(self) -> None:
+        """
+        Delete all chunks files of this sample set, it should not be used after
+        :return: None
+        """
+        self._finalizer()
+        self._chunks = []
+
+
+class SpilledSampleSetBuilder:
+    """
+    Mutable builder which buffer encoded samples in memory and spill them to chunk file
+    each time buffer size exceeds memory budget. Samples should be unique, they counts are not summed.
+    """
+
+    def __init__(
+            self,
+            components_provider: SampleGraphComponentsProvider,
+            directory: str,
+            memory_budget: int = 64 * 1024 * 1024,
+            table: Optional[ComponentsTable] = None
+    ):
+        assert memory_budget > 0, \
+            f"[SpilledSampleSetBuilder.__init__] Memory budget should be > 0, got {memory_budget}"
+
+        self._components_provider: SampleGraphComponentsProvider = components_provider
+        self._directory: str = tempfile.mkdtemp(prefix="samples_", dir=directory)
+        self._finalizer: weakref.finalize = weakref.finalize(self, shutil.rmtree, self._directory, True)
+        self._memory_budget: int = memory_budget
+        self._table: ComponentsTable = table if table else ComponentsTable()
+        self._buffer: bytearray = bytearray()
+        self._chunks: List[str] = []
+        self._length: int = 0
+        self._number_of_samples: int = 0
+
+    def __repr__(self):
+        return f"SpilledSampleSetBuilder(length = {self._length}, number_of_chunks = {len(self._chunks)})"
+
+    def add(self, sample: SampleGraph, count: int) -> 'SpilledSampleSetBuilder':
+        """
+        Add sample to this sample set
+        :param sample: sample graph, should not be added previously
+        :param count: count of samples
+        :return: self
+        """
+        assert sample.is_compatible(self._components_provider), \
+            f"[SpilledSampleSetBuilder.add] Sample {sample} is incompatible with this sample set"
+
+        ids = self._table.encode(sample)
+        self._buffer += RECORD_HEADER.pack(count, len(ids))
+        self._buffer += ids.tobytes()
+        self._length += count
+        self._number_of_samples += 1
+
+        if len(self._buffer) >= self._memory_budget:
+            self._spill()
+        return self
+
+    def add_all(self, samples: Iterator[Tuple[SampleGraph, int]]) -> 'SpilledSampleSetBuilder':
+        """
+        To add all given samples
+        :param samples: Iterator[(SampleGraph, count)]
+        :return: self
+        """
+        for s, c in samples:
+            self.add(s, c)
+        return self
+
+    def _spill(self) -> None:
+        path = os.path.join(self._directory, f"chunk_{len(self._chunks)}.bin")
+        with open(path, "wb") as f:
+            f.write(self._buffer)
+        self._chunks.append(path)
+        self._buffer = bytearray()
+
+    def build(self) -> SpilledSampleSet:
+        """
+        Spill rest of buffered samples and build immutable spilled sample set
+        :return: spilled sample set
+        """
+        if self._buffer:
+            self._spill()
+        self._finalizer.detach()  # Directory is passed to sample set
+        return SpilledSampleSet(
+            self._components_provider,
+            self._table,
+            self._directory,
+            list(self._chunks),
+            self._length,
+            self._number_of_samples,
+            self._memory_budget)
@@ -0,0 +1,247 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+from typing import Dict, Any, Tuple, List, Set, Optional, Callable, TypeVar
+
+from .sample_graph import SampleGraph
+from .sample_set import SampleSet
+
+Table = TypeVar('Table', 'CountTable', 'MaxTable')
+
+
+class CountTable:
+    """
+    Immutable table of counts for assignments of values to variables, counts of outcomes
+    with same values (but different relations) are summed
+    """
+
+    def __init__(self, variables: Tuple[Any, ...], counts: Dict[Tuple[Any, ...], int]):
+        self.variables: Tuple[Any, ...] = variables
+        self.counts: Dict[Tuple[Any, ...], int] = counts
+
+    def __repr__(self):
+        return f"CountTable(variables = {self.variables}, number_of_assignments = {len(self.counts)})"
+
+    def __copy__(self):
+        raise AssertionError("[CountTable.__copy__] Count table should not be copied")
+
+    @staticmethod
+    def from_factor(factor: SampleSet) -> 'CountTable':
+        """
+        Build count table from outcomes of one factor
+        :param factor: not empty sample set where all outcomes have same variables
+        :return: new instance of count table
+        """
+        assert factor, f"[CountTable.from_factor] Factor should not be empty"
+
+        variables = tuple(next(iter(factor.samples())).included_variables)
+        counts: Dict[Tuple[Any, ...], int] = {}
+
+        for o, c in factor.items():
+            assert o.included_variables == set(variables), \
+                f"[CountTable.from_factor] All outcomes of factor should have same variables, " \
+                f"got {o.included_variables} and {variables}"
+            values = tuple(o.value_for_variable(var) for var in variables)
+            counts[values] = counts.get(values, 0) + c
+
+        return CountTable(variables, counts)
+
+    def product(self, other: 'CountTable') -> 'CountTable':
+        """
+        Multiply this table on other one, assignments are matched on shared variables
+        :param other: count table to multiply on
+        :return: new count table over union of variables
+        """
+        shared = [var for var in self.variables if var in other.variables]
+        other_shared_idx = [other.variables.index(var) for var in shared]
+        other_rest_idx = [i for i, var in enumerate(other.variables) if var not in shared]
+        self_shared_idx = [self.variables.index(var) for var in shared]
+
+        index: Dict[Tuple[Any, ...], List[Tuple[Tuple[Any, ...], int]]] = {}
+        for values, count in other.counts.items():
+            index.setdefault(tuple(values[i] for i in other_shared_idx), []) \
+                .append((tuple(values[i] for i in other_rest_idx), count))
+
+        counts: Dict[Tuple[Any, ...], int] = {}
+        for values, count in self.counts.items():
+            for rest, other_count in index.get(tuple(values[i] for i in self_shared_idx), []):
+                counts[values + rest] = count * other_count
+
+        return CountTable(self.variables + tuple(other.variables[i] for i in other_rest_idx), counts)
+
+    def sum_out(self, variable: Any) -> 'CountTable':
+        """
+        Sum counts over all values of given variable
+        :param variable: variable to remove from table
+        :return: new count table without given variable
+        """
+        i = self.variables.index(variable)
+        counts: Dict[Tuple[Any, ...], int] = {}
+
+        for values, count in self.counts.items():
+            rest = values[:i] + values[i + 1:]
+            counts[rest] = counts.get(rest, 0) + count
+
+        return CountTable(self.variables[:i] + self.variables[i + 1:], counts)
+
+
+class MaxTable:
+    """
+    Immutable table of max counts for assignments of values to variables, each count kept together with
+    outcomes which product give it (traceback of max-product), so best outcome is selected among
+    outcomes with same values (but different relations)
+    """
+
+    def __init__(self, variables: Tuple[Any, ...], entries: Dict[Tuple[Any, ...], Tuple[int, Tuple[SampleGraph, ...]]]):
+        self.variables: Tuple[Any, ...] = variables
+        self.entries: Dict[Tuple[Any, ...], Tuple[int, Tuple[SampleGraph, ...]]] = entries
+
+    def __repr__(self):
+        return f"MaxTable(variables = {self.variables}, number_of_assignments = {len(self.entries)})"
+
+    def __copy__(self):
+        raise AssertionError("[MaxTable.__copy__] Max table should not be copied")
+
+    @staticmethod
+    def from_factor(factor: SampleSet) -> 'MaxTable':
+        """
+        Build max table from outcomes of one factor
+        :param factor: not empty sample set where all outcomes have same variables
+        :return: new instance of max table
+        """
+        assert factor, f"[MaxTable.from_factor] Factor should not be empty"
+
+        variables = tuple(next(iter(factor.samples())).included_variables)
+        entries: Dict[Tuple[Any, ...], Tuple[int, Tuple[SampleGraph, ...]]] = {}
+
+        for o, c in factor.items():
+            assert o.included_variables == set(variables), \
+                f"[MaxTable.from_factor] All outcomes of factor should have same variables, " \
+                f"got {o.included_variables} and {variables}"
+            values = tuple(o.value_for_variable(var) for var in variables)
+            if values not in entries or entries[values][0] < c:
+                entries[values] = (c, (o,))
+
+        return MaxTable(variables, entries)
+
+    def product(self, other: 'MaxTable') -> 'MaxTable':
+        """
+        Multiply this table on other one, assignments are matched on shared variables
+        :param other: max table to multiply on
+        :return: new max table over union of variables
+        """
+        shared = [var for var in self.variables if var in other.variables]
+        other_shared_idx = [other.variables.index(var) for var in shared]
+        other_rest_idx = [i for i, var in enumerate(other.variables) if var not in shared]
+        self_shared_idx = [self.variables.index(var) for var in shared]
+
+        index: Dict[Tuple[Any, ...], List[Tuple[Tuple[Any, ...], Tuple[int, Tuple[SampleGraph, ...]]]]] = {}
+        for values, entry in other.entries.items():
+            index.setdefault(tuple(values[i] for i in other_shared_idx), []) \
+                .append((tuple(values[i] for i in other_rest_idx), entry))
+
+        entries: Dict[Tuple[Any, ...], Tuple[int, Tuple[SampleGraph, ...]]] = {}
+        for values, (count, outcomes) in self.entries.items():
+            for rest, (other_count, other_outcomes) in index.get(tuple(values[i] for i in self_shared_idx), []):
+                entries[values + rest] = (count * other_count, outcomes + other_outcomes)
+
+        return MaxTable(self.variables + tuple(other.variables[i] for i in other_rest_idx), entries)
+
+    def max_out(self, variable: Any) -> 'MaxTable':
+        """
+        Maximize counts over all values of given variable, outcomes of max assignment are kept
+        :param variable: variable to remove from table
+        :return: new max table without given variable
+        """
+        i = self.variables.index(variable)
+        entries: Dict[Tuple[Any, ...], Tuple[int, Tuple[SampleGraph, ...]]] = {}
+
+        for values, entry in self.entries.items():
+            rest = values[:i] + values[i + 1:]
+            if rest not in entries or entries[rest][0] < entry[0]:
+                entries[rest] = entry
+
+        return MaxTable(self.variables[:i] + self.variables[i + 1:], entries)
+
+
+def _multiply_all(tables: List[Table]) -> Table:
+    acc = tables[0]
+    for table in tables[1:]:
+        acc = acc.product(table)
+    return acc
+
+
+def _eliminate(tables: List[Table], keep: Set[Any], out: Callable[[Table, Any], Table], unit: Table) -> Table:
+    """
+    Eliminate all variables except kept from product of tables. Next variable to eliminate
+    is one which produce the smallest table scope (greedy min-size order).
+    :param tables: tables of factors
+    :param keep: variables to not eliminate
+    :param out: function to remove variable from table (sum out or max out)
+    :param unit: table with empty scope, returned when there is no tables
+    :return: table over kept variables
+    """
+    tables = list(tables)
+    to_eliminate = {var for t in tables for var in t.variables if var not in keep}
+
+    while to_eliminate:
+        var = min(
+            to_eliminate,
+            key=lambda v: len({u for t in tables if v in t.variables for u in t.variables}))
+        related = [t for t in tables if var in t.variables]
+        tables = [t for t in tables if var not in t.variables]
+        tables.append(out(_multiply_all(related), var))
+        to_eliminate.remove(var)
+
+    return _multiply_all(tables) if tables else unit
+
+
+def eliminate(tables: List[CountTable], keep: Set[Any]) -> CountTable:
+    """
+    Sum out all variables except kept from product of tables. Next variable to eliminate
+    is one which produce the smallest table scope (greedy min-size order).
+    :param tables: count tables of factors
+    :param keep: variables to not eliminate
+    :return: count table over kept variables
+    """
+    return _eliminate(tables, keep, CountTable.sum_out, CountTable((), {(): 1}))
+
+
+def max_product(tables: List[MaxTable]) -> Optional[Tuple[int, Tuple[SampleGraph, ...]]]:
+    """
+    Find assignment of all variables with max product of counts, by max-product variable elimination
+    :param tables: max tables of factors
+    :return: (max count, outcomes of factors which join give max assignment) or None if factors
+             have no assignment with matching values
+    """
+    table = _eliminate(tables, set({}), MaxTable.max_out, MaxTable((), {(): (1, ())}))
+    return table.entries.get(())
+
+
+def marginal_counts(tables: List[CountTable], variable: Any) -> Dict[Any, int]:
+    """
+    Count marginal distribution of given variable over joined distribution of tables
+    :param tables: count tables of factors
+    :param variable: variable to marginalize
+    :return: Dict[value, count], values with zero count are not included
+    """
+    table = eliminate(tables, {variable})
+    i = table.variables.index(variable)
+    return {values[i]: count for values, count in table.counts.items() if count > 0}
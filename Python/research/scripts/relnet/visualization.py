@@ -0,0 +1,53 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+from typing import Any
+
+PYVIS_REQUIRED = "pyvis is required for visualization, install it with 'pip install pyvis' or use OutcomesRenderer"
+
+
+def new_network(height: str, width: str) -> Any:
+    """
+    Create pyvis Network. Pyvis (and jinja, IPython which it loads) is imported on first call only,
+    so modules with visualize methods do not pay its import time and pyvis may be not installed.
+    :param height: window height
+    :param width: window width
+    :return: new pyvis.network.Network
+    """
+    try:
+        from pyvis.network import Network
+    except ImportError as e:
+        raise ImportError(f"[new_network] {PYVIS_REQUIRED}") from e
+
+    return Network(height=height, width=width)
+
+
+def show_network(net: Any, file_name: str, show: bool) -> None:
+    """
+    Write network to HTML file and optionally show it in browser
+    :param net: pyvis Network
+    :param file_name: name of HTML file without extension
+    :param show: if False then HTML file will be only written (headless mode), without opening in browser
+    :return: None
+    """
+    if show:
+        net.show(f"{file_name}.html")
+    else:
+        net.write_html(f"{file_name}.html")
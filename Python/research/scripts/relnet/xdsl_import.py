@@ -0,0 +1,143 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+from itertools import product
+from math import prod
+from typing import Dict, Any, List, Optional, Tuple, Callable, Iterator
+from xml.etree import ElementTree
+
+from .graph_components import DirectedRelation
+from .records import View
+from .relation_graph import RelationGraphBuilder
+
+XDSL_SUPPORTED_NODES = {"cpt", "deterministic"}
+XDSL_UNSUPPORTED_NODES = {"noisymax", "noisyadder", "equation", "decision", "utility", "mau", "list", "cast"}
+
+
+def _iter_nodes(path: str) -> Iterator[Tuple[Optional[str], ElementTree.Element]]:
+    """
+    Stream node elements of XDSL file, each element is released after it was processed,
+    so memory is bounded by size of single node rather than of whole network.
+    Nodes of submodels are streamed as well, extensions (GeNIe layout) are skipped.
+    :param path: path to .xdsl file
+    :return: Iterator[(network ID, cpt or deterministic element)]
+    """
+    network_id: Optional[str] = None
+    containers: List[ElementTree.Element] = []  # Opened <nodes> and <submodel> elements
+
+    for event, element in ElementTree.iterparse(path, events=("start", "end")):
+        if event == "start":
+            if element.tag == "smile":
+                network_id = element.get("id")
+            elif element.tag in ("nodes", "submodel"):
+                containers.append(element)
+        elif element.tag in ("nodes", "submodel"):
+            containers.pop()
+            element.clear()
+        elif containers and element.tag in XDSL_SUPPORTED_NODES:
+            yield network_id, element
+            containers[-1].clear()
+        elif containers and element.tag in XDSL_UNSUPPORTED_NODES:
+            raise AssertionError(
+                f"[read_xdsl] Node {element.get('id')} of type '{element.tag}' is not supported, "
+                f"only {XDSL_SUPPORTED_NODES} nodes can be imported")
+        elif element.tag == "extensions":
+            element.clear()
+
+
+def _node_probabilities(element: ElementTree.Element, number_of_entries: int) -> List[float]:
+    """
+    Read CPT of node, in XDSL order: parents configurations in row major order, node states vary fastest.
+    Deterministic node is converted to CPT with probability 1 of resulting state.
+    :param element: cpt or deterministic element
+    :param number_of_entries: expected size of CPT
+    :return: List[probability]
+    """
+    var = element.get("id")
+
+    if element.tag == "deterministic":
+        states = [s.get("id") for s in element.iterfind("state")]
+        probabilities = [
+            1.0 if s == r else 0.0 for r in (element.findtext("resultingstates") or "").split() for s in states]
+    else:
+        probabilities = [float(p) for p in (element.findtext("probabilities") or "").split()]
+
+    assert len(probabilities) == number_of_entries, \
+        f"[read_xdsl] Expect {number_of_entries} probabilities for node {var}, got {len(probabilities)}"
+    return probabilities
+
+
+def read_xdsl(
+        path: str,
+        scale: float = 100,
+        relation: Any = "r",
+        name: Optional[str] = None,
+        value_name: Optional[Callable[[Any, Any], Any]] = None,
+        tolerance: float = 1e-6
+) -> RelationGraphBuilder:
+    """
+    Read GeNIe .xdsl network in to relation graph builder, in same form as Bayes network comparing experiment:
+    root node CPT give single node outcomes, CPT with parents give star outcomes with directed edges
+    from parents to node. Outcome count is probability multiplied by scale, zero probabilities are skipped.
+    File is parsed with iterparse in two passes: first collect states of all nodes (to create components provider),
+    second stream CPTs in to outcomes, so XML tree is never loaded in to memory.
+    Supported cpt and deterministic nodes, other node types raise error.
+    :param path: path to .xdsl file
+    :param scale: multiplier which convert probabilities to counts, all scaled probabilities should be integer
+    :param relation: relation of edges, will be wrapped in DirectedRelation(parent, node, relation)
+    :param name: optional name of relation graph, by default ID of network
+    :param value_name: optional function (node ID, state ID) -> value of variable node, by default state ID
+    :param tolerance: max absolute rounding error of scaled probability
+    :return: new RelationGraphBuilder with outcomes of network
+    """
+    network_id: Optional[str] = None
+    names: Dict[Any, List[Any]] = {}
+
+    for network_id, element in _iter_nodes(path):
+        var = element.get("id")
+        assert var not in names, f"[read_xdsl] Duplicate node {var}"
+        states = [s.get("id") for s in element.iterfind("state")]
+        assert states, f"[read_xdsl] Node {var} should have at least one state"
+        names[var] = [value_name(var, s) for s in states] if value_name else states
+
+    assert names, f"[read_xdsl] File {path} contains no nodes"
+
+    def records() -> Iterator[Tuple[View, int]]:
+        for _, node in _iter_nodes(path):
+            var = node.get("id")
+            parents = (node.findtext("parents") or "").split()
+            for p_var in parents:
+                assert p_var in names, f"[read_xdsl] Unknown parent {p_var} of node {var}"
+            values = names[var]
+            probabilities = _node_probabilities(node, len(values) * prod(len(names[p]) for p in parents))
+
+            for i, p_values in enumerate(product(*[names[p] for p in parents])):
+                for val, probability in zip(values, probabilities[i * len(values):(i + 1) * len(values)]):
+                    count = round(probability * scale)
+                    assert abs(probability * scale - count) <= tolerance, \
+                        f"[read_xdsl] Scaled probability {probability} of node {var} should be integer, " \
+                        f"select correct scale"
+                    if count:
+                        yield (frozenset({
+                            (frozenset({(p_var, p_val), (var, val)}), DirectedRelation(p_var, var, relation))
+                            for p_var, p_val in zip(parents, p_values)}) if parents else (var, val)), count
+
+    return RelationGraphBuilder({var: set(vs) for var, vs in names.items()}, {relation}, name or network_id) \
+        .add_outcomes_from_records(records(), validate_connectivity=False)
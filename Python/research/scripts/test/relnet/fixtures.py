@@ -0,0 +1,112 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+from typing import List, Tuple
+
+from scripts.relnet.graph_components import SampleGraphComponentsProvider
+from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.relnet.sample_set import SampleSet, SampleSetBuilder
+from scripts.test.relnet.test_graph_components import MockSampleGraphComponentsProvider
+
+# Shared factors of a, b, c and d variables, and expected joint of them, for tests of joining and inference
+
+
+def sample_set(
+        bcp_join: SampleGraphComponentsProvider, desc: List[Tuple[List[Tuple[str, str, str, str]], int]]
+) -> SampleSet:
+    ssb = SampleSetBuilder(bcp_join)
+    for sample_edges, count in desc:
+        sb = SampleGraphBuilder(bcp_join)
+        for s_var, s_val, t_var, t_val in sample_edges:
+            sb.add_relation({(s_var, s_val), (t_var, t_val)}, "r")
+        ssb.add(sb.build(), count)
+    return ssb.build()
+
+
+bcp_join = MockSampleGraphComponentsProvider(
+    {"a": {"T", "F"}, "b": {"T", "F"}, "c": {"T", "F"}, "d": {"T", "F"}}, {"r", "s"})
+
+ab_samples = sample_set(bcp_join, [
+    ([("a", "T", "b", "T")], 2),
+    ([("a", "T", "b", "F")], 3),
+    ([("a", "F", "b", "T")], 4),
+    ([("a", "F", "b", "F")], 5)])
+
+bc_samples = sample_set(bcp_join, [
+    ([("b", "T", "c", "T")], 6),
+    ([("b", "T", "c", "F")], 7),
+    ([("b", "F", "c", "T")], 8),
+    ([("b", "F", "c", "F")], 9)])
+
+ca_samples = sample_set(bcp_join, [
+    ([("c", "T", "a", "T")], 10),
+    ([("c", "T", "a", "F")], 11),
+    ([("c", "F", "a", "T")], 12),
+    ([("c", "F", "a", "F")], 13)])
+
+bd_samples = sample_set(bcp_join, [
+    ([("b", "T", "d", "T")], 14),
+    ([("b", "T", "d", "F")], 15),
+    ([("b", "F", "d", "T")], 16),
+    ([("b", "F", "d", "F")], 17)])
+
+expected_ab_bc_joint_b = sample_set(bcp_join, [
+    ([("a", "T", "b", "T"), ("b", "T", "c", "T")], 2 * 6),
+    ([("a", "T", "b", "T"), ("b", "T", "c", "F")], 2 * 7),
+    ([("a", "T", "b", "F"), ("b", "F", "c", "T")], 3 * 8),
+    ([("a", "T", "b", "F"), ("b", "F", "c", "F")], 3 * 9),
+    ([("a", "F", "b", "T"), ("b", "T", "c", "T")], 4 * 6),
+    ([("a", "F", "b", "T"), ("b", "T", "c", "F")], 4 * 7),
+    ([("a", "F", "b", "F"), ("b", "F", "c", "T")], 5 * 8),
+    ([("a", "F", "b", "F"), ("b", "F", "c", "F")], 5 * 9)])
+
+expected_ab_bc_ca_joint_abc = sample_set(bcp_join, [  # Triangle
+    ([("a", "T", "b", "T"), ("b", "T", "c", "T"), ("c", "T", "a", "T")], 2 * 6 * 10),
+    ([("a", "T", "b", "T"), ("b", "T", "c", "F"), ("c", "F", "a", "T")], 2 * 7 * 12),
+    ([("a", "T", "b", "F"), ("b", "F", "c", "T"), ("c", "T", "a", "T")], 3 * 8 * 10),
+    ([("a", "T", "b", "F"), ("b", "F", "c", "F"), ("c", "F", "a", "T")], 3 * 9 * 12),
+    ([("a", "F", "b", "T"), ("b", "T", "c", "T"), ("c", "T", "a", "F")], 4 * 6 * 11),
+    ([("a", "F", "b", "T"), ("b", "T", "c", "F"), ("c", "F", "a", "F")], 4 * 7 * 13),
+    ([("a", "F", "b", "F"), ("b", "F", "c", "T"), ("c", "T", "a", "F")], 5 * 8 * 11),
+    ([("a", "F", "b", "F"), ("b", "F", "c", "F"), ("c", "F", "a", "F")], 5 * 9 * 13)])
+
+expected_ab_bc_bd_joint_abc = sample_set(bcp_join, [  # Star
+    ([("a", "T", "b", "T"), ("b", "T", "c", "T"), ("b", "T", "d", "T")], 2 * 6 * 14),
+    ([("a", "T", "b", "T"), ("b", "T", "c", "T"), ("b", "T", "d", "F")], 2 * 6 * 15),
+    ([("a", "T", "b", "T"), ("b", "T", "c", "F"), ("b", "T", "d", "T")], 2 * 7 * 14),
+    ([("a", "T", "b", "T"), ("b", "T", "c", "F"), ("b", "T", "d", "F")], 2 * 7 * 15),
+    ([("a", "T", "b", "F"), ("b", "F", "c", "T"), ("b", "F", "d", "T")], 3 * 8 * 16),
+    ([("a", "T", "b", "F"), ("b", "F", "c", "T"), ("b", "F", "d", "F")], 3 * 8 * 17),
+    ([("a", "T", "b", "F"), ("b", "F", "c", "F"), ("b", "F", "d", "T")], 3 * 9 * 16),
+    ([("a", "T", "b", "F"), ("b", "F", "c", "F"), ("b", "F", "d", "F")], 3 * 9 * 17),
+    ([("a", "F", "b", "T"), ("b", "T", "c", "T"), ("b", "T", "d", "T")], 4 * 6 * 14),
+    ([("a", "F", "b", "T"), ("b", "T", "c", "T"), ("b", "T", "d", "F")], 4 * 6 * 15),
+    ([("a", "F", "b", "T"), ("b", "T", "c", "F"), ("b", "T", "d", "T")], 4 * 7 * 14),
+    ([("a", "F", "b", "T"), ("b", "T", "c", "F"), ("b", "T", "d", "F")], 4 * 7 * 15),
+    ([("a", "F", "b", "F"), ("b", "F", "c", "T"), ("b", "F", "d", "T")], 5 * 8 * 16),
+    ([("a", "F", "b", "F"), ("b", "F", "c", "T"), ("b", "F", "d", "F")], 5 * 8 * 17),
+    ([("a", "F", "b", "F"), ("b", "F", "c", "F"), ("b", "F", "d", "T")], 5 * 9 * 16),
+    ([("a", "F", "b", "F"), ("b", "F", "c", "F"), ("b", "F", "d", "F")], 5 * 9 * 17)])
+
+ab_bc_samples = ab_samples.union(bc_samples)
+ab_bc_bd_samples = ab_bc_samples.union(bd_samples)
+
+bcp_other = MockSampleGraphComponentsProvider({"a": {"1"}}, {"r"})  # To build samples incompatible with bcp_join
+incompatible_sample = SampleGraphBuilder(bcp_other).build_single_node("a", "1")
@@ -0,0 +1,160 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import random
+import subprocess
+import sys
+import unittest
+from copy import copy
+from unittest import mock
+
+from scripts.relnet.approximate_inference import AliasSampler, MarginalEstimate, ApproximateInference
+from scripts.relnet.graph_components import BuilderComponentsProvider
+from scripts.relnet.relation_graph import RelationGraph
+from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.relnet.sample_set import SampleSetBuilder
+from scripts.test.relnet import fixtures
+
+
+class TestApproximateInference(unittest.TestCase):
+
+    bcp = fixtures.bcp_join
+    joined = RelationGraph(bcp, "ab_bc_bd", fixtures.ab_bc_bd_samples).make_joined()
+
+    def assert_close_to_exact(self, evidence, tolerance):
+        exact = self.joined.conditional_graph(evidence).marginal_variables_probability() \
+            if evidence is not None else self.joined.marginal_variables_probability()
+        estimated = self.joined.approximate_query(evidence=evidence, max_samples=20000, seed=1)
+
+        self.assertEqual(
+            {v for v, vs in exact.items() if any(vs.values())},
+            set(estimated.keys()))
+        for var, values in estimated.items():
+            for val, estimate in values.items():
+                self.assertAlmostEqual(estimate.probability, exact[var][val], delta=tolerance)
+                self.assertLessEqual(estimate.lower, estimate.probability)
+                self.assertGreaterEqual(estimate.upper, estimate.probability)
+
+    def test_alias_sampler(self):
+        weights = [1, 0, 3, 6]
+        sampler = AliasSampler(weights)
+        rnd = random.Random(1)
+        drawn = [0] * len(weights)
+        for _ in range(20000):
+            drawn[sampler.draw(rnd)] += 1
+
+        self.assertEqual(drawn[1], 0)
+        for i, w in enumerate(weights):
+            self.assertAlmostEqual(drawn[i] / 20000, w / 10, delta=0.02)
+
+        with self.assertRaises(AssertionError):
+            AliasSampler([])
+        with self.assertRaises(AssertionError):
+            AliasSampler([0, 0])
+        with self.assertRaises(AssertionError):
+            AliasSampler([1, -1])
+
+    def test_marginal_estimate(self):
+        estimate = MarginalEstimate(30, 100, 1.96)
+        self.assertEqual(estimate.probability, 0.3)
+        self.assertEqual(estimate.number_of_samples, 100)
+        self.assertAlmostEqual(estimate.lower, 0.219, places=3)
+        self.assertAlmostEqual(estimate.upper, 0.396, places=3)
+        self.assertAlmostEqual(estimate.half_width(), (estimate.upper - estimate.lower) / 2)
+        self.assertEqual(str(estimate), "0.3000[0.2189, 0.3959]")
+
+        self.assertEqual(MarginalEstimate(0, 10, 1.96).lower, 0.0)
+        self.assertEqual(MarginalEstimate(10, 10, 1.96).upper, 1.0)
+        self.assertGreater(MarginalEstimate(3000, 10000, 1.96).half_width(), 0.0)
+        self.assertLess(MarginalEstimate(3000, 10000, 1.96).half_width(), estimate.half_width())
+
+    def test_init(self):
+        inference = ApproximateInference(self.joined.outcomes)
+        self.assertEqual(str(inference), "ApproximateInference(number_of_outcomes = 16)")
+
+        with self.assertRaises(AssertionError):
+            copy(inference)
+        with self.assertRaises(AssertionError):
+            inference.marginals(lambda _: True, max_samples=0)
+        with self.assertRaises(AssertionError):
+            inference.marginals(lambda _: True, confidence=1.0)
+
+    def test_approximate_query_without_evidence(self):
+        self.assert_close_to_exact(None, 0.02)
+
+    def test_approximate_query_with_evidence(self):
+        self.assert_close_to_exact(SampleGraphBuilder(self.bcp).build_single_node("b", "T"), 0.02)
+        self.assert_close_to_exact(
+            SampleGraphBuilder(self.bcp).add_relation({("a", "T"), ("b", "T")}, "r").build(), 0.02)
+
+    def test_approximate_query_variables(self):
+        estimated = self.joined.approximate_query(variables={"a", "c"}, max_samples=1000, seed=1)
+        self.assertEqual(set(estimated.keys()), {"a", "c"})
+
+    def test_approximate_query_is_reproducible(self):
+        evidence = SampleGraphBuilder(self.bcp).build_single_node("b", "T")
+
+        def probabilities(seed):
+            return {
+                var: {val: e.probability for val, e in values.items()}
+                for var, values in
+                self.joined.approximate_query(evidence=evidence, max_samples=1000, seed=seed).items()}
+
+        self.assertEqual(probabilities(7), probabilities(7))
+
+        code = \
+            "from scripts.test.relnet.test_approximate_inference import TestApproximateInference as T; " \
+            "print(sorted((v, e.probability) " \
+            "for v, es in T.joined.approximate_query(max_samples=500, seed=3).items() for e in es.values()))"
+        outputs = {
+            subprocess.run([sys.executable, "-c", code], env={"PYTHONHASHSEED": seed},
+                           capture_output=True, text=True, check=True).stdout
+            for seed in ["1", "2"]}
+        self.assertEqual(len(outputs), 1)  # Same draws in any process
+
+    def test_outcomes_ordered_only_for_seed(self):
+        inference = ApproximateInference(self.joined.outcomes)
+        with mock.patch("scripts.relnet.sample_graph.SampleGraph.fingerprint", side_effect=AssertionError):
+            inference.marginals(lambda _: True, max_samples=100)
+        inference.marginals(lambda _: True, max_samples=100, seed=1)
+        with mock.patch("scripts.relnet.sample_graph.SampleGraph.fingerprint", side_effect=AssertionError):
+            inference.marginals(lambda _: True, max_samples=100, seed=2)  # Ordered once
+
+    def test_approximate_query_stops_on_precision(self):
+        estimated = self.joined.approximate_query(max_samples=1000000, precision=0.05, seed=1)
+        for values in estimated.values():
+            for estimate in values.values():
+                self.assertLessEqual(estimate.half_width(), 0.05)
+                self.assertLess(estimate.number_of_samples, 1000000)
+
+    def test_approximate_query_stops_on_time(self):
+        estimated = self.joined.approximate_query(max_samples=10 ** 9, max_time=0.0, seed=1)
+        for values in estimated.values():
+            for estimate in values.values():
+                self.assertLessEqual(estimate.number_of_samples, 256)
+
+    def test_approximate_query_of_empty_graph(self):
+        empty = RelationGraph(self.bcp, "empty", SampleSetBuilder(self.bcp).empty())
+        self.assertEqual(empty.approximate_query(), {})
+
+    def test_approximate_query_incompatible_evidence(self):
+        other_bcp = BuilderComponentsProvider({"a": {"T", "F"}}, {"r"})
+        with self.assertRaises(AssertionError):
+            self.joined.approximate_query(evidence=SampleGraphBuilder(other_bcp).build_single_node("a", "T"))
@@ -0,0 +1,107 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import unittest
+
+from scripts.relnet.conditional_graph import ConditionalGraph
+from scripts.relnet.relation_graph import BuilderComponentsProvider, RelationGraph
+from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.relnet.sample_set import SampleSet
+from scripts.test.relnet import fixtures
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestBatchedActivation(unittest.TestCase):
+
+    bcp = BuilderComponentsProvider({"a": {"1", "2"}, "b": {"2", "3"}, "c": {"3", "4"}, "d": {"4", "5"}}, {"r", "s"})
+    s_1 = SampleGraphBuilder(bcp).build_single_node("a", "1")
+    s_2 = SampleGraphBuilder(bcp).add_relation({("a", "1"), ("b", "2")}, "r").build()
+    s_3 = SampleGraphBuilder(bcp) \
+        .add_relation({("a", "1"), ("b", "2")}, "r") \
+        .add_relation({("b", "2"), ("c", "3")}, "s") \
+        .build()
+    s_4 = SampleGraphBuilder(bcp) \
+        .add_relation({("a", "1"), ("b", "2")}, "r") \
+        .add_relation({("b", "2"), ("c", "3")}, "s") \
+        .add_relation({("c", "3"), ("d", "4")}, "r") \
+        .build()
+    s_5 = SampleGraphBuilder(bcp) \
+        .add_relation({("a", "1"), ("b", "2")}, "r") \
+        .add_relation({("a", "1"), ("c", "3")}, "s") \
+        .add_relation({("b", "2"), ("c", "3")}, "r") \
+        .add_relation({("b", "2"), ("d", "4")}, "s") \
+        .build()
+
+    def assert_same_activation(self, cg, relation_filter=None):
+        expected = cg.activation_graph(relation_filter, "ag")
+        actual = cg.activation_graph(relation_filter, "ag", batched=True)
+        expected_nodes = {n.variable: n for n in expected.nodes}
+
+        self.assertEqual(actual.name, "ag")
+        self.assertEqual(actual.number_of_outcomes, expected.number_of_outcomes)
+        self.assertEqual(actual.edges, expected.edges)
+        self.assertEqual({n.variable for n in actual.nodes}, expected_nodes.keys())
+
+        for node in actual.nodes:
+            self.assertEqual(node.in_query, expected_nodes[node.variable].in_query)
+            expected_values = dict(expected_nodes[node.variable].values)
+            self.assertEqual(dict(node.values).keys(), expected_values.keys())
+            for value, weight in node.values:
+                self.assertAlmostEqual(weight, expected_values[value])
+
+    def test_chain_outcomes(self):
+        outcomes = SampleSet(self.bcp, {self.s_1: 1, self.s_2: 2, self.s_3: 3, self.s_4: 4})
+
+        for evidence in [self.s_1, self.s_2, self.s_3, self.s_4]:
+            cg = ConditionalGraph(self.bcp, evidence, "cg", outcomes.filter_samples(lambda s: evidence.is_subgraph(s)))
+            for relation_filter in [None, {"r"}, {"s"}]:
+                self.assert_same_activation(cg, relation_filter)
+
+    def test_outcomes_with_cycle(self):
+        outcomes = SampleSet(self.bcp, {self.s_1: 1, self.s_2: 2, self.s_5: 5})
+
+        for relation_filter in [None, {"r"}, {"s"}]:
+            self.assert_same_activation(ConditionalGraph(self.bcp, self.s_1, "cg", outcomes), relation_filter)
+
+    def test_conditioned_joined_graph(self):
+        joined = RelationGraph(fixtures.bcp_join, "ab_bc_bd", fixtures.ab_bc_bd_samples).make_joined()
+        evidences = [
+            SampleGraphBuilder(fixtures.bcp_join).build_single_node("b", "T"),
+            SampleGraphBuilder(fixtures.bcp_join).add_relation({("a", "T"), ("b", "F")}, "r").build()]
+
+        for evidence in evidences:
+            self.assert_same_activation(joined.conditional_graph(evidence))
+            self.assert_same_activation(joined.conditional_graph(evidence, view=True), {"s"})
+
+    def test_conflicting_variable(self):
+        s_a_2 = SampleGraphBuilder(self.bcp).add_relation({("a", "2"), ("b", "2")}, "r").build()
+        cg = ConditionalGraph(self.bcp, self.s_2, "cg", SampleSet(self.bcp, {self.s_3: 1, s_a_2: 1}))
+
+        with self.assertRaises(AssertionError):
+            cg.activation_graph(batched=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
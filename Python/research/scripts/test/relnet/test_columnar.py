@@ -0,0 +1,146 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+
+from scripts.relnet.columnar import ColumnarWriter, ColumnarReader, NULL_CODE, write_outcomes, \
+    write_folded_graph, write_activation_graph, read_outcomes, read_relation_graph_builder, record_batches
+from scripts.relnet.graph_components import DirectedRelation
+from scripts.relnet.relation_graph import RelationGraph, RelationGraphBuilder
+from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.test.relnet import fixtures
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestColumnar(unittest.TestCase):
+
+    bcp = fixtures.bcp_join
+    rg = RelationGraph(bcp, "ab_bc", fixtures.ab_bc_samples)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "table.zip")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_writer_reader(self):
+        writer = ColumnarWriter(self.path, "test", chunk_size=2)
+        writer.add_table("t", {"variable": "i", "count": "q"})
+        for var, count in [("a", 1), ("b", 2), ("a", 3)]:
+            writer.append("t", (writer.code("variables", var), count))
+        writer.append("t", (NULL_CODE, 4))
+        writer.close({"key": "value"})
+
+        reader = ColumnarReader(self.path)
+        self.assertEqual(reader.kind, "test")
+        self.assertEqual(reader.metadata, {"key": "value"})
+        self.assertEqual(reader.tables["t"]["number_of_chunks"], 2)
+        self.assertEqual(reader.tables["t"]["number_of_rows"], 4)
+        chunks = list(reader.chunks("t"))
+        self.assertEqual([c["count"].tolist() for c in chunks], [[1, 2], [3, 4]])
+        self.assertEqual(reader.decode("variable", chunks[1]["variable"]).tolist(), ["a", None])
+        reader.close()
+
+    def test_outcomes_round_trip(self):
+        rgb = RelationGraphBuilder({"a": {1, 2}, "b": {"x", "y"}}, {"r"})
+        rgb.add_outcome(rgb.sample_builder().build_single_node("a", 1), 5)
+        rgb.add_outcome(rgb.sample_builder().add_relation({("a", 2), ("b", "y")}, DirectedRelation("a", "b", "r"))
+                        .build(), 7)
+        rgb.add_outcome(rgb.sample_builder().add_relation({("a", 1), ("b", "x")}, "r").build(), 2)
+        graphs = [self.rg, rgb.build()]
+
+        for graph in graphs:
+            write_outcomes(graph.outcomes, self.path, chunk_size=3)
+            expected = {(o.edges_set_view(), c) for o, c in graph.outcomes.items()}
+            self.assertEqual(set(read_outcomes(self.path)), expected)
+
+            rebuilt = read_relation_graph_builder(self.path, name="rebuilt").build()
+            self.assertEqual(rebuilt.name, "rebuilt")
+            self.assertEqual(rebuilt.variables, graph.variables)
+            self.assertEqual(rebuilt.relations, graph.relations)
+            self.assertEqual({(o.edges_set_view(), c) for o, c in rebuilt.outcomes.items()}, expected)
+
+        reader = ColumnarReader(self.path)
+        self.assertEqual(reader.tables["outcomes"]["number_of_rows"], 3)
+        reader.close()
+
+        with zipfile.ZipFile(self.path) as f:  # Dictionaries are plain JSON, readable outside of Python
+            dictionaries = json.loads(f.read("dictionaries.json"))["dictionaries"]
+        self.assertEqual(sorted(dictionaries["values"], key=str), [1, 2, "x", "y"])
+        self.assertIn({"directed": ["a", "b", "r"]}, dictionaries["relations"])
+
+    def test_write_folded_graph(self):
+        folded = self.rg.folded_graph()
+        write_folded_graph(folded, self.path)
+
+        reader = ColumnarReader(self.path)
+        self.assertEqual(reader.kind, "folded_graph")
+        nodes = next(reader.chunks("nodes"))
+        self.assertEqual(
+            set(zip(reader.decode("variable", nodes["variable"]), reader.decode("value", nodes["value"]),
+                    nodes["count"].tolist())),
+            {(n.variable, n.value, c) for fn in folded.nodes for n, c in fn.value_nodes})
+        edges = next(reader.chunks("edges"))
+        self.assertEqual(sum(edges["count"]), sum(c for e in folded.edges for _, c in e.relation_edges))
+        self.assertEqual(set(reader.decode("relation", edges["relation"])), {"r"})
+        reader.close()
+
+    def test_write_activation_graph(self):
+        evidence = SampleGraphBuilder(self.bcp).build_single_node("b", "T")
+        activation = self.rg.conditional_graph(evidence).activation_graph()
+        write_activation_graph(activation, self.path)
+
+        reader = ColumnarReader(self.path)
+        self.assertEqual(reader.metadata["number_of_outcomes"], activation.number_of_outcomes)
+        nodes = next(reader.chunks("nodes"))
+        self.assertEqual(
+            {(v, val, w, bool(q)) for v, val, w, q in zip(
+                reader.decode("variable", nodes["variable"]), reader.decode("value", nodes["value"]),
+                nodes["weight"].tolist(), nodes["in_query"].tolist())},
+            {(n.variable, val, w, n.in_query) for n in activation.nodes for val, w in n.values})
+        edges = next(reader.chunks("edges"))
+        self.assertEqual(
+            {(frozenset({a, b}), r, c, bool(q)) for a, b, r, c, q in zip(
+                reader.decode("variable_a", edges["variable_a"]), reader.decode("variable_b", edges["variable_b"]),
+                reader.decode("relation", edges["relation"]), edges["count"].tolist(), edges["in_query"].tolist())},
+            {(e.endpoints, r, c, e.in_query) for e in activation.edges for r, c in e.relations})
+        reader.close()
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_record_batches(self):
+        write_outcomes(self.rg.outcomes, self.path, chunk_size=5)
+        batches = list(record_batches(self.path, "outcomes"))
+        self.assertEqual([b.num_rows for b in batches], [5, 3])
+        reader = ColumnarReader(self.path)
+        self.assertEqual(batches[0].schema.names, list(reader.tables["outcomes"]["columns"]))
+        reader.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -22,8 +22,9 @@ import unittest
 
 from scripts.relnet.activation_graph import ActiveNode, ActiveEdge
 from scripts.relnet.conditional_graph import ConditionalGraph
-from scripts.relnet.relation_graph import BuilderComponentsProvider
-from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.relnet.relation_graph import BuilderComponentsProvider, RelationGraph
+from scripts.relnet.sample_graph import SampleGraphBuilder, SampleGraph
+from scripts.relnet.sample_set import SampleSetView
 from scripts.relnet.sample_space import SampleSet
 
 
@@ -49,6 +50,33 @@ class TestConditionalGraph(unittest.TestCase):
             "query": "{(a_1)}"
         })
 
+    def test_refine(self):
+        a_1 = SampleGraphBuilder(self.bcp).build_single_node("a", "1")
+        c_3 = SampleGraphBuilder(self.bcp).build_single_node("c", "3")
+        o_ab = SampleGraphBuilder(self.bcp).add_relation({("a", "1"), ("b", "2")}, "r").build()
+        o_ab_2 = SampleGraphBuilder(self.bcp).add_relation({("a", "2"), ("b", "2")}, "r").build()
+        o_bc = SampleGraphBuilder(self.bcp).add_relation({("b", "2"), ("c", "3")}, "r").build()
+        o_bc_4 = SampleGraphBuilder(self.bcp).add_relation({("b", "2"), ("c", "4")}, "s").build()
+        o_d = SampleGraphBuilder(self.bcp).build_single_node("d", "4")
+        rg = RelationGraph(self.bcp, "rg", SampleSet(self.bcp, {o_ab: 1, o_ab_2: 2, o_bc: 3, o_bc_4: 4, o_d: 5}))
+
+        chained = rg.conditional_graph(a_1).relation_graph().conditional_graph(c_3)
+
+        for view in [False, True]:
+            refined = rg.conditional_graph(a_1, view=view).refine(c_3, "refined")
+            self.assertEqual(refined.name, "refined")
+            self.assertEqual(refined.evidence, SampleGraph(self.bcp, a_1.nodes | c_3.nodes, frozenset(), None))
+            self.assertEqual(refined.outcomes.builder().build(), chained.outcomes)
+            self.assertEqual(isinstance(refined.outcomes, SampleSetView), view)
+
+        self.assertIsInstance(rg.conditional_graph(a_1).refine(c_3, view=True).outcomes, SampleSetView)
+
+        with self.assertRaises(AssertionError):  # Conflict with evidence
+            rg.conditional_graph(a_1).refine(SampleGraphBuilder(self.bcp).build_single_node("a", "2"))
+        with self.assertRaises(AssertionError):  # Not compatible
+            other_bcp = BuilderComponentsProvider({"a": {"1", "2"}}, {"r"})
+            rg.conditional_graph(a_1).refine(SampleGraphBuilder(other_bcp).build_single_node("a", "1"))
+
     def test_active_values(self):
         s_1 = SampleGraphBuilder(self.bcp)\
             .build_single_node("a", "1")
@@ -0,0 +1,205 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from scripts.relnet import delta_log
+from scripts.relnet.delta_log import DeltaLog, DELTA_HEADER, DELTA_MAGIC, DELTA_VERSION, FRAME_HEADER, replay, \
+    recover, open_log, compact
+from scripts.relnet.flat_sample_set import FlatSampleSet
+from scripts.relnet.records import view_to_json
+from scripts.relnet.relation_graph import RelationGraph
+from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.test.relnet import fixtures
+
+
+class TestDeltaLog(unittest.TestCase):
+
+    bcp = fixtures.bcp_join
+    rg = RelationGraph(bcp, "ab_bc_bd", fixtures.ab_bc_bd_samples)
+    ab = SampleGraphBuilder(bcp).add_relation({("a", "T"), ("b", "T")}, "r").build()
+    bc = SampleGraphBuilder(bcp).add_relation({("b", "T"), ("c", "F")}, "r").build()
+    cd = SampleGraphBuilder(bcp).add_relation({("c", "T"), ("d", "T")}, "s").build()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.directory.name, "graph.rn")
+        self.log_path = os.path.join(self.directory.name, "graph.log")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def counts(self, graph):
+        return {s.edges_set_view(): c for s, c in graph.outcomes.items()}
+
+    def expected_counts(self):
+        expected = self.counts(self.rg)
+        expected[self.ab.edges_set_view()] += 3
+        del expected[self.bc.edges_set_view()]
+        expected[self.cd.edges_set_view()] = 2
+        return expected
+
+    def append_deltas(self, log):
+        log.append([(self.ab, 3), (self.bc, -7)])
+        log.append([(self.cd, 2), (self.ab, 0)])
+
+    def test_append_records(self):
+        log = DeltaLog(self.log_path, generation=2)
+        self.assertEqual(log.append([]), 0)
+        self.assertEqual(log.append([(self.ab, 3), (self.bc, -7), (self.cd, 0)]), 2)
+        self.assertEqual(log.append([(self.cd, 2)]), 1)
+        self.assertEqual(str(log), f"DeltaLog(path = {self.log_path}, generation = 2, number_of_frames = 2, "
+                                   f"size = {os.path.getsize(self.log_path)})")
+        log.close()
+
+        with open(self.log_path, "rb") as f:
+            self.assertEqual(DELTA_HEADER.unpack(f.read(DELTA_HEADER.size)), (DELTA_MAGIC, DELTA_VERSION, 2))
+            length, _ = FRAME_HEADER.unpack(f.read(FRAME_HEADER.size))  # Payload is plain JSON
+            self.assertEqual(json.loads(f.read(length)), [[view_to_json(self.ab.edges_set_view()), 3],
+                                                          [view_to_json(self.bc.edges_set_view()), -7]])
+
+        reopened = DeltaLog(self.log_path, generation=5)
+        self.assertEqual(reopened.generation, 2)
+        self.assertEqual(reopened.number_of_frames, 2)
+        self.assertEqual(
+            list(reopened.records()),
+            [(self.ab.edges_set_view(), 3), (self.bc.edges_set_view(), -7), (self.cd.edges_set_view(), 2)])
+        reopened.reset(3)
+        self.assertEqual((reopened.generation, reopened.number_of_frames, list(reopened.records())), (3, 0, []))
+        reopened.close()
+
+    def test_torn_tail(self):
+        log = DeltaLog(self.log_path, sync=False)
+        self.append_deltas(log)
+        log.close()
+        size = os.path.getsize(self.log_path)
+
+        with open(self.log_path, "r+b") as f:
+            f.truncate(size - 3)
+        recovered = DeltaLog(self.log_path)
+        self.assertEqual(recovered.number_of_frames, 1)
+        self.assertEqual(len(list(recovered.records())), 2)
+        recovered.append([(self.cd, 2)])
+        recovered.close()
+
+        with open(self.log_path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b"\xff")
+        corrupted = DeltaLog(self.log_path)
+        self.assertEqual(corrupted.number_of_frames, 1)
+        self.assertLess(os.path.getsize(self.log_path), size)
+        corrupted.close()
+
+        with open(self.log_path, "r+b") as f:
+            f.write(b"NOTALOG!")
+        with self.assertRaises(AssertionError):
+            DeltaLog(self.log_path)
+
+    def test_short_header(self):
+        with open(self.log_path, "wb") as f:  # Crash during creation of log
+            f.write(DELTA_MAGIC[:5])
+        log = DeltaLog(self.log_path, generation=3)
+        self.assertEqual((log.generation, log.number_of_frames, log.size), (3, 0, DELTA_HEADER.size))
+        self.append_deltas(log)
+        log.close()
+
+        reopened = DeltaLog(self.log_path)
+        self.assertEqual((reopened.generation, reopened.number_of_frames), (3, 2))
+        reopened.close()
+
+    def test_replay(self):
+        outcomes = replay(
+            self.rg.outcomes,
+            [(self.ab.edges_set_view(), 3), (self.bc.edges_set_view(), -7), (self.cd.edges_set_view(), 2)],
+            self.bcp)
+        self.assertEqual({s.edges_set_view(): c for s, c in outcomes.items()}, self.expected_counts())
+
+        with self.assertRaises(AssertionError):
+            replay(self.rg.outcomes, [(self.bc.edges_set_view(), -8)], self.bcp)
+
+    def test_load_with_log(self):
+        self.rg.save(self.snapshot_path)
+
+        loaded = RelationGraph.load_with_log(self.snapshot_path, self.log_path)
+        self.assertIsInstance(loaded.outcomes, FlatSampleSet)
+        self.assertEqual(self.counts(loaded), self.counts(self.rg))
+        loaded.outcomes.close()
+
+        with mock.patch.object(FlatSampleSet, "close", autospec=True, side_effect=FlatSampleSet.close) as close:
+            log = open_log(self.snapshot_path, self.log_path)
+        close.assert_called_once()
+        self.append_deltas(log)
+        log.close()
+
+        replayed = RelationGraph.load_with_log(self.snapshot_path, self.log_path, mmap=False)
+        self.assertEqual(replayed.name, "ab_bc_bd")
+        self.assertEqual(self.counts(replayed), self.expected_counts())
+        self.assertEqual(replayed.outcomes.length, self.rg.outcomes.length + 3 - 7 + 2)
+
+    def test_compact(self):
+        self.rg.save(self.snapshot_path)
+        log = open_log(self.snapshot_path, self.log_path)
+        self.append_deltas(log)
+        log.close()
+
+        with mock.patch.object(delta_log, "_fsync_directory", wraps=delta_log._fsync_directory) as fsync_directory:
+            self.assertEqual(compact(self.snapshot_path, self.log_path), 1)
+        fsync_directory.assert_called_once_with(self.snapshot_path)
+        self.assertFalse(os.path.exists(self.snapshot_path + ".tmp"))
+
+        compacted = RelationGraph.load_with_log(self.snapshot_path, self.log_path)
+        self.assertIsInstance(compacted.outcomes, FlatSampleSet)
+        self.assertEqual(compacted.outcomes.generation, 1)
+        self.assertEqual(self.counts(compacted), self.expected_counts())
+        compacted.outcomes.close()
+
+        log = open_log(self.snapshot_path, self.log_path)
+        self.assertEqual((log.generation, log.number_of_frames), (1, 0))
+        log.append([(self.cd, 1)])
+        log.close()
+        self.assertEqual(compact(self.snapshot_path, self.log_path), 2)
+        self.assertEqual(
+            self.counts(RelationGraph.load_with_log(self.snapshot_path, self.log_path, mmap=False))
+            [self.cd.edges_set_view()], 3)
+
+    def test_recover_after_crash_in_compact(self):
+        FlatSampleSet.save(self.rg.outcomes, self.snapshot_path, "ab_bc_bd", generation=1)
+        stale = DeltaLog(self.log_path, generation=0)  # Snapshot replaced, but log not reset
+        self.append_deltas(stale)
+        stale.close()
+
+        recovered = RelationGraph.load_with_log(self.snapshot_path, self.log_path, mmap=False)
+        self.assertEqual(self.counts(recovered), self.counts(self.rg))
+        log = DeltaLog(self.log_path)
+        self.assertEqual((log.generation, log.number_of_frames), (1, 0))
+        log.reset(2)
+        log.close()
+
+        snapshot = FlatSampleSet.load(self.snapshot_path, use_mmap=False)
+        with self.assertRaises(AssertionError):
+            recover(snapshot, self.log_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import json
+import os
+import struct
+import tempfile
+import unittest
+from copy import copy
+
+from scripts.relnet.flat_sample_set import FlatSampleSet, FLAT_HEADER, FLAT_MAGIC, FORMAT_VERSION
+from scripts.relnet.graph_components import BuilderComponentsProvider, DirectedRelation
+from scripts.relnet.relation_graph import RelationGraph
+from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.relnet.sample_set import SampleSetBuilder
+from scripts.test.relnet import fixtures
+
+
+class TestFlatSampleSet(unittest.TestCase):
+
+    bcp = fixtures.bcp_join
+    rg = RelationGraph(bcp, "ab_bc_bd", fixtures.ab_bc_bd_samples)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "graph.rn")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_load(self):
+        FlatSampleSet.save(self.rg.outcomes, self.path, "graph")
+
+        for use_mmap in [True, False]:
+            loaded = FlatSampleSet.load(self.path, use_mmap)
+            try:
+                self.assertEqual(loaded.name, "graph")
+                self.assertEqual(loaded.length, self.rg.outcomes.length)
+                self.assertEqual(len(loaded), self.rg.outcomes.length)
+                self.assertEqual(loaded.number_of_samples, len(self.rg.outcomes.samples()))
+                self.assertEqual(
+                    str(loaded),
+                    f"FlatSampleSet(length = {loaded.length}, number_of_samples = {loaded.number_of_samples})")
+                self.assertEqual(
+                    {(s.edges_set_view(), c) for s, c in loaded.items()},
+                    {(s.edges_set_view(), c) for s, c in self.rg.outcomes.items()})
+
+                sample, count = next(iter(loaded.items()))
+                self.assertEqual(loaded.count_of(sample), count)
+                self.assertEqual(loaded.filter_samples(lambda s: s == sample).length, count)
+                with self.assertRaises(AssertionError):
+                    copy(loaded)
+            finally:
+                loaded.close()
+
+            with self.assertRaises(AssertionError):  # Closed
+                list(loaded.items())
+
+    def test_empty(self):
+        FlatSampleSet.save(fixtures.ab_samples.filter_samples(lambda _: False), self.path)
+        loaded = FlatSampleSet.load(self.path)
+        try:
+            self.assertFalse(loaded)
+            self.assertIsNone(loaded.name)
+            self.assertEqual(list(loaded.items()), [])
+        finally:
+            loaded.close()
+
+    def test_format_validation(self):
+        FlatSampleSet.save(self.rg.outcomes, self.path)
+        with open(self.path, "rb") as f:
+            data = bytearray(f.read())
+
+        _, _, dictionary_length = FLAT_HEADER.unpack_from(data, 0)
+        with open(self.path, "wb") as f:
+            f.write(FLAT_HEADER.pack(FLAT_MAGIC, FORMAT_VERSION + 1, dictionary_length) + data[FLAT_HEADER.size:])
+        with self.assertRaises(AssertionError):  # Unsupported version
+            FlatSampleSet.load(self.path, use_mmap=False)
+
+        with open(self.path, "wb") as f:
+            f.write(struct.pack("<8s", b"NOTAFLAT") + data[8:])
+        with self.assertRaises(AssertionError):  # Not flat sample set
+            FlatSampleSet.load(self.path, use_mmap=False)
+
+    def test_json_dictionary(self):
+        bcp = BuilderComponentsProvider({"a": {1, 2}, ("b", 1): {"x", ("y", 2)}}, {"r"})
+        directed = DirectedRelation("a", ("b", 1), "r")
+        ab = SampleGraphBuilder(bcp).add_relation({("a", 2), (("b", 1), ("y", 2))}, directed).build()
+        rg = RelationGraph(bcp, "typed", SampleSetBuilder(bcp, {ab: 3}).build())
+        rg.save(self.path)
+
+        with open(self.path, "rb") as f:  # Dictionary is plain JSON, readable without unpickling
+            data = f.read()
+        _, _, dictionary_length = FLAT_HEADER.unpack_from(data, 0)
+        dictionary = json.loads(data[FLAT_HEADER.size:FLAT_HEADER.size + dictionary_length].decode("utf-8"))
+        self.assertEqual(dictionary["name"], "typed")
+        self.assertEqual(dictionary["edge_relations"], [{"directed": ["a", {"tuple": ["b", 1]}, "r"]}])
+
+        loaded = RelationGraph.load(self.path)
+        try:
+            self.assertEqual(loaded.variables, rg.variables)
+            self.assertEqual([(s.edges_set_view(), c) for s, c in loaded.outcomes.items()], [(ab.edges_set_view(), 3)])
+        finally:
+            loaded.outcomes.close()
+
+    def test_relation_graph_save_load(self):
+        self.rg.save(self.path)
+
+        for mmap in [True, False]:
+            loaded = RelationGraph.load(self.path, mmap)
+            try:
+                self.assertEqual(loaded.name, self.rg.name)
+                self.assertEqual(loaded.marginal_variables_probability(), self.rg.marginal_variables_probability())
+                self.assertEqual(loaded.is_factorized(), self.rg.is_factorized())
+                self.assertEqual(loaded.query(), self.rg.query())
+
+                evidence = loaded.sample_builder().add_relation({("a", "T"), ("b", "F")}, "r").build()
+                self.assertEqual(
+                    {(s.edges_set_view(), c) for s, c in loaded.conditional_graph(evidence).outcomes.items()},
+                    {(s.edges_set_view(), c) for s, c in self.rg.conditional_graph(
+                        SampleGraphBuilder(self.bcp).add_relation({("a", "T"), ("b", "F")}, "r").build()
+                    ).outcomes.items()})
+            finally:
+                loaded.outcomes.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
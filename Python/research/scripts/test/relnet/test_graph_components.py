@@ -22,7 +22,7 @@ import unittest
 from copy import copy
 from typing import Any, Dict, Set, Tuple
 
-from scripts.relnet.graph_components import BuilderComponentsProvider
+from scripts.relnet.graph_components import BuilderComponentsProvider, content_fingerprint
 from scripts.relnet.sample_graph import ValueNode, RelationEdge, SampleGraphComponentsProvider, DirectedRelation
 
 
@@ -54,6 +54,10 @@ class TestValueNode(unittest.TestCase):
     def test_var_val(self):
         self.assertEqual(self.a_1.var_val(), ("a", "1"))
 
+    def test_content_key(self):
+        self.assertEqual(self.a_1.content_key(), b"('a', '1')")
+        self.assertNotEqual(ValueNode("a", 1).content_key(), self.a_1.content_key())
+
 
 class TestRelationEdge(unittest.TestCase):
 
@@ -89,6 +93,11 @@ class TestRelationEdge(unittest.TestCase):
         self.assertTrue(self.e_1.is_endpoint(self.a_1))
         self.assertFalse(self.e_1.is_endpoint(self.b_2))
 
+    def test_content_key(self):
+        self.assertEqual(self.e_1.content_key(), b"""(("('a', '1')", "('b', '1')"), 'r')""")
+        self.assertEqual(RelationEdge(frozenset({self.b_1, self.a_1}), "r").content_key(), self.e_1.content_key())
+        self.assertNotEqual(RelationEdge(frozenset({self.a_1, self.b_2}), "r").content_key(), self.e_1.content_key())
+
     def test_opposite_endpoint(self):
         self.assertEqual(self.e_1.opposite_endpoint(self.a_1), self.b_1)
         self.assertEqual(self.e_1.opposite_endpoint(self.b_1), self.a_1)
@@ -122,6 +131,19 @@ class TestDirectedRelation(unittest.TestCase):
         self.assertEqual(self.dr_1, dr_2)
 
 
+class TestContentFingerprint(unittest.TestCase):
+
+    def test_content_fingerprint(self):
+        fp = content_fingerprint([b"a", b"bc"])
+        self.assertEqual(len(fp), 16)
+        self.assertEqual(fp, content_fingerprint([b"bc", b"a"]))
+        self.assertNotEqual(fp, content_fingerprint([b"ab", b"c"]))
+        self.assertEqual(len(content_fingerprint([b"a", b"bc"], 8)), 8)
+
+        with self.assertRaises(AssertionError):
+            content_fingerprint([b"a"], 32)
+
+
 class MockSampleGraphComponentsProvider(SampleGraphComponentsProvider):
 
     def __init__(self, variables: Dict[Any, Set[Any]], relations: Set[Any]):
@@ -263,6 +285,24 @@ class TestBuilderComponentsProvider(unittest.TestCase):
         with self.assertRaises(AssertionError):  # Unknown directed target variable
             self.b_1.get_edge(frozenset({n_1, n_2}),  DirectedRelation("a", "unknown_variable", "r"))
 
+    def test_has_same_schema(self):
+        self.assertTrue(self.b_1.has_same_schema(self.b_1))
+        self.assertTrue(
+            self.b_1.has_same_schema(BuilderComponentsProvider({"b": {"3", "2"}, "a": {"1", "2"}}, {"s", "r"})))
+        self.assertFalse(self.b_1.has_same_schema(BuilderComponentsProvider({"a": {"1", "2"}, "b": {"2"}}, {"r", "s"})))
+        self.assertFalse(self.b_1.has_same_schema(BuilderComponentsProvider({"a": {"1", "2"}, "b": {"2", "3"}}, {"r"})))
+
+    def test_schema_fingerprint(self):
+        same = BuilderComponentsProvider({"b": {"3", "2"}, "a": {"1", "2"}}, {"s", "r"})
+        self.assertEqual(self.b_1.schema_fingerprint(), same.schema_fingerprint())
+        self.assertEqual(len(self.b_1.schema_fingerprint(8)), 8)
+        self.assertNotEqual(
+            self.b_1.schema_fingerprint(),
+            BuilderComponentsProvider({"a": {"1", "2"}, "b": {"2", "3"}}, {"r"}).schema_fingerprint())
+        self.assertNotEqual(
+            self.b_1.schema_fingerprint(),
+            BuilderComponentsProvider({"a": {"1", "2"}, "b": {"2", 3}}, {"r", "s"}).schema_fingerprint())
+
 
 if __name__ == '__main__':
     unittest.main()
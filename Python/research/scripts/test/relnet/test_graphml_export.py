@@ -0,0 +1,141 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ElementTree
+
+from scripts.relnet.graph_components import DirectedRelation
+from scripts.relnet.graphml_export import GraphMLWriter, write_graphml, write_outcomes_graphml
+from scripts.relnet.relation_graph import RelationGraph, RelationGraphBuilder
+from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.test.relnet import fixtures
+
+NS = {"g": "http://graphml.graphdrawing.org/xmlns"}
+
+
+class TestGraphMLExport(unittest.TestCase):
+
+    bcp = fixtures.bcp_join
+    rg = RelationGraph(bcp, "ab_bc", fixtures.ab_bc_samples)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "graph.graphml")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def parse(self):
+        root = ElementTree.parse(self.path).getroot()
+        keys = {k.get("id"): k.get("attr.name") for k in root.findall("g:key", NS)}
+
+        def data(element):
+            return {keys[d.get("key")]: d.text for d in element.findall("g:data", NS)}
+
+        graph = root.find("g:graph", NS)
+        nodes = {n.get("id"): data(n) for n in graph.iter("{%s}node" % NS["g"])}
+        edges = [
+            (e.get("source"), e.get("target"), e.get("directed"), data(e)) for e in graph.iter("{%s}edge" % NS["g"])]
+        return graph, data(graph), nodes, edges
+
+    def test_writer(self):
+        writer = GraphMLWriter(self.path, "g<1>", 3)
+        writer.begin_group("n0", {"variable": "a"})
+        writer.add_node("n0::v", {"value": "x & y", "weight": 0.5, "in_query": True, "count": None})
+        writer.add_edge("n0::v", "n1", {"count": 2}, directed=True)
+        with self.assertRaises(AssertionError):
+            writer.add_node("n1", {"unknown": 1})
+        writer.close()
+
+        graph, graph_data, nodes, edges = self.parse()
+        self.assertEqual(graph.get("id"), "g<1>")
+        self.assertEqual(graph_data, {"number_of_outcomes": "3"})
+        self.assertEqual(
+            nodes, {"n0": {"variable": "a"}, "n0::v": {"value": "x & y", "weight": "0.5", "in_query": "true"}})
+        self.assertEqual(edges, [("n0::v", "n1", "true", {"count": "2"})])
+
+    def test_write_folded_graph(self):
+        folded = self.rg.folded_graph()
+        write_graphml(folded, self.path)
+        _, graph_data, nodes, edges = self.parse()
+
+        self.assertEqual(graph_data, {"number_of_outcomes": str(folded.number_of_outcomes)})
+        variables = {d["variable"]: d for d in nodes.values() if "value" not in d}
+        self.assertEqual(set(variables.keys()), {n.variable for n in folded.nodes})
+        for node in folded.nodes:
+            self.assertEqual(int(variables[node.variable]["unobserved"]), node.unobserved_count())
+        self.assertEqual(
+            {(d["variable"], d["value"], int(d["count"])) for d in nodes.values() if "value" in d},
+            {(n.variable, n.value, c) for fn in folded.nodes for n, c in fn.value_nodes})
+        self.assertEqual(
+            sorted((s.split("::")[1], t.split("::")[1], int(d["count"])) for s, t, _, d in edges),
+            sorted((*sorted(ep.string_id for ep in e.endpoints), c)
+                   for fe in folded.edges for e, c in fe.relation_edges))
+
+    def test_write_activation_graph(self):
+        evidence = SampleGraphBuilder(self.bcp).build_single_node("b", "T")
+        activation = self.rg.conditional_graph(evidence).activation_graph()
+        write_graphml(activation, self.path)
+        _, _, nodes, edges = self.parse()
+
+        self.assertEqual(
+            {(d["variable"], d["value"], float(d["weight"]), d["in_query"]) for d in nodes.values() if "value" in d},
+            {(n.variable, v, w, "true" if n.in_query else "false") for n in activation.nodes for v, w in n.values})
+        self.assertEqual(
+            sorted((nodes[s]["variable"], nodes[t]["variable"], int(d["count"]), d["in_query"])
+                   for s, t, _, d in edges),
+            sorted((*sorted(e.endpoints), c, "true" if e.in_query else "false")
+                   for e in activation.edges for _, c in e.relations))
+
+        with self.assertRaises(AssertionError):
+            write_graphml(self.rg, self.path)
+
+    def test_write_outcomes(self):
+        self.rg.write_outcomes_graphml(self.path)
+        graph, graph_data, nodes, edges = self.parse()
+
+        self.assertEqual(graph.get("id"), "ab_bc")
+        self.assertEqual(graph_data, {"number_of_outcomes": str(len(self.rg.outcomes))})
+        outcomes = {}
+        for node_id, d in nodes.items():
+            outcomes.setdefault(d["outcome"], set()).add(node_id.split("::")[1])
+        for s, t, _, d in edges:
+            self.assertEqual(nodes[s]["outcome"], d["outcome"])
+            self.assertEqual(nodes[t]["outcome"], d["outcome"])
+        self.assertEqual(
+            sorted(sorted(ns) for ns in outcomes.values()),
+            sorted(sorted(n.string_id for n in o.nodes) for o in self.rg.outcomes.samples()))
+
+    def test_write_directed_outcomes(self):
+        rgb = RelationGraphBuilder({"a": {1, 2}, "b": {"x", "y"}}, {"r"})
+        rgb.add_outcome(rgb.sample_builder().add_relation({("a", 2), ("b", "y")}, DirectedRelation("b", "a", "r"))
+                        .build(), 7)
+        write_outcomes_graphml(rgb.build().outcomes, self.path, "directed")
+        _, _, nodes, edges = self.parse()
+
+        self.assertEqual(set(nodes.keys()), {"o0::a_2", "o0::b_y"})
+        self.assertEqual(
+            [(s, t, directed, d["count"]) for s, t, directed, d in edges], [("o0::b_y", "o0::a_2", "true", "7")])
+
+
+if __name__ == '__main__':
+    unittest.main()
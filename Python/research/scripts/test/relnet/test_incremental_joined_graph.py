@@ -0,0 +1,118 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import random
+import unittest
+from copy import copy
+from unittest import mock
+
+from scripts.relnet import incremental_joined_graph
+from scripts.relnet.relation_graph import RelationGraph
+from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.relnet.sample_set import SampleSet
+from scripts.test.relnet import fixtures
+
+
+class TestIncrementalJoinedGraph(unittest.TestCase):
+
+    bcp = fixtures.bcp_join
+    ab_bc = RelationGraph(bcp, "ab_bc", fixtures.ab_bc_samples)
+    ab_bc_ca = RelationGraph(bcp, "ab_bc_ca", fixtures.ab_bc_samples.union(fixtures.ca_samples))
+    ab_bc_bd = RelationGraph(bcp, "ab_bc_bd", fixtures.ab_bc_bd_samples)
+
+    def assert_consistent_with_batch(self, ijg):
+        self.assertEqual(ijg.joined_outcomes(), ijg.factors_graph().make_joined().outcomes)
+
+    def test_init(self):
+        ijg = self.ab_bc.incremental_joined()
+        self.assertEqual(ijg.joined_outcomes(), fixtures.expected_ab_bc_joint_b)
+        self.assertEqual(str(ijg), "IncrementalJoinedGraph(name = ab_bc, number_of_factors = 2, number_of_joined = 8)")
+
+    def test_copy(self):
+        with self.assertRaises(AssertionError):
+            copy(self.ab_bc.incremental_joined())
+
+    def test_add_existing_outcome(self):
+        ijg = self.ab_bc.incremental_joined("ijg")
+        o_ab = fixtures.sample_set(self.bcp, [([("a", "T", "b", "F")], 1)]).samples().pop()
+
+        ijg.add_outcome(o_ab, 10)
+
+        self.assert_consistent_with_batch(ijg)
+        self.assertEqual(ijg.factors_graph().outcomes.count_of(o_ab), 3 + 10)
+        self.assertEqual(ijg.relation_graph().name, "ijg")
+        self.assertEqual(ijg.relation_graph("rg").outcomes, ijg.joined_outcomes())
+
+    def test_add_new_outcome_of_factor(self):
+        ijg = self.ab_bc.incremental_joined()
+        o_ab_s = SampleGraphBuilder(self.bcp).add_relation({("a", "T"), ("b", "F")}, "s").build()
+
+        ijg.add_outcome(o_ab_s, 2)
+
+        self.assert_consistent_with_batch(ijg)
+        self.assertEqual(ijg.joined_outcomes().length, 214 + 2 * (8 + 9))
+
+    def test_add_outcome_of_new_factor(self):
+        ijg = self.ab_bc.incremental_joined()
+        o_d = SampleGraphBuilder(self.bcp).build_single_node("d", "T")
+
+        ijg.add_outcome(o_d, 3)
+
+        self.assertEqual(ijg.joined_outcomes(), SampleSet(self.bcp, dict(ijg.factors_graph().joint_view().outcomes())))
+        self.assertEqual(ijg.joined_outcomes().length, 214 * 3)
+
+        with self.assertRaises(AssertionError):  # Overlapping with existing factors
+            ijg.add_outcome(SampleGraphBuilder(self.bcp)
+                            .add_relation({("a", "T"), ("b", "T")}, "r")
+                            .add_relation({("b", "T"), ("c", "T")}, "r")
+                            .build())
+        with self.assertRaises(AssertionError):  # Expect count be >= 1
+            ijg.add_outcome(o_d, 0)
+        with self.assertRaises(AssertionError):  # Not compatible
+            ijg.add_outcome(fixtures.incompatible_sample)
+
+    def test_add_outcome_not_rejoin_factors(self):
+        ijg = self.ab_bc_bd.incremental_joined()
+        o_ab, o_bc = fixtures.ab_samples.samples().pop(), fixtures.bc_samples.samples().pop()
+
+        with mock.patch.object(incremental_joined_graph, "JointView", side_effect=AssertionError), \
+                mock.patch.object(incremental_joined_graph, "SampleSet", side_effect=AssertionError):
+            ijg.add_outcome(o_ab, 2)
+            ijg.add_outcome(o_bc, 3)
+            ijg.add_outcome(o_ab, 4)
+
+        self.assert_consistent_with_batch(ijg)
+        added = fixtures.ab_bc_bd_samples.union(SampleSet(self.bcp, {o_ab: 2 + 4, o_bc: 3}))
+        expected = RelationGraph(self.bcp, "expected", added).make_joined().outcomes
+        self.assertEqual(ijg.joined_outcomes(), expected)
+
+    def test_equivalence_with_batch_join(self):
+        rnd = random.Random(1)
+
+        for rg in [self.ab_bc, self.ab_bc_ca, self.ab_bc_bd]:
+            ijg = rg.incremental_joined()
+            factor_outcomes = list(rg.outcomes.samples())
+            for _ in range(20):
+                ijg.add_outcome(rnd.choice(factor_outcomes), rnd.randint(1, 5))
+                self.assert_consistent_with_batch(ijg)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import unittest
+from copy import copy
+from unittest import mock
+
+from scripts.relnet.joint_view import JointView
+from scripts.relnet.relation_graph import RelationGraph
+from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.relnet.sample_set import SampleSet
+from scripts.test.relnet.test_graph_components import MockSampleGraphComponentsProvider
+from scripts.test.relnet import fixtures
+
+
+class TestJointView(unittest.TestCase):
+
+    bcp = fixtures.bcp_join
+    ab_bc = RelationGraph(bcp, "ab_bc", fixtures.ab_bc_samples)
+    ab_bc_ca = RelationGraph(bcp, "ab_bc_ca", fixtures.ab_bc_samples.union(fixtures.ca_samples))
+    ab_bc_bd = RelationGraph(bcp, "ab_bc_bd", fixtures.ab_bc_bd_samples)
+
+    def test_init(self):
+        jv = self.ab_bc_ca.joint_view()
+        self.assertEqual(jv.number_of_factors, 3)
+        self.assertEqual(jv.number_of_combinations, 4 * 4 * 4)
+        self.assertEqual(jv.variables, frozenset({"a", "b", "c"}))
+        self.assertEqual(str(jv), "JointView(number_of_factors = 3, number_of_combinations = 64)")
+
+        with self.assertRaises(AssertionError):  # Not factorized
+            o_abc = SampleGraphBuilder(self.bcp) \
+                .add_relation({("a", "T"), ("b", "T")}, "r") \
+                .add_relation({("b", "T"), ("c", "T")}, "r") \
+                .build()
+            RelationGraph(self.bcp, None, fixtures.ab_samples.union(SampleSet(self.bcp, {o_abc: 1}))).joint_view()
+
+    def test_copy(self):
+        with self.assertRaises(AssertionError):
+            copy(self.ab_bc.joint_view())
+
+    def test_outcomes(self):
+        self.assertEqual(SampleSet(self.bcp, dict(self.ab_bc.joint_view().outcomes())), fixtures.expected_ab_bc_joint_b)
+        self.assertEqual(
+            SampleSet(self.bcp, dict(self.ab_bc_ca.joint_view().outcomes())), fixtures.expected_ab_bc_ca_joint_abc)
+        self.assertEqual(
+            SampleSet(self.bcp, dict(self.ab_bc_bd.joint_view().outcomes())), fixtures.expected_ab_bc_bd_joint_abc)
+
+        for rg in [self.ab_bc, self.ab_bc_ca, self.ab_bc_bd]:
+            self.assertEqual(SampleSet(self.bcp, dict(rg.joint_view().outcomes())), rg.make_joined().outcomes)
+
+    def test_outcomes_with_single_node_factor(self):
+        bcp = MockSampleGraphComponentsProvider({"a": {"T", "F"}, "b": {"T", "F"}}, {"r"})
+        a_t = SampleGraphBuilder(bcp).build_single_node("a", "T")
+        a_f = SampleGraphBuilder(bcp).build_single_node("a", "F")
+        ab = fixtures.sample_set(bcp, [([("a", "T", "b", "T")], 2), ([("a", "F", "b", "T")], 3)])
+        rg = RelationGraph(bcp, None, ab.union(SampleSet(bcp, {a_t: 5, a_f: 7})))
+
+        self.assertEqual(SampleSet(bcp, dict(rg.joint_view().outcomes())), rg.make_joined().outcomes)
+
+    def test_length(self):
+        self.assertEqual(self.ab_bc.joint_view().length(), 214)
+        self.assertEqual(self.ab_bc_ca.joint_view().length(), fixtures.expected_ab_bc_ca_joint_abc.length)
+        self.assertEqual(self.ab_bc_bd.joint_view().length(), fixtures.expected_ab_bc_bd_joint_abc.length)
+
+        with mock.patch.object(JointView, "_combinations", side_effect=AssertionError):  # Not walk combinations
+            self.assertEqual(self.ab_bc_bd.joint_view().length(), fixtures.expected_ab_bc_bd_joint_abc.length)
+
+    def test_length_partial_support(self):
+        bd_t = fixtures.bd_samples.filter_samples(lambda o: o.have_value("b", "T"))  # No support for b = F
+        view = RelationGraph(self.bcp, "ab_bc_bd_t", fixtures.ab_bc_samples.union(bd_t)).joint_view()
+        self.assertEqual(view.length(), sum(c for _, c in view.outcomes()))
+        self.assertEqual(view.length(), (2 + 4) * (6 + 7) * (14 + 15))
+
+    def test_count_of(self):
+        jv = self.ab_bc_bd.joint_view()
+        self.assertEqual(jv.count_of({("a", "T"), ("b", "F"), ("c", "T"), ("d", "F")}), 3 * 8 * 17)
+        self.assertEqual(jv.count_of({("a", "F"), ("b", "T"), ("c", "F"), ("d", "T")}), 4 * 7 * 14)
+
+        with self.assertRaises(AssertionError):  # Not all variables
+            jv.count_of({("a", "T"), ("b", "F")})
+        with self.assertRaises(AssertionError):  # Two values of same variable
+            jv.count_of({("a", "T"), ("a", "F"), ("b", "F"), ("c", "T"), ("d", "F")})
+
+    def test_probability_of(self):
+        jv = self.ab_bc_ca.joint_view()
+        joined = self.ab_bc_ca.make_joined()
+
+        for o, c in joined.outcomes.items():
+            self.assertEqual(jv.probability_of(o.values()), joined.outcomes.probability_of(o))
+
+        self.assertEqual(jv.probability_of({("a", "T"), ("b", "T"), ("c", "F")}), 2 * 7 * 12 / joined.outcomes.length)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from scripts.relnet.outcomes_renderer import OutcomesRenderer, outcome_entry, aggregate_outcomes
+from scripts.relnet.relation_graph import RelationGraph
+from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.relnet.sample_set import SampleSet
+from scripts.test.relnet import fixtures
+from scripts.test.relnet.test_graph_components import MockSampleGraphComponentsProvider
+
+
+class TestOutcomesRenderer(unittest.TestCase):
+
+    bcp = fixtures.bcp_join
+    rg = RelationGraph(bcp, "ab bc", fixtures.ab_bc_samples)
+    ab = SampleGraphBuilder(bcp).set_name("ab").add_relation({("a", "T"), ("b", "F")}, "r").build()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_json(self, file):
+        with open(os.path.join(self.directory.name, file)) as f:
+            return json.load(f)
+
+    def test_outcome_entry(self):
+        self.assertEqual(
+            outcome_entry(self.ab, 3),
+            {"label": "ab(3)", "count": 3, "number_of_outcomes": 1, "nodes": ["a_T", "b_F"],
+             "edges": [["a_T", "b_F", "r"]]})
+
+    def test_aggregate_outcomes(self):
+        entries = sorted(aggregate_outcomes(self.rg.outcomes.items()), key=lambda e: e["nodes"])
+        self.assertEqual(
+            entries,
+            [{"label": "4 outcomes(14)", "count": 14, "number_of_outcomes": 4, "nodes": ["a", "b"],
+              "edges": [["a", "b", "r"]]},
+             {"label": "4 outcomes(30)", "count": 30, "number_of_outcomes": 4, "nodes": ["b", "c"],
+              "edges": [["b", "c", "r"]]}])
+
+    def test_select(self):
+        counts = sorted((c for _, c in self.rg.outcomes.items()), reverse=True)
+
+        self.assertEqual(sorted(e["count"] for e in OutcomesRenderer().select(self.rg.outcomes)), sorted(counts))
+        self.assertEqual([e["count"] for e in OutcomesRenderer(top_n=3).select(self.rg.outcomes)], counts[:3])
+        self.assertEqual([e["count"] for e in OutcomesRenderer(top_n=1, aggregate=True).select(self.rg.outcomes)], [30])
+
+        sampled = list(OutcomesRenderer(sample_size=5, seed=1).select(self.rg.outcomes))
+        self.assertEqual(len(sampled), 5)
+        self.assertEqual(len({json.dumps(e) for e in sampled}), 5)
+        self.assertEqual(sampled, list(OutcomesRenderer(sample_size=5, seed=1).select(self.rg.outcomes)))
+        self.assertEqual(len(list(OutcomesRenderer(sample_size=100).select(self.rg.outcomes))), 8)
+
+        with self.assertRaises(AssertionError):
+            OutcomesRenderer(top_n=1, sample_size=1)
+        with self.assertRaises(AssertionError):
+            OutcomesRenderer(output_format="svg")
+
+    def test_render_json(self):
+        index_path = self.rg.render_outcomes(self.directory.name, page_size=3, output_format="json")
+
+        self.assertEqual(index_path, os.path.join(self.directory.name, "abbc.json"))
+        index = self.read_json("abbc.json")
+        self.assertEqual(index["number_of_entries"], 8)
+        self.assertEqual(index["count"], self.rg.outcomes.length)
+        self.assertEqual([(p["file"], p["number_of_entries"]) for p in index["pages"]],
+                         [("abbc_0001.json", 3), ("abbc_0002.json", 3), ("abbc_0003.json", 2)])
+
+        page = self.read_json("abbc_0003.json")
+        self.assertEqual((page["name"], page["page"], page["evidence"]), ("abbc", 3, None))
+        self.assertEqual(sum(e["count"] for e in page["entries"]), index["pages"][2]["count"])
+
+    def test_render_html(self):
+        cg = self.rg.conditional_graph(SampleGraphBuilder(self.bcp).set_name("b").build_single_node("b", "T"), "cg")
+        index_path = cg.render_outcomes(self.directory.name, page_size=1, top_n=2)
+
+        with open(index_path) as f:
+            self.assertIn('<a href="cg_0002.html">cg_0002.html</a>', f.read())
+        with open(os.path.join(self.directory.name, "cg_0001.html")) as f:
+            page = f.read()
+        self.assertIn('const evidence = {"label": "b(0)"', page)
+        self.assertIn('<a href="cg.html">index</a> | <a href="cg_0002.html">next</a>', page)
+        with open(os.path.join(self.directory.name, "cg_0002.html")) as f:
+            self.assertIn('<p><a href="cg_0001.html">previous</a> | <a href="cg.html">index</a></p>', f.read())
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["cg.html", "cg_0001.html", "cg_0002.html"])
+
+    def test_render_html_escaped(self):
+        script = "</script><script>alert(1)</script>"
+        bcp = MockSampleGraphComponentsProvider({"a": {"T", "F"}, "b": {"T", "F"}}, {script, "r & s"})
+        outcome = SampleGraphBuilder(bcp).set_name(script).add_relation({("a", "T"), ("b", "F")}, script).build()
+        evidence = SampleGraphBuilder(bcp).set_name("e").add_relation({("a", "T"), ("b", "F")}, "r & s").build()
+        OutcomesRenderer().render(SampleSet(bcp, {outcome: 1}), self.directory.name, "x", evidence)
+
+        with open(os.path.join(self.directory.name, "x_0001.html")) as f:
+            page = f.read()
+        self.assertNotIn(script, page)
+        self.assertNotIn("r & s", page)
+        self.assertEqual(page.count("</script>"), 2)  # Only closing tags of external and inline scripts
+        entry = page[page.index("const entries = [") + len("const entries = ["):page.index("];")]
+        self.assertEqual(json.loads(entry)["edges"], [["a_T", "b_F", script]])
+
+    def test_render_empty(self):
+        empty = self.rg.outcomes.filter_samples(lambda _: False)
+        index_path = OutcomesRenderer(output_format="json").render(empty, self.directory.name, "empty")
+        self.assertEqual(self.read_json(os.path.basename(index_path))["pages"], [])
+
+    def test_visualize_headless(self):
+        cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        try:
+            self.rg.folded_graph().visualize("folded", show=False)
+            self.assertTrue(os.path.exists("folded.html"))
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    unittest.main()
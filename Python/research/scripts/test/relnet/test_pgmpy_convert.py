@@ -0,0 +1,165 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import unittest
+from functools import reduce
+from math import isclose
+
+from scripts.relnet.graph_components import DirectedRelation
+
+try:
+    from pgmpy.factors.discrete import TabularCPD, DiscreteFactor
+    try:
+        from pgmpy.models import DiscreteBayesianNetwork, DiscreteMarkovNetwork
+    except ImportError:  # Names before pgmpy 1.0
+        from pgmpy.models import BayesianNetwork as DiscreteBayesianNetwork, MarkovNetwork as DiscreteMarkovNetwork
+    from scripts.relnet.pgmpy_convert import from_bayesian_network, from_markov_network, to_discrete_factors
+except ImportError:
+    TabularCPD = None
+
+
+class MockModel:
+    """
+    Model with same interface as pgmpy networks, since names of network classes differ in between pgmpy versions
+    """
+
+    def __init__(self, factors):
+        self.factors = factors
+
+    def get_cpds(self):
+        return self.factors
+
+    def get_factors(self):
+        return self.factors
+
+
+@unittest.skipIf(TabularCPD is None, "pgmpy is not installed")
+class TestPgmpyConvert(unittest.TestCase):
+
+    def make_bayes_network(self):
+        return MockModel([
+            TabularCPD("D", 2, [[.6], [.4]]),
+            TabularCPD("I", 2, [[.7], [.3]]),
+            TabularCPD("G", 3, [[.3, .05, .9, .5], [.4, .25, .08, .3], [.3, .7, .02, .2]], ["I", "D"], [2, 2]),
+            TabularCPD("S", 2, [[.95, .2], [.05, .8]], ["I"], [2]),
+            TabularCPD("L", 2, [[.1, .4, .99], [.9, .6, .01]], ["G"], [3])])
+
+    def make_markov_network(self):
+        return MockModel([
+            DiscreteFactor(["A", "B"], [2, 2], [1, 100, 100, 1]),
+            DiscreteFactor(["B", "C"], [2, 2], [100, 1, 1, 100]),
+            DiscreteFactor(["C"], [2], [3, 1])])
+
+    def assert_same_joint(self, graph, factors, state=lambda var, val: int(val[len(var) + 1:-1])):
+        joint = reduce(lambda a, b: a * b, factors)
+        joint.normalize()
+        outcomes = graph.make_joined().outcomes
+        total = sum(c for _, c in outcomes.items())
+        self.assertEqual(len(outcomes.samples()), int((joint.values > 0).sum()))
+        for o, c in outcomes.items():
+            states = {var: state(var, val) for var, val in o.values()}
+            self.assertTrue(isclose(c / total, joint.get_value(**states)), f"{o}: {c / total}")
+
+    def test_from_bayesian_network(self):
+        model = self.make_bayes_network()
+        rg = from_bayesian_network(model, name="student")
+
+        self.assertEqual(rg.name, "student")
+        self.assertEqual(rg.relations, {"r"})
+        self.assertEqual(dict(rg.variables)["G"], {"G(0)", "G(1)", "G(2)"})
+        self.assertEqual(len(rg.outcomes.samples()), 2 + 2 + 12 + 4 + 6)
+        self.assertTrue(rg.is_factorized())
+        self.assertEqual(len(rg.factorized()), 5)
+
+        g_outcome = rg.sample_builder() \
+            .add_relation({("I", "I(1)"), ("G", "G(2)")}, DirectedRelation("I", "G", "r")) \
+            .add_relation({("D", "D(0)"), ("G", "G(2)")}, DirectedRelation("D", "G", "r")) \
+            .build()
+        self.assertEqual(rg.outcomes.count_of(g_outcome), 2)
+        self.assertNotIn(rg.sample_builder().build_single_node("L", "L(1)"), rg.outcomes.samples())
+        self.assert_same_joint(rg, [cpd.to_factor() for cpd in model.get_cpds()])
+
+    def test_from_bayesian_network_scale(self):
+        with self.assertRaises(AssertionError):
+            from_bayesian_network(self.make_bayes_network(), scale=10)
+        self.assertEqual(len(from_bayesian_network(self.make_bayes_network(), scale=1000).outcomes.samples()), 26)
+
+    def test_from_markov_network(self):
+        model = self.make_markov_network()
+        rg = from_markov_network(model, value_name=lambda var, state: f"{var}({state})")
+
+        self.assertEqual(len(rg.outcomes.samples()), 4 + 4 + 2)
+        self.assertEqual(len(rg.factorized()), 3)
+        ab = rg.sample_builder().add_relation({("A", "A(0)"), ("B", "B(1)")}, "r").build()
+        self.assertEqual(rg.outcomes.count_of(ab), 100)
+        self.assert_same_joint(rg, model.get_factors())
+
+        zero = from_markov_network(MockModel([DiscreteFactor(["C"], [2], [3, 0])]))
+        self.assertEqual(list(zero.outcomes.items()), [(zero.sample_builder().build_single_node("C", "C(0)"), 3)])
+
+    def test_from_pgmpy_models(self):
+        bn = DiscreteBayesianNetwork([("D", "G"), ("I", "G")])
+        bn.add_cpds(
+            TabularCPD("D", 2, [[.6], [.4]], state_names={"D": ["easy", "hard"]}),
+            TabularCPD("I", 2, [[.7], [.3]], state_names={"I": ["low", "high"]}),
+            TabularCPD(
+                "G", 3, [[.3, .05, .9, .5], [.4, .25, .08, .3], [.3, .7, .02, .2]], ["I", "D"], [2, 2],
+                state_names={"G": ["A", "B", "C"], "I": ["low", "high"], "D": ["easy", "hard"]}))
+        self.assertTrue(bn.check_model())
+        rg = from_bayesian_network(bn)
+
+        self.assertEqual(dict(rg.variables)["D"], {"D(easy)", "D(hard)"})
+        self.assertEqual(len(rg.factorized()), 3)
+        g_outcome = rg.sample_builder() \
+            .add_relation({("I", "I(high)"), ("G", "G(C)")}, DirectedRelation("I", "G", "r")) \
+            .add_relation({("D", "D(easy)"), ("G", "G(C)")}, DirectedRelation("D", "G", "r")) \
+            .build()
+        self.assertEqual(rg.outcomes.count_of(g_outcome), 2)
+        self.assert_same_joint(rg, [cpd.to_factor() for cpd in bn.get_cpds()], lambda var, val: val[len(var) + 1:-1])
+
+        mn = DiscreteMarkovNetwork([("A", "B"), ("B", "C")])
+        mn.add_factors(*self.make_markov_network().get_factors())
+        self.assertTrue(mn.check_model())
+        rg = from_markov_network(mn)
+
+        self.assertEqual(len(rg.factorized()), 3)
+        self.assert_same_joint(rg, mn.get_factors())
+        self.assertEqual([f.variables for f in to_discrete_factors(rg)], [["A", "B"], ["B", "C"], ["C"]])
+
+    def test_to_discrete_factors(self):
+        model = self.make_markov_network()
+        factors = to_discrete_factors(from_markov_network(model))
+
+        self.assertEqual([f.variables for f in factors], [["A", "B"], ["B", "C"], ["C"]])
+        self.assertEqual(factors[0].state_names, {"A": ["A(0)", "A(1)"], "B": ["B(0)", "B(1)"]})
+        self.assertEqual(factors[0].get_value(A="A(1)", B="B(0)"), 100)
+        self.assertEqual(factors[2].values.tolist(), [3, 1])
+
+        bn_factors = to_discrete_factors(
+            from_bayesian_network(self.make_bayes_network()), {"D": ["D(1)", "D(0)"]})
+        self.assertEqual(len(bn_factors), 5)
+        self.assertEqual([f.variables for f in bn_factors], [["D", "G", "I"], ["D"], ["G", "L"], ["I", "S"], ["I"]])
+        self.assertEqual(bn_factors[1].state_names["D"], ["D(1)", "D(0)"])
+        self.assertEqual(bn_factors[1].values.tolist(), [40, 60])
+        self.assertEqual(bn_factors[2].values.sum(), 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import sys
+import unittest
+from copy import copy
+from unittest import mock
+
+from scripts.relnet.query_cache import QueryCache, estimate_size
+from scripts.relnet.relation_graph import RelationGraph
+from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.test.relnet import fixtures
+
+
+class TestQueryCache(unittest.TestCase):
+
+    bcp = fixtures.bcp_join
+
+    def test_init(self):
+        cache = QueryCache(max_entries=10, max_bytes=1000)
+        self.assertEqual(cache.max_entries, 10)
+        self.assertEqual(cache.max_bytes, 1000)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(str(cache), "QueryCache(entries = 0, hits = 0, misses = 0, evictions = 0, bytes = 0)")
+
+        with self.assertRaises(AssertionError):
+            QueryCache(max_entries=0)
+        with self.assertRaises(AssertionError):
+            QueryCache(max_bytes=0)
+        with self.assertRaises(AssertionError):
+            copy(cache)
+
+    def test_get_or_compute(self):
+        cache = QueryCache(max_bytes=10 ** 6)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"a": {"T": 0.5, "F": 0.5}}
+
+        first = cache.get_or_compute("k", compute)
+        second = cache.get_or_compute("k", compute)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.bytes, estimate_size(first))
+        self.assertGreater(cache.bytes, 0)
+
+        cache.clear()
+        self.assertEqual(cache.stats(), {"entries": 0, "hits": 1, "misses": 1, "evictions": 0, "bytes": 0})
+
+    def test_size_not_estimated_without_max_bytes(self):
+        cache = QueryCache()
+        with mock.patch("scripts.relnet.query_cache.estimate_size") as estimate:
+            cache.get_or_compute("k", lambda: [0] * 10)
+        estimate.assert_not_called()
+        self.assertEqual(cache.bytes, 0)
+
+    def test_lru_eviction(self):
+        cache = QueryCache(max_entries=2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("b", lambda: 2)
+        cache.get_or_compute("a", lambda: 1)  # "b" become least recently used
+        cache.get_or_compute("c", lambda: 3)
+
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.get_or_compute("a", lambda: -1), 1)
+        self.assertEqual(cache.get_or_compute("b", lambda: -2), -2)
+
+    def test_size_eviction(self):
+        cache = QueryCache(max_bytes=estimate_size([0] * 10) + estimate_size([1] * 10))
+        cache.get_or_compute("a", lambda: [0] * 10)
+        cache.get_or_compute("b", lambda: [1] * 10)
+        self.assertEqual(len(cache), 2)
+
+        cache.get_or_compute("c", lambda: [2] * 20)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.evictions, 2)
+        self.assertLessEqual(cache.bytes, cache.max_bytes)
+
+        cache.get_or_compute("d", lambda: [3] * 100)  # Bigger than cache, so not kept
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.bytes, 0)
+
+    def test_estimate_size(self):
+        sample = next(iter(fixtures.ab_samples.samples()))
+        self.assertEqual(estimate_size(sample), estimate_size(next(iter(fixtures.bc_samples.samples()))))
+        self.assertGreater(estimate_size(fixtures.expected_ab_bc_joint_b), estimate_size(fixtures.ab_samples))
+        self.assertEqual(estimate_size(self.bcp), 0)
+
+        abc = SampleGraphBuilder(self.bcp).add_relation({("a", "T"), ("b", "T")}, "r") \
+            .add_relation({("b", "T"), ("c", "T")}, "r").build()
+        self.assertGreater(estimate_size(sample), sys.getsizeof(sample) + sys.getsizeof(sample.edges))
+        self.assertGreater(estimate_size(abc), estimate_size(sample))
+        self.assertEqual(estimate_size([sample, sample]), sys.getsizeof([sample, sample]) + estimate_size(sample))
+
+    def test_estimate_size_of_cached_results(self):
+        cache = QueryCache()
+        rg = RelationGraph(self.bcp, "ab_bc", fixtures.ab_bc_samples, cache)
+        filler = cache.get_or_compute("filler", lambda: list(range(10000)))
+        evidence = SampleGraphBuilder(self.bcp).build_single_node("b", "T")
+
+        cg = rg.conditional_graph(evidence)  # Other entries of cache are not counted
+        self.assertLess(estimate_size(cg), estimate_size(filler))
+        self.assertGreater(estimate_size(cg), sum(estimate_size(o) for o in cg.outcomes.samples()))
+
+        view = rg.conditional_graph(evidence, view=True).outcomes  # Base list of graph outcomes is not counted
+        self.assertLess(estimate_size(view), estimate_size(rg.outcomes))
+
+    def test_relation_graph_queries(self):
+        cache = QueryCache()
+        rg = RelationGraph(self.bcp, "ab_bc", fixtures.ab_bc_samples, cache)
+        evidence = SampleGraphBuilder(self.bcp).build_single_node("b", "T")
+
+        cg = rg.conditional_graph(evidence)
+        self.assertIs(rg.conditional_graph(SampleGraphBuilder(self.bcp).build_single_node("b", "T")), cg)
+        self.assertIs(cg.query_cache, cache)
+        self.assertIs(cg.activation_graph(), cg.activation_graph())
+        self.assertEqual(cache.hits, 2)
+
+        marginals = rg.query(evidence=evidence)
+        marginals["a"]["T"] = 2.0  # Cached result should not be changed by caller
+        self.assertEqual(rg.query(evidence=evidence), rg.make_joined().conditional_graph(evidence)
+                         .marginal_variables_probability())
+        self.assertEqual(cg.marginal_variables_probability(), cg.marginal_variables_probability())
+        self.assertEqual(cache.hits, 4)
+
+    def test_shared_cache(self):
+        cache = QueryCache()
+        rg_1 = RelationGraph(self.bcp, "rg_1", fixtures.ab_samples, cache)
+        rg_2 = RelationGraph(self.bcp, "rg_2", fixtures.bc_samples, cache)
+
+        self.assertEqual(rg_1.marginal_variables_probability(), RelationGraph(
+            self.bcp, "rg_1", fixtures.ab_samples).marginal_variables_probability())
+        self.assertEqual(rg_2.marginal_variables_probability(), RelationGraph(
+            self.bcp, "rg_2", fixtures.bc_samples).marginal_variables_probability())
+        self.assertEqual(cache.misses, 2)
+        self.assertIsNone(rg_1.make_joined().query_cache)
+        self.assertIs(rg_1.conditional_graph(fixtures.sample_set(self.bcp, [([("a", "T", "b", "F")], 1)])
+                                             .samples().pop()).relation_graph().query_cache, cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
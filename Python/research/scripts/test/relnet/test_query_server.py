@@ -0,0 +1,235 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+from unittest import mock
+
+from scripts.relnet.query_server import QueryServer, ServerMetrics, view_to_json, json_to_view, init_worker, \
+    _execute_batch
+from scripts.relnet.relation_graph import RelationGraph
+from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.relnet.sample_set import SampleSetView
+from scripts.test.relnet import fixtures
+
+
+async def http(server, method, path, body=None):
+    address = server.address
+    reader, writer = await asyncio.open_unix_connection(address) if isinstance(address, str) \
+        else await asyncio.open_connection(*address)
+    payload = json.dumps(body).encode("utf-8") if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nContent-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload)
+    await writer.drain()
+    status_line = await reader.readline()
+    response = await reader.read()
+    writer.close()
+    return int(status_line.split()[1]), json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+async def raw_http(server, data):
+    reader, writer = await asyncio.open_connection(*server.address)
+    writer.write(data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return int(response.split(b" ", 2)[1]), json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+class TestQueryServer(unittest.IsolatedAsyncioTestCase):
+
+    bcp = fixtures.bcp_join
+    rg = RelationGraph(bcp, "ab_bc", fixtures.ab_bc_samples)
+    b_t = SampleGraphBuilder(bcp).build_single_node("b", "T")
+    a_t_b_f = SampleGraphBuilder(bcp).add_relation({("a", "T"), ("b", "F")}, "r").build()
+
+    async def asyncSetUp(self):
+        self.server = await QueryServer(self.rg, batch_window=0.01).start()
+
+    async def asyncTearDown(self):
+        await self.server.stop()
+
+    def test_view_codec(self):
+        for sample in [self.b_t, self.a_t_b_f, SampleGraphBuilder(self.bcp).build_empty()]:
+            encoded = json.loads(json.dumps(view_to_json(sample.edges_set_view())))
+            self.assertEqual(json_to_view(encoded), sample.edges_set_view())
+
+        with self.assertRaises(AssertionError):
+            json_to_view([])
+        with self.assertRaises(AssertionError):
+            json_to_view(["a", "T", "F"])
+        with self.assertRaises(AssertionError):
+            json_to_view([[["a", "T"]], "r"])
+
+    def test_init(self):
+        self.assertEqual(self.server.address[0], "127.0.0.1")
+        self.assertEqual(str(self.server), f"QueryServer(graph = ab_bc, address = {self.server.address})")
+        with self.assertRaises(AssertionError):
+            copy(self.server)
+
+    async def test_marginals(self):
+        status, result = await http(self.server, "POST", "/query", {"query": "marginals", "evidence": ["b", "T"]})
+        self.assertEqual(status, 200)
+        self.assertEqual(result, self.rg.conditional_graph(self.b_t).marginal_variables_probability())
+
+        result = await self.server.query({"query": "marginals", "evidence": None, "variables": ["a"]})
+        self.assertEqual(result, self.rg.marginal_variables_probability({"a"}))
+
+    async def test_conditional(self):
+        evidence = view_to_json(self.b_t.edges_set_view())
+        result = await self.server.query({"query": "conditional", "evidence": evidence, "limit": 2})
+        expected = self.rg.conditional_graph(self.b_t).outcomes
+
+        self.assertEqual(result["number_of_outcomes"], expected.length)
+        self.assertEqual(result["number_of_samples"], len(expected.samples()))
+        self.assertEqual(len(result["outcomes"]), 2)
+        for view, count in result["outcomes"]:
+            self.assertEqual(expected.count_of(self.rg.sample_builder().build_from_view(json_to_view(view))), count)
+
+    async def test_folded(self):
+        result = await self.server.query({"query": "folded", "evidence": ["b", "T"]})
+        folded = self.rg.conditional_graph(self.b_t).folded_graph()
+
+        self.assertEqual(result["number_of_outcomes"], folded.number_of_outcomes)
+        for node in result["nodes"]:
+            self.assertEqual(
+                node["values"], {vn.value: c for vn, c in folded.folded_node(node["variable"]).value_nodes})
+        self.assertEqual(len(result["edges"]), len(folded.edges))
+
+    async def test_activation(self):
+        result = await self.server.query({"query": "activation", "evidence": ["b", "T"], "relation_filter": ["r"]})
+        activation = self.rg.conditional_graph(self.b_t).activation_graph({"r"})
+
+        self.assertEqual(
+            {n["variable"]: (n["values"], n["in_query"]) for n in result["nodes"]},
+            {n.variable: (dict(n.values), n.in_query) for n in activation.nodes})
+        self.assertEqual(len(result["edges"]), len(activation.edges))
+
+        with self.assertRaises(AssertionError):  # Activation require evidence
+            await self.server.query({"query": "activation", "evidence": None})
+
+    async def test_micro_batching(self):
+        requests = [
+            {"query": q, "evidence": e}
+            for q in ["marginals", "folded", "conditional"] for e in [["b", "T"], ["b", "F"], ["d", "F"]]] * 4
+        results = await asyncio.gather(*[http(self.server, "POST", "/query", r) for r in requests])
+
+        self.assertEqual([s for s, _ in results], [200] * len(requests))
+        self.assertEqual(results[:9] * 4, results)
+        metrics = self.server.metrics.snapshot()
+        self.assertEqual(metrics["requests"], len(requests))
+        self.assertLess(metrics["batches"], len(requests))
+        self.assertGreater(metrics["mean_batch_size"], 1)
+
+    async def test_errors(self):
+        status, result = await http(self.server, "POST", "/query", {"query": "marginals", "evidence": ["x", "T"]})
+        self.assertEqual(status, 400)
+        self.assertIn("Invalid evidence", result["error"])
+
+        status, _ = await http(self.server, "POST", "/query", {"query": "unknown"})
+        self.assertEqual(status, 400)
+        status, _ = await http(self.server, "GET", "/unknown")
+        self.assertEqual(status, 404)
+
+        self.assertEqual(self.server.metrics.errors, 1)
+
+    async def test_malformed_http(self):
+        for data in [b"GARBAGE\r\n\r\n",
+                     b"POST /query HTTP/1.1\r\nContent-Length: abc\r\n\r\n",
+                     b"POST /query HTTP/1.1\r\nContent-Length: -1\r\n\r\n"]:
+            status, result = await raw_http(self.server, data)
+            self.assertEqual(status, 400)
+            self.assertIn("Malformed request", result["error"])
+
+    async def test_body_too_large(self):
+        server = await QueryServer(self.rg, max_body_size=16).start()
+        try:
+            status, result = await raw_http(server, b"POST /query HTTP/1.1\r\nContent-Length: 1000000000\r\n\r\n")
+            self.assertEqual(status, 413)
+            self.assertIn("exceeds limit of 16", result["error"])
+            status, _ = await http(server, "POST", "/query", {"query": "marginals"})  # 21 bytes
+            self.assertEqual(status, 413)
+        finally:
+            await server.stop()
+
+    def test_batch_conditioned_once_per_evidence(self):
+        graph = RelationGraph(self.bcp, "ab_bc", fixtures.ab_bc_samples)
+        requests = [
+            {"query": q, "evidence": e, "limit": limit}
+            for q in ["marginals", "folded", "conditional", "activation"] for e in [["b", "T"], ["b", "F"]]
+            for limit in [1, 2]]
+
+        with mock.patch.object(graph, "conditional_graph", wraps=graph.conditional_graph) as conditional_graph:
+            results = _execute_batch(graph, requests + [{"query": "marginals", "evidence": None}])
+
+        self.assertTrue(all(is_success for is_success, _ in results))
+        self.assertEqual(conditional_graph.call_count, 2)
+
+    def test_outcomes_view_once_per_graph(self):
+        graph = RelationGraph(self.bcp, "ab_bc", fixtures.ab_bc_samples)
+        with mock.patch.object(SampleSetView, "of", wraps=SampleSetView.of) as view_of:
+            for value in ["T", "F", "T"]:
+                results = _execute_batch(graph, [{"query": "marginals", "evidence": ["a", value]}])
+                self.assertTrue(all(is_success for is_success, _ in results))
+        self.assertEqual(view_of.call_count, 1)
+
+    async def test_metrics_and_describe(self):
+        await self.server.query({"query": "marginals", "evidence": None})
+        status, metrics = await http(self.server, "GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertEqual(metrics["requests"], 1)
+        self.assertGreater(metrics["latency_p99"], 0)
+        self.assertGreater(metrics["throughput"], 0)
+
+        status, describe = await http(self.server, "GET", "/describe")
+        self.assertEqual(describe["number_of_outcomes"], self.rg.outcomes.length)
+
+        self.assertEqual(str(ServerMetrics()), "ServerMetrics(requests = 0, errors = 0, batches = 0)")
+        self.assertIsNone(ServerMetrics().snapshot()["latency_p50"])
+
+    @unittest.skipIf(not hasattr(asyncio, "start_unix_server"), "Unix sockets are not supported")
+    async def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            server = await QueryServer(self.rg, unix_path=os.path.join(directory, "relnet.sock")).start()
+            try:
+                status, result = await http(server, "POST", "/query", {"query": "marginals", "evidence": None})
+                self.assertEqual(status, 200)
+                self.assertEqual(result, self.rg.marginal_variables_probability())
+            finally:
+                await server.stop()
+
+    async def test_process_pool(self):
+        executor = ProcessPoolExecutor(max_workers=2, initializer=init_worker, initargs=(self.rg,))
+        server = await QueryServer(self.rg, executor=executor).start()
+        try:
+            result = await server.query({"query": "marginals", "evidence": ["b", "T"]})
+            self.assertEqual(result, self.rg.conditional_graph(self.b_t).marginal_variables_probability())
+        finally:
+            await server.stop()
+            executor.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from scripts.relnet.graph_components import DirectedRelation
+from scripts.relnet.records import read_jsonl, read_csv, deduplicate, view_to_json, RecordsDecoder, IngestionStats, \
+    CSV_COLUMNS, component_to_json, json_to_component, json_to_view
+from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.test.relnet import fixtures
+
+
+class TestRecords(unittest.TestCase):
+
+    bcp = fixtures.bcp_join
+    ab = frozenset({(frozenset({("a", "T"), ("b", "F")}), "r")})
+    abc = frozenset({(frozenset({("a", "T"), ("b", "F")}), "r"), (frozenset({("b", "F"), ("c", "T")}), "s")})
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read_jsonl(self):
+        path = os.path.join(self.directory.name, "records.jsonl")
+        with open(path, "w") as f:
+            f.write(json.dumps({"outcome": view_to_json(self.ab), "count": 2}) + "\n\n")
+            f.write(json.dumps({"outcome": ["a", "T"]}) + "\n")
+            f.write(json.dumps({"outcome": view_to_json(self.abc), "count": 3}) + "\n")
+
+        self.assertEqual(list(read_jsonl(path)), [(self.ab, 2), (("a", "T"), 1), (self.abc, 3)])
+
+        with open(path, "a") as f:
+            f.write(json.dumps({"count": 3}) + "\n")
+        with self.assertRaises(AssertionError):
+            list(read_jsonl(path))
+
+    def test_component_json(self):
+        for component in ["a", 1, 2.5, True, None, ("a", 1), DirectedRelation("a", ("b", 2), "r")]:
+            encoded = json.loads(json.dumps(component_to_json(component)))
+            self.assertEqual(json_to_component(encoded), component)
+        self.assertEqual(component_to_json(DirectedRelation("a", "b", "r")), {"directed": ["a", "b", "r"]})
+
+        view = frozenset({(frozenset({("a", 1), ("b", ("x", 2))}), DirectedRelation("a", "b", "r"))})
+        self.assertEqual(json_to_view(json.loads(json.dumps(view_to_json(view)))), view)
+
+        with self.assertRaises(AssertionError):  # Not JSON encodable
+            component_to_json(frozenset({"a"}))
+        with self.assertRaises(AssertionError):  # Unknown object
+            json_to_component({"set": ["a"]})
+        with self.assertRaises(AssertionError):
+            json_to_component(["a"])
+
+    def test_read_csv(self):
+        path = os.path.join(self.directory.name, "records.csv")
+        with open(path, "w") as f:
+            f.write(",".join(CSV_COLUMNS) + "\n")
+            f.write("1,a,T,b,F,r,2\n")
+            f.write("2,a,T,,,,\n")
+            f.write("3,a,T,b,F,r,3\n")
+            f.write("3,b,F,c,T,s,\n")
+            f.write("4,a,T,b,F,r,\n")
+
+        self.assertEqual(list(read_csv(path)), [(self.ab, 2), (("a", "T"), 1), (self.abc, 3), (self.ab, 1)])
+
+        with open(path, "w") as f:
+            f.write("record,variable\n1,a\n")
+        with self.assertRaises(AssertionError):
+            list(read_csv(path))
+
+    def test_deduplicate(self):
+        self.assertEqual(
+            deduplicate([(self.ab, 2), (("a", "T"), 1), (self.ab, 3)]),
+            {self.ab: 5, ("a", "T"): 1})
+
+    def test_decoder(self):
+        decoder = RecordsDecoder(self.bcp)
+        for view in [self.ab, self.abc, ("a", "T")]:
+            sample = decoder.decode(view)
+            self.assertEqual(sample, SampleGraphBuilder(self.bcp).build_from_view(view))
+            self.assertTrue(sample.is_compatible(self.bcp))
+        self.assertEqual(str(decoder), "RecordsDecoder(number_of_nodes = 3, number_of_edges = 2)")
+
+        not_connected = frozenset({
+            (frozenset({("a", "T"), ("b", "F")}), "r"), (frozenset({("c", "T"), ("d", "F")}), "r")})
+        with self.assertRaises(AssertionError):
+            decoder.decode(not_connected)
+        self.assertEqual(len(RecordsDecoder(self.bcp, validate_connectivity=False).decode(not_connected).nodes), 4)
+        with self.assertRaises(AssertionError):  # Unknown value
+            decoder.decode(("a", "X"))
+        with self.assertRaises(AssertionError):  # Same variable at both ends
+            decoder.decode(frozenset({(frozenset({("a", "T"), ("a", "F")}), "r")}))
+
+    def test_stats(self):
+        stats = IngestionStats()
+        self.assertEqual(stats.records_per_second(), 0.0)
+        stats.records, stats.elapsed = 10, 2.0
+        self.assertEqual(stats.records_per_second(), 5.0)
+        self.assertEqual(
+            str(stats), "IngestionStats(records = 10, unique_records = 0, batches = 0, records_per_second = 5.0)")
+
+
+if __name__ == '__main__':
+    unittest.main()
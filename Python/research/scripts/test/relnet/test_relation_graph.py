@@ -20,13 +20,10 @@ created: 2021-10-26
 
 import unittest
 
-from typing import List, Tuple
-
-from scripts.relnet.graph_components import SampleGraphComponentsProvider
 from scripts.relnet.relation_graph import BuilderComponentsProvider, RelationGraphBuilder, RelationGraph
 from scripts.relnet.sample_graph import SampleGraphBuilder
 from scripts.relnet.sample_set import SampleSet, SampleSetBuilder
-from scripts.test.relnet.test_graph_components import MockSampleGraphComponentsProvider
+from scripts.test.relnet import fixtures
 
 
 class TestRelationGraphBuilder(unittest.TestCase):
@@ -93,6 +90,30 @@ class TestRelationGraphBuilder(unittest.TestCase):
         b_1.add_outcomes([self.o_1, self.o_1, self.o_1])
         self.assertEqual(b_1.build().outcomes.items(), {(self.o_1, 3)})
 
+    def test_add_outcomes_from_records(self):
+        ab = frozenset({(frozenset({("a", "1"), ("b", "2")}), "r")})
+        ab_s = frozenset({(frozenset({("a", "2"), ("b", "3")}), "s")})
+        records = [(ab, 1), (("a", "1"), 2), (ab, 3), (ab_s, 1), (("a", "1"), 1)]
+        reported = []
+
+        b_1 = RelationGraphBuilder(None, None, "b_1", SampleSetBuilder(self.bcp, {}), self.bcp)
+        b_1.add_outcomes_from_records(iter(records), batch_size=3, progress=lambda s: reported.append(s.records))
+
+        b_2 = RelationGraphBuilder(None, None, "b_2", SampleSetBuilder(self.bcp, {}), self.bcp)
+        for view, count in records:
+            b_2.add_outcome(b_2.sample_builder().build_from_view(view), count)
+
+        self.assertEqual(b_1.build().outcomes, b_2.build().outcomes)
+        self.assertEqual(reported, [3, 5])
+        self.assertEqual(b_1.ingestion_stats.records, 5)
+        self.assertEqual(b_1.ingestion_stats.unique_records, 4)  # Two ab records merged in first batch
+        self.assertEqual(b_1.ingestion_stats.batches, 2)
+
+        with self.assertRaises(AssertionError):  # Expect count be >= 1
+            b_1.add_outcomes_from_records([(ab, 0)])
+        with self.assertRaises(AssertionError):
+            b_1.add_outcomes_from_records(records, batch_size=0)
+
     def test_sample_builder(self):
         sb_1 = self.b_1.sample_builder()
         s_1 = sb_1.build_single_node("a", "2")
@@ -304,82 +325,14 @@ class TestRelationGraph(unittest.TestCase):
     o_k_0 = SampleGraphBuilder(bcp).set_name("o_k_0").build_empty()
     rg_1 = RelationGraph(bcp, "rg_1", SampleSet(bcp, {o_1: 1, o_2: 2}))
 
-    bcp_join = MockSampleGraphComponentsProvider(
-        {"a": {"T", "F"}, "b": {"T", "F"}, "c": {"T", "F"}, "d": {"T", "F"}}, {"r", "s"})
-
-    @staticmethod
-    def sample_set(
-            bcp_join: SampleGraphComponentsProvider, desc: List[Tuple[List[Tuple[str, str, str, str]], int]]
-    ) -> SampleSet:
-        ssb = SampleSetBuilder(bcp_join)
-        for sample_edges, count in desc:
-            sb = SampleGraphBuilder(bcp_join)
-            for s_var, s_val, t_var, t_val in sample_edges:
-                sb.add_relation({(s_var, s_val), (t_var, t_val)}, "r")
-            ssb.add(sb.build(), count)
-        return ssb.build()
-
-    ab_samples = sample_set(bcp_join, [
-        ([("a", "T", "b", "T")], 2),
-        ([("a", "T", "b", "F")], 3),
-        ([("a", "F", "b", "T")], 4),
-        ([("a", "F", "b", "F")], 5)])
-
-    bc_samples = sample_set(bcp_join, [
-        ([("b", "T", "c", "T")], 6),
-        ([("b", "T", "c", "F")], 7),
-        ([("b", "F", "c", "T")], 8),
-        ([("b", "F", "c", "F")], 9)])
-
-    ca_samples = sample_set(bcp_join, [
-        ([("c", "T", "a", "T")], 10),
-        ([("c", "T", "a", "F")], 11),
-        ([("c", "F", "a", "T")], 12),
-        ([("c", "F", "a", "F")], 13)])
-
-    bd_samples = sample_set(bcp_join, [
-        ([("b", "T", "d", "T")], 14),
-        ([("b", "T", "d", "F")], 15),
-        ([("b", "F", "d", "T")], 16),
-        ([("b", "F", "d", "F")], 17)])
-
-    expected_ab_bc_joint_b = sample_set(bcp_join, [
-        ([("a", "T", "b", "T"), ("b", "T", "c", "T")], 2 * 6),
-        ([("a", "T", "b", "T"), ("b", "T", "c", "F")], 2 * 7),
-        ([("a", "T", "b", "F"), ("b", "F", "c", "T")], 3 * 8),
-        ([("a", "T", "b", "F"), ("b", "F", "c", "F")], 3 * 9),
-        ([("a", "F", "b", "T"), ("b", "T", "c", "T")], 4 * 6),
-        ([("a", "F", "b", "T"), ("b", "T", "c", "F")], 4 * 7),
-        ([("a", "F", "b", "F"), ("b", "F", "c", "T")], 5 * 8),
-        ([("a", "F", "b", "F"), ("b", "F", "c", "F")], 5 * 9)])
-
-    expected_ab_bc_ca_joint_abc = sample_set(bcp_join, [  # Triangle
-        ([("a", "T", "b", "T"), ("b", "T", "c", "T"), ("c", "T", "a", "T")], 2 * 6 * 10),
-        ([("a", "T", "b", "T"), ("b", "T", "c", "F"), ("c", "F", "a", "T")], 2 * 7 * 12),
-        ([("a", "T", "b", "F"), ("b", "F", "c", "T"), ("c", "T", "a", "T")], 3 * 8 * 10),
-        ([("a", "T", "b", "F"), ("b", "F", "c", "F"), ("c", "F", "a", "T")], 3 * 9 * 12),
-        ([("a", "F", "b", "T"), ("b", "T", "c", "T"), ("c", "T", "a", "F")], 4 * 6 * 11),
-        ([("a", "F", "b", "T"), ("b", "T", "c", "F"), ("c", "F", "a", "F")], 4 * 7 * 13),
-        ([("a", "F", "b", "F"), ("b", "F", "c", "T"), ("c", "T", "a", "F")], 5 * 8 * 11),
-        ([("a", "F", "b", "F"), ("b", "F", "c", "F"), ("c", "F", "a", "F")], 5 * 9 * 13)])
-
-    expected_ab_bc_bd_joint_abc = sample_set(bcp_join, [  # Star
-        ([("a", "T", "b", "T"), ("b", "T", "c", "T"), ("b", "T", "d", "T")], 2 * 6 * 14),
-        ([("a", "T", "b", "T"), ("b", "T", "c", "T"), ("b", "T", "d", "F")], 2 * 6 * 15),
-        ([("a", "T", "b", "T"), ("b", "T", "c", "F"), ("b", "T", "d", "T")], 2 * 7 * 14),
-        ([("a", "T", "b", "T"), ("b", "T", "c", "F"), ("b", "T", "d", "F")], 2 * 7 * 15),
-        ([("a", "T", "b", "F"), ("b", "F", "c", "T"), ("b", "F", "d", "T")], 3 * 8 * 16),
-        ([("a", "T", "b", "F"), ("b", "F", "c", "T"), ("b", "F", "d", "F")], 3 * 8 * 17),
-        ([("a", "T", "b", "F"), ("b", "F", "c", "F"), ("b", "F", "d", "T")], 3 * 9 * 16),
-        ([("a", "T", "b", "F"), ("b", "F", "c", "F"), ("b", "F", "d", "F")], 3 * 9 * 17),
-        ([("a", "F", "b", "T"), ("b", "T", "c", "T"), ("b", "T", "d", "T")], 4 * 6 * 14),
-        ([("a", "F", "b", "T"), ("b", "T", "c", "T"), ("b", "T", "d", "F")], 4 * 6 * 15),
-        ([("a", "F", "b", "T"), ("b", "T", "c", "F"), ("b", "T", "d", "T")], 4 * 7 * 14),
-        ([("a", "F", "b", "T"), ("b", "T", "c", "F"), ("b", "T", "d", "F")], 4 * 7 * 15),
-        ([("a", "F", "b", "F"), ("b", "F", "c", "T"), ("b", "F", "d", "T")], 5 * 8 * 16),
-        ([("a", "F", "b", "F"), ("b", "F", "c", "T"), ("b", "F", "d", "F")], 5 * 8 * 17),
-        ([("a", "F", "b", "F"), ("b", "F", "c", "F"), ("b", "F", "d", "T")], 5 * 9 * 16),
-        ([("a", "F", "b", "F"), ("b", "F", "c", "F"), ("b", "F", "d", "F")], 5 * 9 * 17)])
+    bcp_join = fixtures.bcp_join
+    ab_samples = fixtures.ab_samples
+    bc_samples = fixtures.bc_samples
+    ca_samples = fixtures.ca_samples
+    bd_samples = fixtures.bd_samples
+    expected_ab_bc_joint_b = fixtures.expected_ab_bc_joint_b
+    expected_ab_bc_ca_joint_abc = fixtures.expected_ab_bc_ca_joint_abc
+    expected_ab_bc_bd_joint_abc = fixtures.expected_ab_bc_bd_joint_abc
 
     def test_init(self):
         rg_1 = RelationGraph(self.bcp, "rg_1",  SampleSet(self.bcp, {self.o_1: 1,  self.o_2: 2}))
@@ -518,6 +471,90 @@ class TestRelationGraph(unittest.TestCase):
         self.assertFalse(
             RelationGraph(self.bcp, "rg_5", SampleSet(self.bcp, {self.o_k_0: 1, o_abc: 2})).is_factorized())
 
+    def test_factorized_cached(self):
+        rg = RelationGraph(self.bcp_join, "rg", self.ab_samples.union(self.bc_samples))
+
+        self.assertTrue(rg.is_factorized())
+        factors = rg.factorized()
+        self.assertEqual(factors, frozenset({self.ab_samples, self.bc_samples}))
+        self.assertIs(rg.factorized(), factors)
+        self.assertTrue(rg.is_factorized())
+
+        o_abc = SampleGraphBuilder(self.bcp_join) \
+            .add_relation({("a", "T"), ("b", "T")}, "r") \
+            .add_relation({("b", "T"), ("c", "T")}, "r") \
+            .build()
+        rg_not_factorized = RelationGraph(
+            self.bcp_join, None, self.ab_samples.union(SampleSet(self.bcp_join, {o_abc: 1})))
+
+        self.assertFalse(rg_not_factorized.is_factorized())
+        with self.assertRaises(AssertionError):
+            rg_not_factorized.factorized()
+
+    def test_query(self):
+        ab_bc = RelationGraph(self.bcp_join, "ab_bc", self.ab_samples.union(self.bc_samples))
+        ab_bc_ca = RelationGraph(self.bcp_join, "ab_bc_ca", ab_bc.outcomes.union(self.ca_samples))
+        ab_bc_bd = RelationGraph(self.bcp_join, "ab_bc_bd", ab_bc.outcomes.union(self.bd_samples))
+        evidences = [
+            SampleGraphBuilder(self.bcp_join).build_single_node("b", "T"),
+            SampleGraphBuilder(self.bcp_join).add_relation({("a", "T"), ("b", "F")}, "r").build(),
+            SampleGraphBuilder(self.bcp_join).build_single_node("d", "F")]
+
+        for rg in [ab_bc, ab_bc_ca, ab_bc_bd]:
+            self.assertEqual(rg.query(), rg.make_joined().marginal_variables_probability())
+            self.assertEqual(rg.query({"a", "x"}), rg.make_joined().marginal_variables_probability({"a"}))
+            for evidence in evidences:
+                self.assertEqual(
+                    rg.query(evidence=evidence),
+                    rg.conditional_graph(evidence).relation_graph().make_joined().marginal_variables_probability())
+
+        with self.assertRaises(AssertionError):  # Not compatible evidence
+            ab_bc.query(evidence=self.o_1)
+        with self.assertRaises(AssertionError):  # Not factorized
+            RelationGraph(self.bcp_join, None, ab_bc.make_joined().outcomes.union(self.bc_samples)).query()
+
+    def test_most_probable_outcome(self):
+        ab_bc = RelationGraph(self.bcp_join, "ab_bc", self.ab_samples.union(self.bc_samples))
+        ab_bc_ca = RelationGraph(self.bcp_join, "ab_bc_ca", ab_bc.outcomes.union(self.ca_samples))
+        ab_bc_bd = RelationGraph(self.bcp_join, "ab_bc_bd", ab_bc.outcomes.union(self.bd_samples))
+        a_ab_bc = RelationGraph(self.bcp_join, "a_ab_bc", ab_bc.outcomes.union(SampleSet(self.bcp_join, {
+            SampleGraphBuilder(self.bcp_join).build_single_node("a", "T"): 3,
+            SampleGraphBuilder(self.bcp_join).build_single_node("a", "F"): 1})))  # With root (single node) factor
+        self.assertTrue(a_ab_bc.is_factorized())
+        evidences = [
+            None,
+            SampleGraphBuilder(self.bcp_join).build_single_node("b", "T"),
+            SampleGraphBuilder(self.bcp_join).add_relation({("a", "T"), ("b", "F")}, "r").build(),
+            SampleGraphBuilder(self.bcp_join).build_single_node("d", "F"),
+            SampleGraphBuilder(self.bcp_join)
+            .add_relation({("a", "F"), ("b", "T")}, "r")
+            .add_relation({("b", "T"), ("c", "F")}, "r")
+            .build(),
+            SampleGraphBuilder(self.bcp_join).add_relation({("b", "T"), ("d", "F")}, "r").build()]
+
+        for rg in [ab_bc, ab_bc_ca, ab_bc_bd, a_ab_bc]:
+            joined = rg.make_joined()
+            for evidence in evidences:
+                expected = joined.conditional_graph(evidence).outcomes if evidence is not None else joined.outcomes
+                for graph in [rg, joined]:  # Factorized and already joined (searched by heap)
+                    result = graph.most_probable_outcome(evidence)
+                    if expected:
+                        outcome, count = result
+                        self.assertEqual(count, max(c for _, c in expected.items()))
+                        self.assertEqual(expected.count_of(outcome), count)
+                    else:
+                        self.assertIsNone(result)
+
+        with self.assertRaises(AssertionError):  # Partially joined, max count outcome is factor outcome
+            RelationGraph(self.bcp_join, None, ab_bc.make_joined().outcomes.union(self.bc_samples))\
+                .most_probable_outcome()
+
+        rg_empty = RelationGraph(self.bcp_join, None, SampleSetBuilder(self.bcp_join).empty())
+        self.assertIsNone(rg_empty.most_probable_outcome())
+
+        with self.assertRaises(AssertionError):  # Not compatible evidence
+            ab_bc.most_probable_outcome(self.o_1)
+
     def test_make_joined(self):
         rg_empty = RelationGraph(self.bcp_join, None, SampleSetBuilder(self.bcp_join).empty())
         rg_empty_joined = rg_empty.make_joined()
@@ -534,6 +571,19 @@ class TestRelationGraph(unittest.TestCase):
         ab_bc_bd_ss = RelationGraph(self.bcp_join, None, self.ab_samples.union(self.bc_samples).union(self.bd_samples))
         self.assertEqual(ab_bc_bd_ss.make_joined().outcomes, self.expected_ab_bc_bd_joint_abc)
 
+    def test_make_joined_in_processes(self):
+        ab_bc_ss = RelationGraph(self.bcp_join, None, self.ab_samples.union(self.bc_samples))
+        self.assertEqual(ab_bc_ss.make_joined(processes=2).outcomes, self.expected_ab_bc_joint_b)
+
+        ab_bc_ca_ss = RelationGraph(self.bcp_join, None, self.ab_samples.union(self.bc_samples).union(self.ca_samples))
+        self.assertEqual(ab_bc_ca_ss.make_joined(processes=2).outcomes, self.expected_ab_bc_ca_joint_abc)
+
+        ab_bc_bd_ss = RelationGraph(self.bcp_join, None, self.ab_samples.union(self.bc_samples).union(self.bd_samples))
+        joined = ab_bc_bd_ss.make_joined("joined", processes=3)
+        self.assertEqual(joined.name, "joined")
+        self.assertEqual(joined.outcomes, self.expected_ab_bc_bd_joint_abc)
+        self.assertTrue(all(o.is_compatible(self.bcp_join) for o in joined.outcomes.samples()))
+
 
 if __name__ == '__main__':
     unittest.main()
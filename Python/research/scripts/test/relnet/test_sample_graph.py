@@ -134,6 +134,17 @@ class TestSampleGraphBuilder(unittest.TestCase):
             validate_connectivity=False)  # Should not fail even when passes disconnected graph
         self.assertEqual(s_2.name, "s_2")
 
+    def test_build_from_view(self):
+        s_1 = SampleGraphBuilder(self.builder).build_from_edges(frozenset({
+            (frozenset({("a", "1"), ("b", "1")}), "r"),
+            (frozenset({("b", "1"), ("c", "1")}), "r")}))
+        s_2 = SampleGraphBuilder(self.builder).build_single_node("a", "1")
+        s_3 = SampleGraphBuilder(self.builder).build_empty()
+
+        self.assertEqual(SampleGraphBuilder(self.builder).build_from_view(s_1.edges_set_view()), s_1)
+        self.assertEqual(SampleGraphBuilder(self.builder).build_from_view(s_2.edges_set_view()), s_2)
+        self.assertEqual(SampleGraphBuilder(self.builder).build_from_view(s_3.edges_set_view()), s_3)
+
     def test_add_relation(self):
         b_1 = SampleGraphBuilder(self.builder) \
             .add_relation({("a", "1"), ("b", "1")}, "r") \
@@ -301,6 +312,39 @@ class TestSampleGraph(unittest.TestCase):
         self.assertTrue(self.s_1.is_compatible(self.builder))
         self.assertFalse(self.s_1.is_compatible(copy(self.builder)))
 
+    def test_fingerprint(self):
+        other = MockSampleGraphComponentsProvider(
+            {"a": {"1", "5"}, "b": {"1", "7"}, "c": {"1"}, "d": {"1"}, "f": {"1"}}, {"r", "g", "b"})
+        s_3 = SampleGraphBuilder(other) \
+            .add_relation({("a", "1"), ("d", "1")}, "b") \
+            .add_relation({("a", "1"), ("c", "1")}, "g") \
+            .add_relation({("a", "1"), ("b", "1")}, "r") \
+            .build()
+        self.assertIsNone(s_3._fingerprints)  # Not allocated for graphs which are never fingerprinted
+
+        self.assertEqual(len(self.s_3.fingerprint()), 16)
+        self.assertEqual(len(self.s_3.fingerprint(8)), 8)
+        self.assertEqual(self.s_3.fingerprint(), s_3.fingerprint())
+        self.assertNotEqual(self.s_1.fingerprint(), self.s_3.fingerprint())
+        self.assertNotEqual(self.s_1.fingerprint(), self.s_2.fingerprint())
+        self.assertNotEqual(
+            SampleGraphBuilder(other).add_relation({("a", "1"), ("b", "1")}, "g").build().fingerprint(),
+            self.s_1.fingerprint())
+
+    def test_remap(self):
+        other = MockSampleGraphComponentsProvider(
+            {"a": {"1", "5"}, "b": {"1", "7"}, "c": {"1"}, "d": {"1"}, "f": {"1"}}, {"r", "g", "b"})
+        s_3 = self.s_3.remap(other)
+
+        self.assertTrue(s_3.is_compatible(other))
+        self.assertEqual(s_3, self.s_3)
+        self.assertEqual(s_3.fingerprint(), self.s_3.fingerprint())
+        self.assertTrue(all(id(n) == id(other.get_node(n.variable, n.value)) for n in s_3.nodes))
+        self.assertEqual(id(self.s_3.remap(self.builder)), id(self.s_3))
+
+        with self.assertRaises(AssertionError):  # Different schema
+            self.s_3.remap(MockSampleGraphComponentsProvider({"a": {"1"}}, {"r"}))
+
     def test_text_view(self):
         self.assertEqual(SampleGraph(self.builder, frozenset({self.a_1}), frozenset(), None).text_view(), "{(a_1)}")
         self.assertEqual(self.s_1.text_view(),  "{(a_1)--{r}--(b_1)}")
@@ -447,6 +491,61 @@ class TestSampleGraph(unittest.TestCase):
         self.assertEqual(s_1.external_nodes({n_a1, n_c1}), {n_b1: {e_abr, e_bcr}, n_d1: {e_cdg}, n_f1: {e_dfg}})
         self.assertEqual(s_1.external_nodes({n_a1}, {"r"}), {n_b1: {e_abr}, n_c1: {e_bcr}})
 
+    def test_external_nodes_with_cycle(self):
+        s_1 = SampleGraphBuilder(self.builder) \
+            .add_relation({("a", "1"), ("b", "1")}, "r") \
+            .add_relation({("a", "1"), ("c", "1")}, "g") \
+            .add_relation({("b", "1"), ("c", "1")}, "r") \
+            .add_relation({("b", "1"), ("d", "1")}, "g") \
+            .add_relation({("c", "1"), ("d", "1")}, "r") \
+            .build()
+
+        gn = self.builder.get_node
+        ge = self.builder.get_edge
+        n_a1, n_b1, n_c1, n_d1 = gn("a", "1"), gn("b", "1"), gn("c", "1"), gn("d", "1")
+
+        self.assertEqual(s_1.external_nodes({n_a1}), {  # Edge b-c is in between nodes of same level so skipped
+            n_b1: {ge(frozenset({n_a1, n_b1}), "r")},
+            n_c1: {ge(frozenset({n_a1, n_c1}), "g")},
+            n_d1: {ge(frozenset({n_b1, n_d1}), "g"), ge(frozenset({n_c1, n_d1}), "r")}})
+        self.assertEqual(s_1.external_nodes({n_a1}, {"r"}), {
+            n_b1: {ge(frozenset({n_a1, n_b1}), "r")},
+            n_c1: {ge(frozenset({n_b1, n_c1}), "r")},
+            n_d1: {ge(frozenset({n_c1, n_d1}), "r")}})
+        self.assertEqual(s_1.external_nodes({gn("a", "5")}), {})
+
+        with self.assertRaises(AssertionError):
+            s_1.external_nodes(set())
+
+    def test_external_nodes_memoized(self):
+        s_1 = SampleGraphBuilder(self.builder) \
+            .add_relation({("a", "1"), ("b", "1")}, "r") \
+            .add_relation({("b", "1"), ("c", "1")}, "r") \
+            .build()
+        n_a1, n_b1 = self.builder.get_node("a", "1"), self.builder.get_node("b", "1")
+        self.assertIsNone(s_1._external_nodes_memo)  # Not allocated for graphs which are never searched
+
+        first = s_1.external_nodes({n_a1})
+        first[n_b1].clear()  # Changes of result should not affect memoized one
+        self.assertEqual(s_1.external_nodes({n_a1}), s_1.external_nodes({n_a1}, set()))
+        self.assertEqual(len(s_1.external_nodes({n_a1})[n_b1]), 1)
+        self.assertEqual(len(s_1._external_nodes_memo), 1)
+
+        for _ in range(2):
+            s_1.external_nodes({n_a1}, {"r"})
+            s_1.external_nodes({n_b1}, {"g"})
+        self.assertEqual(len(s_1._external_nodes_memo), 3)
+
+    def test_external_nodes_deep_graph(self):
+        depth = 3000  # Deeper than default recursion limit
+        bcp = MockSampleGraphComponentsProvider({i: {"1"} for i in range(depth)}, {"r"})
+        builder = SampleGraphBuilder(bcp)
+        for i in range(depth - 1):
+            builder.add_relation({(i, "1"), (i + 1, "1")}, "r")
+
+        external = builder.build().external_nodes({bcp.get_node(0, "1")})
+        self.assertEqual(len(external), depth - 1)
+
     def test_variables_subgraph_hash(self):
         self.assertEqual(
             self.s_1.variables_subgraph_hash({"a"}),
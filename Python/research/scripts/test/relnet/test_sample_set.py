@@ -18,10 +18,13 @@ website: github.com/alexcab
 created: 2021-11-19
 """
 
+import subprocess
+import sys
 import unittest
+from copy import copy
 
 from scripts.relnet.sample_graph import SampleGraphBuilder
-from scripts.relnet.sample_set import SampleSet, Samples, SampleSetBuilder
+from scripts.relnet.sample_set import SampleSet, Samples, SampleSetBuilder, SampleSetView
 from scripts.test.relnet.test_graph_components import MockSampleGraphComponentsProvider
 
 
@@ -191,6 +194,75 @@ class TestSampleSet(unittest.TestCase):
         with self.assertRaises(AssertionError):  # Sample not in set
             self.ss_1.probability_of(self.o_3)
 
+    def test_fingerprint(self):
+        fp = self.ss_2.fingerprint()
+        self.assertEqual(len(fp), 16)
+        self.assertEqual(len(self.ss_2.fingerprint(8)), 8)
+        self.assertNotEqual(fp, self.ss_1.fingerprint())
+        self.assertNotEqual(fp, SampleSet(self.bcp, {self.o_3: 3, self.o_4: 5}).fingerprint())
+
+        code = \
+            "from scripts.test.relnet.test_sample_set import TestSampleSet as T; print(T.ss_2.fingerprint().hex())"
+        for seed in ["1", "2"]:
+            result = subprocess.run(
+                [sys.executable, "-c", code], env={"PYTHONHASHSEED": seed}, capture_output=True, text=True, check=True)
+            self.assertEqual(result.stdout.strip(), fp.hex())
+
+    def test_remap(self):
+        other = MockSampleGraphComponentsProvider({v: {"1", "2", "3"} for v in "abcdefg"}, {"r", "s", "t"})
+        ss_2 = self.ss_2.remap(other)
+
+        self.assertTrue(ss_2.is_compatible(SampleSet(other, {})))
+        self.assertEqual(ss_2, self.ss_2)
+        self.assertEqual(ss_2.fingerprint(), self.ss_2.fingerprint())
+        self.assertEqual(
+            ss_2.union(SampleSet(other, {SampleGraphBuilder(other).build_single_node("a", "1"): 1})).length, 8)
+        self.assertEqual(id(self.ss_2.remap(self.bcp)), id(self.ss_2))
+
+        with self.assertRaises(AssertionError):  # Different schema
+            self.ss_2.remap(MockSampleGraphComponentsProvider({"a": {"1", "2", "3"}}, {"r", "s", "t"}))
+
+
+class TestSampleSetView(unittest.TestCase):
+
+    bcp = MockSampleGraphComponentsProvider({"a": {"1", "2", "3"}}, {"r"})
+    o_1 = SampleGraphBuilder(bcp).build_single_node("a", "1")
+    o_2 = SampleGraphBuilder(bcp).build_single_node("a", "2")
+    o_3 = SampleGraphBuilder(bcp).build_single_node("a", "3")
+    s_1 = SampleSet(bcp, {o_1: 1, o_2: 2, o_3: 3})
+
+    def test_of(self):
+        v = SampleSetView.of(self.s_1)
+        self.assertEqual(v.length, 6)
+        self.assertEqual(len(v), 6)
+        self.assertTrue(v)
+        self.assertEqual(set(v.items()), self.s_1.items())
+        self.assertEqual(v.samples(), self.s_1.samples())
+        self.assertEqual(str(v), "SampleSetView(length = 6, number_of_samples = 3, number_of_base_samples = 3)")
+
+        with self.assertRaises(AssertionError):
+            copy(v)
+
+    def test_filter_samples(self):
+        v = SampleSetView.of(self.s_1).filter_samples(lambda s: not s.have_value("a", "1"))
+        self.assertEqual(v.length, 5)
+        self.assertEqual(v.samples(), {self.o_2, self.o_3})
+        self.assertIs(v._base, v.filter_samples(lambda s: True)._base)
+
+        empty = v.filter_samples(lambda s: s.have_value("a", "1"))
+        self.assertFalse(empty)
+        self.assertEqual(empty.length, 0)
+
+    def test_count_of(self):
+        v = SampleSetView.of(self.s_1).filter_samples(lambda s: s.have_value("a", "2"))
+        self.assertEqual(v.count_of(self.o_2), 2)
+        with self.assertRaises(AssertionError):
+            v.count_of(self.o_1)
+
+    def test_builder(self):
+        v = SampleSetView.of(self.s_1).filter_samples(lambda s: not s.have_value("a", "3"))
+        self.assertEqual(v.builder().build(), SampleSet(self.bcp, {self.o_1: 1, self.o_2: 2}))
+
 
 class TestSampleSetBuilder(unittest.TestCase):
 
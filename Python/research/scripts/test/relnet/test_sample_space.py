@@ -164,6 +164,29 @@ class TestSampleSpace(unittest.TestCase):
         with self.assertRaises(AssertionError):  # Empty outcomes
             SampleSpace(self.bcp, SampleSet(self.bcp, {o_ab_1: 1, self.o_k_0: 2}), "ss_5", None).factorized()
 
+    def test_factorized_with_single_node_outcomes(self):
+        o_a = SampleGraphBuilder(self.bcp).build_single_node("a", "1")
+        o_ab = SampleGraphBuilder(self.bcp).add_relation({("a", "2"), ("b", "3")}, "r").build()
+        o_bc = SampleGraphBuilder(self.bcp).add_relation({("b", "2"), ("c", "3")}, "r").build()
+
+        self.assertEqual(
+            SampleSpace(self.bcp, SampleSet(self.bcp, {o_a: 1, o_bc: 2}), "ss_1", None).factorized(),
+            frozenset({SampleSet(self.bcp, {o_a: 1}), SampleSet(self.bcp, {o_bc: 2})}))
+
+        self.assertEqual(
+            SampleSpace(self.bcp, SampleSet(self.bcp, {o_a: 1, o_ab: 2, o_bc: 3}), "ss_2", None).factorized(),
+            frozenset({SampleSet(self.bcp, {o_a: 1}), SampleSet(self.bcp, {o_ab: 2}), SampleSet(self.bcp, {o_bc: 3})}))
+
+    def test_factor_key(self):
+        o_ab = SampleGraphBuilder(self.bcp).add_relation({("a", "2"), ("b", "3")}, "r").build()
+        o_a = SampleGraphBuilder(self.bcp).build_single_node("a", "1")
+
+        self.assertEqual(SampleSpace.factor_key(o_ab), frozenset({frozenset({"a", "b"})}))
+        self.assertEqual(SampleSpace.factor_key(o_a), frozenset({"a"}))
+
+        with self.assertRaises(AssertionError):  # Empty outcome
+            SampleSpace.factor_key(self.o_k_0)
+
 
 if __name__ == '__main__':
     unittest.main()
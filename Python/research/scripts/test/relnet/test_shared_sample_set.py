@@ -0,0 +1,140 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+
+from scripts.relnet.relation_graph import RelationGraph
+from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.relnet.shared_sample_set import SharedSampleSet
+from scripts.test.relnet import fixtures
+
+RESEARCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..")
+
+
+def worker_marginals(shm_name, evidence_view):
+    rg = RelationGraph.attach_shared(shm_name)
+    try:
+        evidence = rg.sample_builder().build_from_view(evidence_view)
+        return rg.conditional_graph(evidence).marginal_variables_probability()
+    finally:
+        rg.outcomes.close()
+
+
+class TestSharedSampleSet(unittest.TestCase):
+
+    bcp = fixtures.bcp_join
+    rg = RelationGraph(bcp, "ab_bc_bd", fixtures.ab_bc_bd_samples)
+
+    def setUp(self):
+        self.shared = self.rg.to_shared_memory()
+
+    def tearDown(self):
+        self.shared.unlink()
+
+    def test_create(self):
+        self.assertEqual(self.shared.name, "ab_bc_bd")
+        self.assertEqual(self.shared.length, self.rg.outcomes.length)
+        self.assertEqual(self.shared.number_of_samples, len(self.rg.outcomes.samples()))
+        self.assertEqual(
+            str(self.shared),
+            f"SharedSampleSet(shm_name = {self.shared.shm_name}, length = {self.rg.outcomes.length}, "
+            f"number_of_samples = {len(self.rg.outcomes.samples())})")
+        self.assertTrue(self.shared)
+
+        with self.assertRaises(AssertionError):
+            copy(self.shared)
+
+    def test_items(self):
+        self.assertEqual(
+            {(s.edges_set_view(), c) for s, c in self.shared.items()},
+            {(s.edges_set_view(), c) for s, c in self.rg.outcomes.items()})
+        self.assertEqual(self.shared.builder().length(), self.rg.outcomes.length)
+
+        sample, count = next(iter(self.shared.items()))
+        self.assertEqual(self.shared.count_of(sample), count)
+        with self.assertRaises(AssertionError):
+            self.shared.count_of(SampleGraphBuilder(self.shared.components_provider()).build_empty())
+
+    def test_empty(self):
+        empty = SharedSampleSet.create(fixtures.ab_samples.filter_samples(lambda _: False))
+        try:
+            self.assertFalse(empty)
+            self.assertEqual(list(empty.items()), [])
+        finally:
+            empty.unlink()
+
+    def test_attach_shared(self):
+        attached = RelationGraph.attach_shared(self.shared.shm_name)
+        try:
+            self.assertEqual(attached.name, self.rg.name)
+            self.assertEqual(attached.marginal_variables_probability(), self.rg.marginal_variables_probability())
+            for evidence_view in [("b", "T"), frozenset({(frozenset({("a", "T"), ("b", "F")}), "r")})]:
+                self.assertEqual(
+                    attached.conditional_graph(attached.sample_builder().build_from_view(evidence_view))
+                    .marginal_variables_probability(unobserved=True),
+                    self.rg.conditional_graph(self.rg.sample_builder().build_from_view(evidence_view))
+                    .marginal_variables_probability(unobserved=True))
+            self.assertEqual(
+                attached.folded_graph().number_of_outcomes, self.rg.folded_graph().number_of_outcomes)
+
+            with self.assertRaises(AssertionError):  # Evidence should be built with attached graph provider
+                attached.conditional_graph(SampleGraphBuilder(self.bcp).build_single_node("b", "T"))
+            with self.assertRaises(AssertionError):  # Only owner can unlink
+                attached.outcomes.unlink()
+        finally:
+            attached.outcomes.close()
+
+        with self.assertRaises(AssertionError):  # Closed
+            list(attached.outcomes.items())
+
+    def test_workers(self):
+        evidence_views = [("b", "T"), ("b", "F"), ("d", "T")]
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(worker_marginals, [self.shared.shm_name] * 3, evidence_views))
+
+        for evidence_view, result in zip(evidence_views, results):
+            self.assertEqual(
+                result,
+                self.rg.conditional_graph(self.rg.sample_builder().build_from_view(evidence_view))
+                .marginal_variables_probability())
+
+    def test_attach_from_other_interpreter(self):
+        code = \
+            "import sys; from scripts.relnet.relation_graph import RelationGraph as R; " \
+            "rg = R.attach_shared(sys.argv[1]); print(rg.outcomes.length); rg.outcomes.close()"
+        for _ in range(2):  # Block should survive exit of attached interpreter
+            result = subprocess.run(
+                [sys.executable, "-c", code, self.shared.shm_name],
+                cwd=RESEARCH_DIR, capture_output=True, text=True, check=True)
+            self.assertEqual(result.stdout.strip(), str(self.rg.outcomes.length))
+            self.assertNotIn("leaked", result.stderr)
+
+        attached = SharedSampleSet.attach(self.shared.shm_name)
+        self.assertEqual(attached.length, self.rg.outcomes.length)
+        attached.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import unittest
+from copy import copy
+
+from scripts.relnet.relation_graph import RelationGraph
+from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.test.relnet import fixtures
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestSimilarityIndex(unittest.TestCase):
+
+    bcp = fixtures.bcp_join
+    joined = RelationGraph(bcp, "ab_bc_bd", fixtures.ab_bc_bd_samples).make_joined()
+
+    def brute_force_top_k(self, sample, k):
+        scored = sorted(((o, o.similarity(sample)) for o in self.joined.outcomes.samples()), key=lambda os: -os[1])
+        return scored[:k]
+
+    def test_init(self):
+        index = self.joined.similarity_index(num_bands=8, rows_per_band=2)
+        self.assertEqual(index.number_of_outcomes, len(self.joined.outcomes.samples()))
+        self.assertEqual(str(index), "SimilarityIndex(number_of_outcomes = 16, num_bands = 8, rows_per_band = 2)")
+        self.assertIs(self.joined.similarity_index(num_bands=8, rows_per_band=2), index)
+        self.assertIsNot(self.joined.similarity_index(num_bands=8, rows_per_band=2, seed=2), index)
+
+        with self.assertRaises(AssertionError):
+            copy(index)
+        with self.assertRaises(AssertionError):
+            self.joined.similarity_index(num_bands=0)
+
+    def test_signature(self):
+        index = self.joined.similarity_index()
+        outcomes = list(self.joined.outcomes.samples())
+
+        self.assertEqual(len(index.signature(outcomes[0])), 16 * 4)
+        self.assertTrue((index.signature(outcomes[0]) == index.signature(outcomes[0])).all())
+        self.assertFalse((index.signature(outcomes[0]) == index.signature(outcomes[1])).all())
+
+    def test_query_not_grow_index(self):
+        index = self.joined.similarity_index(seed=3)
+        number_of_components = len(index._component_ids)
+        unseen = SampleGraphBuilder(self.bcp).add_relation({("a", "T"), ("b", "T")}, "s").build()
+
+        self.assertTrue((index.signature(unseen) == index.signature(unseen)).all())
+        index.top_k(unseen, 3)
+        self.assertEqual(len(index._component_ids), number_of_components)
+
+    def test_top_k_finds_same_outcome(self):
+        index = self.joined.similarity_index()
+
+        for outcome in self.joined.outcomes.samples():
+            top = index.top_k(outcome, 3)
+            self.assertEqual(top[0], (outcome, 1.0))
+            self.assertLessEqual(len(top), 3)
+            self.assertEqual([s for _, s in top], sorted([s for _, s in top], reverse=True))
+
+    def test_top_k_similarities_are_exact(self):
+        index = self.joined.similarity_index(num_bands=32, rows_per_band=1)  # One row per band, high recall
+        evidence = SampleGraphBuilder(self.bcp) \
+            .add_relation({("a", "T"), ("b", "F")}, "r") \
+            .add_relation({("b", "F"), ("c", "T")}, "s") \
+            .build()
+
+        self.assertEqual(
+            [s for _, s in index.top_k(evidence, 5)], [s for _, s in self.brute_force_top_k(evidence, 5)])
+        for outcome, similarity in index.top_k(evidence, 5):
+            self.assertEqual(similarity, outcome.similarity(evidence))
+
+        with self.assertRaises(AssertionError):  # k should be > 0
+            index.top_k(evidence, 0)
+        with self.assertRaises(AssertionError):  # Not compatible
+            index.top_k(fixtures.incompatible_sample, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
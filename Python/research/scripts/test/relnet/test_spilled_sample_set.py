@@ -0,0 +1,173 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import gc
+import os
+import tempfile
+import unittest
+from copy import copy
+
+from scripts.relnet.relation_graph import RelationGraph
+from scripts.relnet.sample_graph import SampleGraphBuilder
+from scripts.relnet.sample_set import SampleSet
+from scripts.relnet.spilled_sample_set import ComponentsTable, SpilledSampleSetBuilder
+from scripts.test.relnet import fixtures
+
+
+class TestComponentsTable(unittest.TestCase):
+
+
+    def test_encode_decode(self):
+        table = ComponentsTable()
+        samples = list(fixtures.expected_ab_bc_joint_b.samples())
+
+        encoded = [table.encode(s) for s in samples]
+        self.assertEqual(len(encoded[0]), 5)
+        self.assertEqual(len(table), 6 + 8)  # 6 nodes, 8 edges
+
+        for s, ids in zip(samples, encoded):
+            self.assertEqual(table.decode(fixtures.bcp_join, ids), s)
+
+
+class TestSpilledSampleSet(unittest.TestCase):
+
+    bcp = fixtures.bcp_join
+    ab_bc_bd = RelationGraph(bcp, "ab_bc_bd", fixtures.ab_bc_bd_samples)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_build(self):
+        ss = SpilledSampleSetBuilder(self.bcp, self.directory.name, memory_budget=64)\
+            .add_all(fixtures.expected_ab_bc_joint_b.items())\
+            .build()
+
+        self.assertEqual(ss.length, fixtures.expected_ab_bc_joint_b.length)
+        self.assertEqual(len(ss), fixtures.expected_ab_bc_joint_b.length)
+        self.assertEqual(ss.number_of_samples, 8)
+        self.assertTrue(ss)
+        self.assertEqual(str(ss), "SpilledSampleSet(length = 214, number_of_samples = 8, number_of_chunks = 4)")
+        self.assertEqual(set(ss.items()), fixtures.expected_ab_bc_joint_b.items())
+        self.assertEqual(set(ss.samples()), fixtures.expected_ab_bc_joint_b.samples())
+        self.assertEqual(ss.builder().build(), fixtures.expected_ab_bc_joint_b)
+
+        with self.assertRaises(AssertionError):
+            copy(ss)
+        with self.assertRaises(AssertionError):  # Memory budget should be > 0
+            SpilledSampleSetBuilder(self.bcp, self.directory.name, memory_budget=0)
+        with self.assertRaises(AssertionError):  # Incompatible sample
+            SpilledSampleSetBuilder(fixtures.bcp_other, self.directory.name) \
+                .add(next(iter(fixtures.ab_samples.samples())), 1)
+
+    def test_count_of(self):
+        ss = SpilledSampleSetBuilder(self.bcp, self.directory.name)\
+            .add_all(fixtures.ab_samples.items())\
+            .build()
+        o = next(iter(fixtures.ab_samples.samples()))
+
+        self.assertEqual(ss.count_of(o), fixtures.ab_samples.count_of(o))
+        with self.assertRaises(AssertionError):
+            ss.count_of(next(iter(fixtures.bc_samples.samples())))
+
+    def test_filter_samples(self):
+        ss = SpilledSampleSetBuilder(self.bcp, self.directory.name, memory_budget=64)\
+            .add_all(fixtures.expected_ab_bc_joint_b.items())\
+            .build()
+        filtered = ss.filter_samples(lambda s: s.have_value("a", "T"))
+
+        self.assertEqual(
+            filtered.builder().build(),
+            fixtures.expected_ab_bc_joint_b.filter_samples(lambda s: s.have_value("a", "T")))
+        self.assertEqual(os.path.dirname(filtered.directory), self.directory.name)
+
+        directory = filtered.directory
+        del filtered
+        gc.collect()
+        self.assertFalse(os.path.exists(directory))  # Chunks removed with sample set
+        self.assertEqual(os.listdir(self.directory.name), [os.path.basename(ss.directory)])
+
+        with ss.filter_samples(lambda s: s.have_value("a", "F")) as filtered:
+            self.assertEqual(filtered.number_of_samples, 4)
+        self.assertFalse(os.path.exists(filtered.directory))
+
+    def test_remove(self):
+        ss = SpilledSampleSetBuilder(self.bcp, self.directory.name).add_all(fixtures.ab_samples.items()).build()
+        ss.remove()
+        self.assertFalse(os.path.exists(ss.directory))
+        self.assertEqual(list(ss.items()), [])
+
+        SpilledSampleSetBuilder(self.bcp, self.directory.name).add_all(fixtures.ab_samples.items())
+        gc.collect()
+        self.assertEqual(os.listdir(self.directory.name), [])  # Not built builder remove its directory
+
+    def test_samples_not_in_memory(self):
+        ss = SpilledSampleSetBuilder(self.bcp, self.directory.name).add_all(fixtures.ab_samples.items()).build()
+        with self.assertRaises(AssertionError):  # Inherited members should not see empty in memory samples
+            _ = ss._samples
+        self.assertTrue(ss.is_compatible(fixtures.ab_samples))
+        self.assertEqual(fixtures.bc_samples.union(ss), fixtures.ab_bc_samples)
+
+    def test_make_joined_spilled(self):
+        joined = self.ab_bc_bd.make_joined()
+        spilled = self.ab_bc_bd.make_joined_spilled(self.directory.name, memory_budget=128, name="spilled")
+
+        self.assertEqual(spilled.name, "spilled")
+        self.assertEqual(spilled.outcomes.length, joined.outcomes.length)
+        self.assertEqual(set(spilled.outcomes.items()), joined.outcomes.items())
+        self.assertTrue(spilled.is_joined())
+
+    def test_streaming_aggregates(self):
+        joined = self.ab_bc_bd.make_joined()
+        spilled = self.ab_bc_bd.make_joined_spilled(self.directory.name, memory_budget=128)
+        evidence = SampleGraphBuilder(self.bcp).build_single_node("b", "T")
+
+        self.assertEqual(spilled.marginal_variables_probability(), joined.marginal_variables_probability())
+        self.assertEqual(spilled.folded_graph("fg"), joined.folded_graph("fg"))
+        self.assertEqual(spilled.included_variables(), joined.included_variables())
+
+        spilled_conditional = spilled.conditional_graph(evidence)
+        joined_conditional = joined.conditional_graph(evidence)
+
+        self.assertEqual(set(spilled_conditional.outcomes.items()), joined_conditional.outcomes.items())
+        self.assertEqual(
+            spilled_conditional.marginal_variables_probability(), joined_conditional.marginal_variables_probability())
+
+        spilled_activation = spilled_conditional.activation_graph()
+        joined_activation = joined_conditional.activation_graph()
+        joined_nodes = {n.variable: n for n in joined_activation.nodes}
+
+        self.assertEqual(spilled_activation.edges, joined_activation.edges)
+        for node in spilled_activation.nodes:  # Weights are summed in other order so can differ in last digits
+            self.assertEqual(node.in_query, joined_nodes[node.variable].in_query)
+            for value, weight in dict(joined_nodes[node.variable].values).items():
+                self.assertAlmostEqual(dict(node.values)[value], weight)
+
+    def test_empty(self):
+        ss = SpilledSampleSetBuilder(self.bcp, self.directory.name).build()
+        self.assertFalse(ss)
+        self.assertEqual(ss.length, 0)
+        self.assertEqual(ss.builder().build(), SampleSet(self.bcp, {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import unittest
+from copy import copy
+
+from scripts.relnet.sample_set import SampleSet
+from scripts.relnet.variable_elimination import CountTable, MaxTable, eliminate, marginal_counts, max_product
+from scripts.test.relnet import fixtures
+
+
+class TestCountTable(unittest.TestCase):
+
+
+    ab = CountTable(("a", "b"), {("T", "T"): 2, ("T", "F"): 3, ("F", "T"): 4})
+    bc = CountTable(("b", "c"), {("T", "T"): 5, ("F", "T"): 6, ("F", "F"): 7})
+
+    def test_from_factor(self):
+        table = CountTable.from_factor(fixtures.ab_samples)
+        self.assertEqual(set(table.variables), {"a", "b"})
+        self.assertEqual(sum(table.counts.values()), fixtures.ab_samples.length)
+        self.assertEqual(str(table), f"CountTable(variables = {table.variables}, number_of_assignments = 4)")
+
+        with self.assertRaises(AssertionError):  # Empty factor
+            CountTable.from_factor(SampleSet(fixtures.bcp_join, {}))
+        with self.assertRaises(AssertionError):  # Outcomes with different variables
+            CountTable.from_factor(fixtures.ab_bc_samples)
+
+    def test_copy(self):
+        with self.assertRaises(AssertionError):
+            copy(self.ab)
+
+    def test_product(self):
+        abc = self.ab.product(self.bc)
+        self.assertEqual(abc.variables, ("a", "b", "c"))
+        self.assertEqual(abc.counts, {
+            ("T", "T", "T"): 2 * 5, ("T", "F", "T"): 3 * 6, ("T", "F", "F"): 3 * 7, ("F", "T", "T"): 4 * 5})
+
+    def test_sum_out(self):
+        a = self.ab.sum_out("b")
+        self.assertEqual(a.variables, ("a",))
+        self.assertEqual(a.counts, {("T",): 5, ("F",): 4})
+
+    def test_eliminate(self):
+        c = eliminate([self.ab, self.bc], {"c"})
+        self.assertEqual(c.variables, ("c",))
+        self.assertEqual(c.counts, {("T",): 2 * 5 + 3 * 6 + 4 * 5, ("F",): 3 * 7})
+        self.assertEqual(eliminate([self.ab, self.bc], set()).counts, {(): 2 * 5 + 3 * 6 + 3 * 7 + 4 * 5})
+        self.assertEqual(eliminate([], set()).counts, {(): 1})
+
+    def test_marginal_counts(self):
+        self.assertEqual(marginal_counts([self.ab, self.bc], "a"), {"T": 2 * 5 + 3 * 6 + 3 * 7, "F": 4 * 5})
+        self.assertEqual(marginal_counts([self.ab, self.bc], "b"), {"T": 6 * 5, "F": 3 * 13})
+
+
+class TestMaxTable(unittest.TestCase):
+
+
+    ab = MaxTable(("a", "b"), {("T", "T"): (2, ("ab_1",)), ("T", "F"): (3, ("ab_2",)), ("F", "T"): (4, ("ab_3",))})
+    bc = MaxTable(("b", "c"), {("T", "T"): (5, ("bc_1",)), ("F", "T"): (6, ("bc_2",)), ("F", "F"): (7, ("bc_3",))})
+
+    def test_from_factor(self):
+        table = MaxTable.from_factor(fixtures.ab_samples)
+        self.assertEqual(set(table.variables), {"a", "b"})
+        self.assertEqual(len(table.entries), 4)
+        self.assertEqual(str(table), f"MaxTable(variables = {table.variables}, number_of_assignments = 4)")
+        for values, (count, (outcome,)) in table.entries.items():
+            self.assertEqual(tuple(outcome.value_for_variable(v) for v in table.variables), values)
+            self.assertEqual(count, max(
+                c for o, c in fixtures.ab_samples.items()
+                if tuple(o.value_for_variable(v) for v in table.variables) == values))
+
+        with self.assertRaises(AssertionError):  # Empty factor
+            MaxTable.from_factor(SampleSet(fixtures.bcp_join, {}))
+        with self.assertRaises(AssertionError):  # Outcomes with different variables
+            MaxTable.from_factor(fixtures.ab_bc_samples)
+
+    def test_copy(self):
+        with self.assertRaises(AssertionError):
+            copy(self.ab)
+
+    def test_product(self):
+        abc = self.ab.product(self.bc)
+        self.assertEqual(abc.variables, ("a", "b", "c"))
+        self.assertEqual(abc.entries, {
+            ("T", "T", "T"): (2 * 5, ("ab_1", "bc_1")),
+            ("T", "F", "T"): (3 * 6, ("ab_2", "bc_2")),
+            ("T", "F", "F"): (3 * 7, ("ab_2", "bc_3")),
+            ("F", "T", "T"): (4 * 5, ("ab_3", "bc_1"))})
+
+    def test_max_out(self):
+        a = self.ab.max_out("b")
+        self.assertEqual(a.variables, ("a",))
+        self.assertEqual(a.entries, {("T",): (3, ("ab_2",)), ("F",): (4, ("ab_3",))})
+
+    def test_max_product(self):
+        count, outcomes = max_product([self.ab, self.bc])
+        self.assertEqual(count, 3 * 7)
+        self.assertEqual(set(outcomes), {"ab_2", "bc_3"})  # Order depend on elimination order
+        self.assertEqual(max_product([]), (1, ()))
+        self.assertIsNone(max_product([self.ab, MaxTable(("b",), {})]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+from scripts.relnet.visualization import new_network
+
+RESEARCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..")
+
+
+class TestVisualization(unittest.TestCase):
+
+    def test_pyvis_not_imported(self):
+        code = \
+            "import sys, scripts.relnet.relation_graph; print('pyvis' in sys.modules, 'multiprocessing' in sys.modules)"
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=RESEARCH_DIR, capture_output=True, text=True, check=True).stdout
+        self.assertEqual(out.strip(), "False False")
+
+    def test_new_network_without_pyvis(self):
+        with mock.patch.dict(sys.modules, {"pyvis.network": None}):
+            with self.assertRaises(ImportError) as e:
+                new_network("100px", "100px")
+        self.assertIn("pyvis is required", str(e.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
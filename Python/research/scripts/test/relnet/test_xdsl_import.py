@@ -0,0 +1,143 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+r"""
+                __              __\/
+              | S  \          | R  \
+              \ __ |          \ __ |
+              /    \          /
+            /       \       /
+       __ /          \ __ /            __
+     | N  \          | G  \          | A  \
+     \ __ |          \ __ |          \ __ |
+
+   # # # # # # # # # # # # # # # # # # # # # #
+
+author: CAB
+website: github.com/alexcab
+created: 2026-10-19
+"""
+
+import os
+import tempfile
+import unittest
+
+from scripts.relnet.graph_components import DirectedRelation
+from scripts.relnet.xdsl_import import read_xdsl
+
+GENIE_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "..", "GeNle")
+
+
+class TestXdslImport(unittest.TestCase):
+
+    network = """<?xml version="1.0" encoding="UTF-8"?>
+<smile version="1.0" id="Net">
+    <nodes>
+        <cpt id="A">
+            <state id="a0" />
+            <state id="a1" />
+            <probabilities>0.25 0.75</probabilities>
+        </cpt>
+        <submodel id="Sub">
+            <deterministic id="B">
+                <state id="b0" />
+                <state id="b1" />
+                <parents>A</parents>
+                <resultingstates>b1 b0</resultingstates>
+            </deterministic>
+        </submodel>
+        <cpt id="C">
+            <state id="c0" />
+            <state id="c1" />
+            <parents>A B</parents>
+            <probabilities>0.5 0.5 0.1 0.9 0.2 0.8 1 0</probabilities>
+        </cpt>
+    </nodes>
+    <extensions>
+        <genie version="1.0" name="Net"><node id="A"><name>A</name></node></genie>
+    </extensions>
+</smile>
+"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, text):
+        path = os.path.join(self.directory.name, "network.xdsl")
+        with open(path, "w") as file:
+            file.write(text)
+        return path
+
+    def test_read_xdsl(self):
+        rgb = read_xdsl(self.write(self.network))
+        rg = rgb.build()
+
+        self.assertEqual(rg.name, "Net")
+        self.assertEqual(dict(rg.variables), {"A": {"a0", "a1"}, "B": {"b0", "b1"}, "C": {"c0", "c1"}})
+        self.assertEqual(len(rg.outcomes.samples()), 2 + 2 + 7)
+        self.assertEqual(len(rg.factorized()), 3)
+        self.assertEqual(rg.outcomes.count_of(rg.sample_builder().build_single_node("A", "a1")), 75)
+
+        b = rg.sample_builder().add_relation({("A", "a0"), ("B", "b1")}, DirectedRelation("A", "B", "r")).build()
+        self.assertEqual(rg.outcomes.count_of(b), 100)
+        c = rg.sample_builder() \
+            .add_relation({("A", "a0"), ("C", "c1")}, DirectedRelation("A", "C", "r")) \
+            .add_relation({("B", "b1"), ("C", "c1")}, DirectedRelation("B", "C", "r")) \
+            .build()
+        self.assertEqual(rg.outcomes.count_of(c), 90)
+
+        joined = rg.make_joined()
+        self.assertEqual(len(joined.outcomes.samples()), 4)
+        self.assertEqual(
+            sorted(c for _, c in joined.outcomes.items()),
+            [25 * 100 * 10, 75 * 100 * 20, 25 * 100 * 90, 75 * 100 * 80])
+
+    def test_read_xdsl_options(self):
+        path = self.write(self.network)
+        rg = read_xdsl(path, scale=1000, relation="s", name="net", value_name=lambda v, s: f"{v}({s})").build()
+
+        self.assertEqual(rg.name, "net")
+        self.assertEqual(rg.relations, {"s"})
+        self.assertEqual(dict(rg.variables)["A"], {"A(a0)", "A(a1)"})
+        self.assertEqual(rg.outcomes.count_of(rg.sample_builder().build_single_node("A", "A(a0)")), 250)
+
+        with self.assertRaises(AssertionError):
+            read_xdsl(path, scale=10)
+
+    def test_read_xdsl_errors(self):
+        with self.assertRaises(AssertionError):
+            read_xdsl(self.write(self.network.replace("0.25 0.75", "0.25 0.5 0.25")))
+        with self.assertRaises(AssertionError):
+            read_xdsl(self.write(self.network.replace("<parents>A B</parents>", "<parents>A D</parents>")))
+        with self.assertRaises(AssertionError):
+            read_xdsl(self.write(self.network.replace('<cpt id="C">', '<noisymax id="C">')
+                                 .replace("</probabilities>\n        </cpt>\n    </nodes>",
+                                          "</probabilities>\n        </noisymax>\n    </nodes>")))
+
+    def test_read_genie_networks(self):
+        rg = read_xdsl(os.path.join(GENIE_DIR, "Studients.xdsl")).build()
+
+        self.assertEqual(rg.name, "Network2")
+        self.assertEqual(len(rg.factorized()), 5)
+        g = rg.sample_builder() \
+            .add_relation({("D", "d1"), ("G", "g2")}, DirectedRelation("D", "G", "r")) \
+            .add_relation({("I", "i0"), ("G", "g2")}, DirectedRelation("I", "G", "r")) \
+            .build()
+        self.assertEqual(rg.outcomes.count_of(g), 70)
+        self.assertAlmostEqual(rg.make_joined().marginal_variables_probability()["G"]["g0"], 0.362)
+
+        abc = read_xdsl(os.path.join(GENIE_DIR, "ABC_bayes_net.xdsl")).build()
+        self.assertEqual(sum(c for _, c in abc.make_joined().outcomes.items()), 100 ** 3)
+
+        for network in [rg, abc]:  # Networks with root CPDs
+            outcome, count = network.most_probable_outcome()
+            joined = network.make_joined().outcomes
+            self.assertEqual(count, max(c for _, c in joined.items()))
+            self.assertEqual(joined.count_of(outcome), count)
+
+
+if __name__ == '__main__':
+    unittest.main()